@@ -1,21 +1,29 @@
 # admin_bot/main.py
 import asyncio
 from aiogram import Bot, Dispatcher
-from aiogram.client.default import DefaultBotProperties
-from config import ADMIN_BOT_TOKEN, ADMIN_IDS
+from config import ADMIN_BOT_TOKEN, ADMIN_IDS, BOT_TOKEN, WEBHOOK_URL, ADMIN_WEBHOOK_PORT, ADMIN_METRICS_PORT
 from utils.database import db
-from utils.logger import logger
+from utils.bot_registry import bot_registry
+from utils.broadcast import broadcaster
+from utils.fsm_storage import SqliteStorage
+from utils.webhook import run_webhook
+from utils.text_manager import text_manager
+from utils import metrics
+from utils.logger import logger, setup_logging
 
-from admin_bot.handlers import start, control, messaging
+from admin_bot.handlers import start, control, messaging, broadcasts, metrics as metrics_handlers
 
 async def main() -> None:
     """
     Главная асинхронная функция для запуска админ-бота.
     Инициализирует бота, регистрирует роутеры и функцию startup,
-    затем начинает polling для обработки обновлений.
+    затем начинает прием обновлений: через webhook, если задан WEBHOOK_URL, иначе через polling.
     """
-    bot = Bot(token=ADMIN_BOT_TOKEN, default=DefaultBotProperties(parse_mode="HTML"))
-    dp = Dispatcher()
+    bot = bot_registry.get(ADMIN_BOT_TOKEN)
+    main_bot = bot_registry.get(BOT_TOKEN)  # Для рассылок от имени основного бота
+    storage = SqliteStorage("admin_fsm.db")
+    await storage.connect()
+    dp = Dispatcher(storage=storage)
 
     # Инициализация базы данных
     await db.connect()
@@ -24,13 +32,17 @@ async def main() -> None:
     dp.include_routers(
         start.router,
         control.router,
+        broadcasts.router,
+        metrics_handlers.router,
         messaging.router
     )
+    metrics.install(dp)
 
     async def on_startup(bot: Bot) -> None:
         """
         Функция, вызываемая при старте бота.
-        Отправляет уведомление всем администраторам из ADMIN_IDS.
+        Отправляет уведомление всем администраторам из ADMIN_IDS
+        и продолжает рассылки, прерванные предыдущей остановкой.
 
         Args:
             bot (Bot): Экземпляр бота для отправки сообщений.
@@ -39,19 +51,34 @@ async def main() -> None:
             try:
                 await bot.send_message(admin_id, "Админ-бот запущен. Используйте /start.")
             except Exception:
-                logger.error(f"Не удалось отправить сообщение админу с ID {admin_id}")
+                logger.error("Не удалось отправить сообщение админу с ID %s", admin_id)
+        # Продолжаем незавершенные рассылки с места остановки
+        await broadcaster.resume_unfinished(
+            main_bot, lambda job: broadcasts.make_progress_reporter(bot, job.admin_chat_id)
+        )
 
     dp.startup.register(on_startup)
+    # Тексты и клавиатуры перечитываются при изменении файлов в texts/
+    text_manager.start()
+    metrics_server = metrics.MetricsServer(ADMIN_METRICS_PORT)
+    await metrics_server.start()
 
     try:
-        await dp.start_polling(bot)
+        if WEBHOOK_URL:
+            await run_webhook(dp, bot, "/webhook/admin", ADMIN_WEBHOOK_PORT)
+        else:
+            await dp.start_polling(bot)
     finally:
-        await dp.stop_polling()
-        await bot.session.close()
+        await text_manager.stop()
+        await metrics_server.stop()
+        await broadcaster.stop()  # Ход рассылок сохранен, они продолжатся при следующем запуске
+        await storage.close()  # Сохраняем несохраненные состояния FSM
+        await bot_registry.close()  # Закрываем сессии админ-бота и основного бота
         await db.close()  # Закрываем базу данных
         logger.info("Админ-бот завершил работу.")
 
 if __name__ == "__main__":
+    setup_logging(file_name="admin_bot.log")  # Админ-бот работает в отдельном процессе и пишет в свой файл лога
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -0,0 +1,104 @@
+# admin_bot/handlers/broadcasts.py
+from typing import Optional
+
+from aiogram import Router, Bot
+from aiogram.filters import Command, CommandObject
+from aiogram.types import Message
+import logging
+from utils.logger import logger
+
+from utils.broadcast import broadcaster, BroadcastJob, ProgressCallback
+from config import ADMIN_IDS
+
+router = Router()
+
+STATUS_TITLES = {
+    "running": "идет",
+    "paused": "на паузе",
+    "cancelled": "отменена",
+    "done": "завершена",
+    "failed": "прервана ошибкой",
+}
+"""Названия статусов задачи рассылки для админ-панели."""
+
+def make_progress_reporter(admin_bot: Bot, admin_chat_id: int) -> ProgressCallback:
+    """
+    Создает функцию отчета о ходе рассылки, которая отправляет администратору
+    сообщение со статистикой и затем обновляет его.
+
+    Args:
+        admin_bot (Bot): Экземпляр админ-бота.
+        admin_chat_id (int): ID чата администратора.
+
+    Returns:
+        ProgressCallback: Функция отчета для движка рассылок.
+    """
+    message_id: Optional[int] = None
+
+    async def report(job: BroadcastJob, finished: bool) -> None:
+        nonlocal message_id
+        text = f"Рассылка #{job.job_id}: {STATUS_TITLES.get(job.status, job.status)}\n{job.stats.format()}"
+        if job.error:
+            text += f"\nПричина: {job.error}"
+        if message_id is None:
+            message = await admin_bot.send_message(admin_chat_id, text)
+            message_id = message.message_id
+        else:
+            await admin_bot.edit_message_text(text, chat_id=admin_chat_id, message_id=message_id)
+
+    return report
+
+def parse_job(command: CommandObject) -> Optional[BroadcastJob]:
+    """
+    Находит задачу рассылки по ID из аргумента команды или последнюю незавершенную задачу.
+
+    Args:
+        command (CommandObject): Команда с необязательным аргументом - ID задачи.
+
+    Returns:
+        Optional[BroadcastJob]: Задача или None, если она не найдена.
+    """
+    if command.args and command.args.strip().isdigit():
+        return broadcaster.get(int(command.args.strip()))
+    return broadcaster.get()
+
+@router.message(Command("broadcasts"))
+async def list_broadcasts(message: Message) -> None:
+    """
+    Обработчик команды '/broadcasts': показывает незавершенные рассылки и их ход.
+    Доступно только администраторам, указанным в ADMIN_IDS.
+
+    Args:
+        message (Message): Объект сообщения от пользователя.
+    """
+    if message.from_user.id not in ADMIN_IDS:
+        return
+    if not broadcaster.jobs:
+        await message.answer("Активных рассылок нет.")
+        return
+    await message.answer("\n\n".join(
+        f"Рассылка #{job.job_id}: {STATUS_TITLES.get(job.status, job.status)}\n{job.stats.format()}"
+        for job in broadcaster.jobs.values()
+    ) + "\n\nУправление: /pause, /resume, /cancel [номер рассылки]")
+
+@router.message(Command("pause", "resume", "cancel"))
+async def control_broadcast(message: Message, command: CommandObject) -> None:
+    """
+    Обработчик команд '/pause', '/resume' и '/cancel' для управления рассылкой.
+    Без аргумента команда применяется к последней незавершенной рассылке.
+    Доступно только администраторам, указанным в ADMIN_IDS.
+
+    Args:
+        message (Message): Объект сообщения от пользователя.
+        command (CommandObject): Команда с необязательным номером рассылки.
+    """
+    if message.from_user.id not in ADMIN_IDS:
+        return
+    job = parse_job(command)
+    if job is None:
+        await message.answer("Рассылка не найдена. Список рассылок: /broadcasts")
+        return
+    status = {"pause": "paused", "resume": "running", "cancel": "cancelled"}[command.command]
+    await broadcaster.set_status(job, status)
+    logger.info("Администратор %s изменил статус рассылки %s на %s", message.from_user.id, job.job_id, status)
+    await message.answer(f"Рассылка #{job.job_id}: {STATUS_TITLES[status]}.")
@@ -1,16 +1,49 @@
 # admin_bot/handlers/control.py
+from typing import Tuple
+
 from aiogram import Router, F
 from aiogram.types import Message, CallbackQuery
 from aiogram.fsm.context import FSMContext
-import logging
-from utils.logger import logger
 
 from admin_bot.keyboards.control_keyboard import get_control_keyboard
-from config import bot_status, ADMIN_IDS, update_bot_status  # Обновленный импорт
+from config import ADMIN_IDS
+from utils.bot_status import status_watcher
+from utils.control_channel import get_remote_status, set_remote_status
+from utils.text_manager import TextAction
 
 router = Router()
 
-@router.message(F.text == "Управление ботом")
+async def get_current_status() -> Tuple[bool, bool]:
+    """
+    Получает статус основного бота через канал управления.
+    Если основной бот не отвечает, берет статус, сохраненный в файле.
+
+    Returns:
+        Tuple[bool, bool]: Статус бота (True - включен) и признак того, что основной бот на связи.
+    """
+    is_active = await get_remote_status()
+    if is_active is not None:
+        return is_active, True
+    status_watcher.load()
+    return status_watcher.is_active, False
+
+def format_status(is_active: bool, online: bool) -> str:
+    """
+    Формирует текст сообщения о статусе основного бота.
+
+    Args:
+        is_active (bool): Статус бота (True - включен).
+        online (bool): Признак того, что основной бот отвечает по каналу управления.
+
+    Returns:
+        str: Текст для админ-панели.
+    """
+    text = f"Текущий статус бота: {'Включен' if is_active else 'Выключен'}"
+    if not online:
+        text += "\n(основной бот не отвечает, показан сохраненный статус)"
+    return text
+
+@router.message(TextAction("admin_menu.control"))
 async def show_control(message: Message) -> None:
     """
     Обработчик команды 'Управление ботом' для отображения текущего статуса бота.
@@ -20,9 +53,10 @@ async def show_control(message: Message) -> None:
         message (Message): Объект сообщения от пользователя.
     """
     if message.from_user.id in ADMIN_IDS:
+        is_active, online = await get_current_status()
         await message.answer(
-            f"Текущий статус бота: {'Включен' if bot_status['is_active'] else 'Выключен'}",
-            reply_markup=get_control_keyboard()
+            format_status(is_active, online),
+            reply_markup=get_control_keyboard(is_active)
         )
 
 @router.callback_query(F.data.in_({"toggle_bot"}))
@@ -30,6 +64,7 @@ async def toggle_bot(callback: CallbackQuery, state: FSMContext) -> None:
     """
     Обработчик callback-запроса для переключения статуса бота (вкл/выкл).
     Доступно только администраторам, указанным в ADMIN_IDS.
+    Передает новый статус основному боту через канал управления и сообщает, подтвердил ли он изменение.
     Обновляет текст сообщения и клавиатуру после переключения.
 
     Args:
@@ -37,10 +72,21 @@ async def toggle_bot(callback: CallbackQuery, state: FSMContext) -> None:
         state (FSMContext): Контекст состояния FSM (не используется в данном случае).
     """
     if callback.from_user.id in ADMIN_IDS:
-        new_status = not bot_status['is_active']
-        update_bot_status(new_status)  # Обновляем статус через функцию
-        await callback.answer(f"Бот {'включен' if new_status else 'выключен'}")
+        is_active, _ = await get_current_status()
+        new_status = not is_active
+        confirmed = await set_remote_status(new_status)  # Основной бот применяет статус сразу
+        if confirmed is None:
+            # Основной бот не запущен: сохраняем статус, он будет применен при запуске
+            status_watcher.set(new_status)
+            await callback.answer(
+                f"Основной бот не отвечает. Статус «{'включен' if new_status else 'выключен'}» "
+                f"сохранен и будет применен при запуске.",
+                show_alert=True
+            )
+        else:
+            new_status = confirmed
+            await callback.answer(f"Бот {'включен' if new_status else 'выключен'} (подтверждено основным ботом)")
         await callback.message.edit_text(
-            f"Текущий статус бота: {'Включен' if bot_status['is_active'] else 'Выключен'}",
-            reply_markup=get_control_keyboard()
+            format_status(new_status, confirmed is not None),
+            reply_markup=get_control_keyboard(new_status)
         )
\ No newline at end of file
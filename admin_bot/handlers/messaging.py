@@ -1,4 +1,7 @@
 # admin_bot/handlers/messaging.py
+import asyncio
+from typing import Any, Dict, List, Optional
+
 from aiogram import Router, F
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram import Bot
@@ -9,11 +12,21 @@ import logging
 from admin_bot.keyboards.messaging_keyboard import get_messaging_keyboard
 from utils.logger import logger
 from utils.database import db
+from utils.bot_registry import bot_registry
+from utils.broadcast import broadcaster, BroadcastMessage, is_unreachable
+from admin_bot.handlers.broadcasts import make_progress_reporter
+from utils.text_manager import TextAction
 from config import BOT_TOKEN, ADMIN_IDS
 import re
 
 router = Router()
 
+ALBUM_COLLECT_DELAY = 1.0
+"""Время (в секундах) ожидания остальных сообщений альбома после первого."""
+
+# Сообщения альбомов, которые еще собираются, по media_group_id
+_albums: Dict[str, List[Message]] = {}
+
 # Состояния для FSM
 class MessagingStates(StatesGroup):
     SELECT_TYPE = State()  # Выбор типа рассылки (массово/избирательно)
@@ -26,6 +39,7 @@ class MessagingStates(StatesGroup):
 async def send_message_to_user(main_bot: Bot, user_id: int, text: str, reply_markup: InlineKeyboardMarkup = None) -> None:
     """
     Асинхронная функция для отправки сообщения пользователю от имени основного бота с поддержкой кнопок.
+    Если пользователь заблокировал бота или удалил аккаунт, он исключается из рассылок до следующей команды /start.
 
     Args:
         main_bot (Bot): Экземпляр бота с токеном основного бота.
@@ -35,11 +49,70 @@ async def send_message_to_user(main_bot: Bot, user_id: int, text: str, reply_mar
     """
     try:
         await main_bot.send_message(user_id, text, parse_mode="HTML", reply_markup=reply_markup)
-        logger.info(f"Сообщение отправлено пользователю {user_id} от основного бота")
+        logger.info("Сообщение отправлено пользователю %s от основного бота", user_id)
     except Exception as e:
-        logger.error(f"Ошибка отправки пользователю {user_id}: {str(e)}")
+        if is_unreachable(e):
+            logger.info("Пользователь %s недоступен и исключен из рассылок: %s", user_id, e)
+            try:
+                await db.set_users_active([user_id], False)
+            except Exception as db_error:
+                logger.error("Ошибка исключения пользователя %s из рассылок: %s", user_id, db_error)
+            return
+        logger.error("Ошибка отправки пользователю %s: %s", user_id, e)
+
+def extract_media(message: Message) -> Optional[Dict[str, Optional[str]]]:
+    """
+    Получает описание медиафайла из сообщения администратора.
+
+    Args:
+        message (Message): Сообщение с фото, видео или документом.
+
+    Returns:
+        Optional[Dict[str, Optional[str]]]: Описание медиафайла для BroadcastMessage или None, если медиа нет.
+    """
+    if message.photo:
+        return {"type": "photo", "source_file_id": message.photo[-1].file_id, "file_name": "photo.jpg", "file_id": None}
+    if message.video:
+        return {"type": "video", "source_file_id": message.video.file_id,
+                "file_name": message.video.file_name or "video.mp4", "file_id": None}
+    if message.document:
+        return {"type": "document", "source_file_id": message.document.file_id,
+                "file_name": message.document.file_name or "document", "file_id": None}
+    return None
+
+def build_broadcast_message(data: Dict[str, Any], reply_markup: Optional[InlineKeyboardMarkup] = None) -> BroadcastMessage:
+    """
+    Собирает сообщение рассылки из данных FSM.
+
+    Args:
+        data (Dict[str, Any]): Данные FSM: text, media и media_group.
+        reply_markup (Optional[InlineKeyboardMarkup]): Клавиатура с кнопками.
 
-@router.message(F.text == "Рассылка")
+    Returns:
+        BroadcastMessage: Сообщение рассылки.
+    """
+    return BroadcastMessage(data.get("text"), reply_markup, data.get("media"), data.get("media_group", False))
+
+async def start_broadcast(message: Message, main_bot: Bot, broadcast_message: BroadcastMessage) -> None:
+    """
+    Сохраняет задачу массовой рассылки, запускает ее в фоне и сразу возвращает управление администратору.
+    Ход рассылки (отправлено, ошибки, скорость, оставшееся время) обновляется в отдельном сообщении.
+
+    Args:
+        message (Message): Сообщение администратора, в чат которого выводится ход рассылки.
+        main_bot (Bot): Экземпляр бота с токеном основного бота.
+        broadcast_message (BroadcastMessage): Сообщение рассылки.
+    """
+    job = await broadcaster.create(
+        main_bot, broadcast_message, message.chat.id,
+        make_progress_reporter(message.bot, message.chat.id)
+    )
+    await message.answer(
+        f"Рассылка #{job.job_id} запущена, получателей: {job.stats.total}.\n"
+        f"Управление: /pause {job.job_id}, /resume {job.job_id}, /cancel {job.job_id}"
+    )
+
+@router.message(TextAction("admin_menu.messaging"))
 async def start_messaging(message: Message, state: FSMContext) -> None:
     """
     Обработчик команды 'Рассылка' для начала процесса отправки сообщений.
@@ -71,19 +144,44 @@ async def select_messaging_type(callback: CallbackQuery, state: FSMContext) -> N
     await state.update_data(messaging_type=callback.data)
     await state.set_state(MessagingStates.ENTER_TEXT)
     await callback.answer()
-    await callback.message.edit_text("Введите текст сообщения (можно использовать HTML, например, <b>жирный</b>):")
+    await callback.message.edit_text(
+        "Введите текст сообщения (можно использовать HTML, например, <b>жирный</b>) "
+        "или отправьте фото, видео, документ или альбом с подписью:"
+    )
 
 @router.message(MessagingStates.ENTER_TEXT)
 async def enter_text(message: Message, state: FSMContext) -> None:
     """
-    Обработчик ввода текста сообщения для рассылки.
-    Сохраняет текст и предлагает добавить кнопки, либо переходит к рассылке.
+    Обработчик ввода сообщения для рассылки: текста или медиа с подписью.
+    Сохраняет сообщение и предлагает добавить кнопки. Альбом собирается из нескольких
+    сообщений и рассылается сразу, так как Telegram не поддерживает кнопки у альбомов.
 
     Args:
         message (Message): Объект сообщения от пользователя.
         state (FSMContext): Контекст состояния FSM для управления процессом.
     """
-    await state.update_data(text=message.text)
+    if message.media_group_id:
+        album = _albums.get(message.media_group_id)
+        if album is not None:
+            album.append(message)
+            return
+        _albums[message.media_group_id] = album = [message]
+        await asyncio.sleep(ALBUM_COLLECT_DELAY)
+        del _albums[message.media_group_id]
+        album.sort(key=lambda item: item.message_id)
+        media = [item for item in map(extract_media, album) if item is not None]
+        text = next((item.caption for item in album if item.caption), None)
+        data = await state.update_data(text=text, media=media, media_group=True)
+        main_bot = bot_registry.get(data.get("main_bot_token"))
+        await start_broadcast(message, main_bot, build_broadcast_message(data))
+        await state.clear()
+        return
+
+    media = extract_media(message)
+    if media is None and not message.text:
+        await message.answer("Поддерживаются текст, фото, видео и документы.")
+        return
+    await state.update_data(text=message.caption if media else message.text, media=[media] if media else None)
     await state.set_state(MessagingStates.ADD_BUTTONS)
     await message.answer("Хотите добавить кнопки? (да/нет)")
 
@@ -91,27 +189,22 @@ async def enter_text(message: Message, state: FSMContext) -> None:
 async def add_buttons(message: Message, state: FSMContext) -> None:
     """
     Обработчик выбора добавления кнопок.
-    Если 'да', запрашивает текст и URL кнопки, если 'нет', запускает рассылку.
+    Если 'да', запрашивает текст и URL кнопки, если 'нет', запускает рассылку в фоне.
 
     Args:
         message (Message): Объект сообщения от пользователя.
         state (FSMContext): Контекст состояния FSM для управления процессом.
     """
     data = await state.get_data()
-    text = data["text"]
     main_bot_token = data.get("main_bot_token")
-    main_bot = Bot(token=main_bot_token)
+    main_bot = bot_registry.get(main_bot_token)
 
     if message.text.lower() == "да":
         await state.update_data(button_text="", button_url="")
         await state.set_state(MessagingStates.ENTER_BUTTON_TEXT)
         await message.answer("Введите текст для кнопки:")
     else:
-        users = await db.get_all_users()
-        if users:
-            for user_id in users:
-                await send_message_to_user(main_bot, user_id, text)
-        await message.answer("Массовое сообщение отправлено (проверьте логи).")
+        await start_broadcast(message, main_bot, build_broadcast_message(data))
         await state.clear()
 
 @router.message(MessagingStates.ENTER_BUTTON_TEXT)
@@ -130,7 +223,7 @@ async def enter_button_text(message: Message, state: FSMContext) -> None:
 @router.message(MessagingStates.ENTER_BUTTON_URL)
 async def enter_button_url(message: Message, state: FSMContext) -> None:
     """
-    Обработчик ввода URL кнопки и выполнения рассылки.
+    Обработчик ввода URL кнопки и запуска рассылки в фоне.
     Добавляет https://, если протокол отсутствует.
 
     Args:
@@ -138,7 +231,6 @@ async def enter_button_url(message: Message, state: FSMContext) -> None:
         state (FSMContext): Контекст состояния FSM для управления процессом.
     """
     data = await state.get_data()
-    text = data["text"]
     button_text = data["button_text"]
     button_url = message.text
 
@@ -147,18 +239,14 @@ async def enter_button_url(message: Message, state: FSMContext) -> None:
         button_url = f"https://{button_url}"
 
     main_bot_token = data.get("main_bot_token")
-    main_bot = Bot(token=main_bot_token)
+    main_bot = bot_registry.get(main_bot_token)
 
     # Создаем инлайн-кнопку
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
         [InlineKeyboardButton(text=button_text, url=button_url)]
     ])
 
-    users = await db.get_all_users()
-    if users:
-        for user_id in users:
-            await send_message_to_user(main_bot, user_id, text, keyboard)
-    await message.answer("Массовое сообщение с кнопкой отправлено (проверьте логи).")
+    await start_broadcast(message, main_bot, build_broadcast_message(data, keyboard))
     await state.clear()
 
 @router.message(MessagingStates.ENTER_TEXT, ~F.text.lower().in_({"да", "нет"}))
@@ -186,10 +274,10 @@ async def enter_user_id(message: Message, state: FSMContext) -> None:
     user_id = message.text
     text = data["text"]
     main_bot_token = data.get("main_bot_token")
-    main_bot = Bot(token=main_bot_token)
+    main_bot = bot_registry.get(main_bot_token)
     try:
         await send_message_to_user(main_bot, int(user_id), text)
     except Exception as e:
-        logger.error(f"Ошибка отправки пользователю {user_id}: {str(e)}")
+        logger.error("Ошибка отправки пользователю %s: %s", user_id, e)
     await message.answer(f"Сообщение '{text}' отправлено пользователю с ID {user_id} (проверьте логи).")
     await state.clear()
\ No newline at end of file
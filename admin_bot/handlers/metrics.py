@@ -0,0 +1,104 @@
+# admin_bot/handlers/metrics.py
+import time
+from typing import Any, Dict, List
+
+from aiogram import Router
+from aiogram.filters import Command
+from aiogram.types import Message
+
+from config import ADMIN_IDS, METRICS_PORT, WORKERS
+from utils.metrics import Labels, estimate_quantile, fetch_snapshots, merge_snapshots, registry
+
+router = Router()
+
+TOP_LABELS = 8
+"""Максимальное количество строк (обработчиков, методов) в разделе отчета."""
+
+def get_main_bot_ports() -> List[int]:
+    """
+    Получает порты серверов метрик процессов основного бота.
+
+    Returns:
+        List[int]: Порт входного процесса и порты рабочих процессов; пустой список, если метрики отключены.
+    """
+    if not METRICS_PORT:
+        return []
+    workers = WORKERS if WORKERS > 1 else 0
+    return [METRICS_PORT] + [METRICS_PORT + 1 + index for index in range(workers)]
+
+def format_latency(merged: Dict[str, Dict[Labels, Any]], title: str, histogram: str, errors: str) -> List[str]:
+    """
+    Формирует раздел отчета по гистограмме длительности: количество вызовов, среднее и 95-й перцентиль.
+
+    Args:
+        merged (Dict[str, Dict[Labels, Any]]): Суммарные метрики (см. merge_snapshots).
+        title (str): Заголовок раздела.
+        histogram (str): Имя гистограммы длительности.
+        errors (str): Имя счетчика ошибок с той же меткой.
+
+    Returns:
+        List[str]: Строки раздела (пустой список, если вызовов не было).
+    """
+    samples = merged.get(histogram, {})
+    if not samples:
+        return []
+    error_counts = merged.get(errors, {})
+    lines = [f"{title}:"]
+    for labels, (counts, total, count) in sorted(samples.items(), key=lambda item: -item[1][2])[:TOP_LABELS]:
+        p95 = estimate_quantile(counts, 0.95)
+        p95_text = f"≤{p95 * 1000:.0f} мс" if p95 != float("inf") else "более 10 с"
+        lines.append(
+            f"  {labels[0]}: {count}, среднее {total / count * 1000:.1f} мс, p95 {p95_text}, "
+            f"ошибок {error_counts.get(labels, 0):.0f}"
+        )
+    return lines
+
+def format_report(title: str, snapshots: List[Dict[str, Any]]) -> str:
+    """
+    Формирует отчет по метрикам одного бота.
+
+    Args:
+        title (str): Заголовок отчета.
+        snapshots (List[Dict[str, Any]]): Снимки метрик процессов бота.
+
+    Returns:
+        str: Текст отчета.
+    """
+    merged = merge_snapshots(snapshots)
+    uptime = max(time.time() - min(snapshot["started"] for snapshot in snapshots), 1.0)
+    updates = sum(merged.get("bot_updates_total", {}).values())
+    broadcast = merged.get("bot_broadcast_messages_total", {})
+    lines = [
+        f"{title} (процессов: {len(snapshots)}, работает {uptime / 3600:.1f} ч)",
+        f"Обновления: {updates:.0f} ({updates / uptime:.2f} в секунду)",
+    ]
+    lines += format_latency(merged, "Обработчики", "bot_handler_seconds", "bot_handler_errors_total")
+    lines += format_latency(merged, "Bot API", "bot_api_request_seconds", "bot_api_errors_total")
+    lines += format_latency(merged, "Google Sheets", "bot_sheets_seconds", "bot_sheets_errors_total")
+    lines += format_latency(merged, "База данных", "bot_db_seconds", "bot_db_errors_total")
+    notify_failures = sum(merged.get("bot_notify_admins_failures_total", {}).values())
+    lines.append(f"Ошибок уведомления администраторов: {notify_failures:.0f}")
+    if broadcast:
+        lines.append(
+            "Рассылки: " + ", ".join(f"{labels[0]} {value:.0f}" for labels, value in sorted(broadcast.items()))
+        )
+    return "\n".join(lines)
+
+@router.message(Command("metrics"))
+async def show_metrics(message: Message) -> None:
+    """
+    Обработчик команды '/metrics': показывает сводку метрик основного бота (со всех его процессов)
+    и админ-бота. Метрики основного бота запрашиваются у его локальных серверов метрик.
+    Доступно только администраторам, указанным в ADMIN_IDS.
+
+    Args:
+        message (Message): Объект сообщения от пользователя.
+    """
+    if message.from_user.id not in ADMIN_IDS:
+        return
+    main_snapshots = await fetch_snapshots(get_main_bot_ports())
+    if main_snapshots:
+        main_report = format_report("Основной бот", main_snapshots)
+    else:
+        main_report = "Основной бот: метрики недоступны (бот не запущен или METRICS_PORT = 0)."
+    await message.answer(main_report + "\n\n" + format_report("Админ-бот", [registry.snapshot()]))
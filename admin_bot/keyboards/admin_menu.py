@@ -1,20 +1,14 @@
 # admin_bot/keyboards/admin_menu.py
-from aiogram.types import ReplyKeyboardMarkup, KeyboardButton
-from utils.text_manager import get_text
+from aiogram.types import ReplyKeyboardMarkup
+from utils.keyboard_registry import get_keyboard
 
 def get_admin_menu() -> ReplyKeyboardMarkup:
     """
-    Создает клавиатуру главного меню админ-панели с кнопками управления и рассылки.
-    Тексты берутся из файла texts/admin_menu.yaml.
+    Возвращает клавиатуру главного меню админ-панели с кнопками управления и рассылки.
+    Тексты берутся из файла texts/admin_menu.yaml, клавиатура описана в texts/keyboards.yaml
+    и собрана один раз при запуске.
 
     Returns:
         ReplyKeyboardMarkup: Клавиатура с кнопками "Управление ботом" и "Рассылка".
     """
-    keyboard = ReplyKeyboardMarkup(
-        keyboard=[
-            [KeyboardButton(text=get_text("admin_menu", "control"))],
-            [KeyboardButton(text=get_text("admin_menu", "messaging"))],
-        ],
-        resize_keyboard=True
-    )
-    return keyboard
\ No newline at end of file
+    return get_keyboard("admin_menu")
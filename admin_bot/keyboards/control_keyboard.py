@@ -1,21 +1,17 @@
 # admin_bot/keyboards/control_keyboard.py
-from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
-from config import bot_status
+from aiogram.types import InlineKeyboardMarkup
+from utils.keyboard_registry import get_keyboard
 
-def get_control_keyboard() -> InlineKeyboardMarkup:
+def get_control_keyboard(is_active: bool) -> InlineKeyboardMarkup:
     """
-    Создает инлайн-клавиатуру для переключения статуса бота (вкл/выкл).
-    Текст кнопки зависит от текущего значения bot_status['is_active'].
+    Возвращает инлайн-клавиатуру для переключения статуса бота (вкл/выкл).
+    Текст кнопки зависит от текущего статуса бота; оба варианта описаны в texts/keyboards.yaml
+    и собраны один раз при запуске.
+
+    Args:
+        is_active (bool): Текущий статус бота (True - включен).
 
     Returns:
         InlineKeyboardMarkup: Клавиатура с одной кнопкой ("Переключить" или "Включить").
     """
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [
-            InlineKeyboardButton(
-                text="Переключить" if bot_status['is_active'] else "Включить",
-                callback_data="toggle_bot"
-            )
-        ]
-    ])
-    return keyboard
\ No newline at end of file
+    return get_keyboard("control_active" if is_active else "control_inactive")
@@ -1,17 +1,13 @@
 # admin_bot/keyboards/messaging_keyboard.py
-from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+from aiogram.types import InlineKeyboardMarkup
+from utils.keyboard_registry import get_keyboard
 
 def get_messaging_keyboard() -> InlineKeyboardMarkup:
     """
-    Создает инлайн-клавиатуру для выбора типа рассылки (массово или избирательно).
+    Возвращает инлайн-клавиатуру для выбора типа рассылки.
+    Клавиатура описана в texts/keyboards.yaml и собрана один раз при запуске.
 
     Returns:
-        InlineKeyboardMarkup: Клавиатура с кнопками "Массово" и "Избирательно".
+        InlineKeyboardMarkup: Клавиатура с кнопкой "Массово".
     """
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [
-            InlineKeyboardButton(text="Массово", callback_data="mass")
-            #InlineKeyboardButton(text="Избирательно", callback_data="selective")
-        ]
-    ])
-    return keyboard
\ No newline at end of file
+    return get_keyboard("messaging")
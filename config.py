@@ -1,10 +1,10 @@
 # config.py
 from environs import Env
-from typing import List, Dict
+from typing import List
 import os
 import logging
-import json
-from utils.logger import logger
+import secrets
+from utils.logger import logger, setup_logging
 
 env = Env()
 # Проверка наличия файла .env
@@ -33,24 +33,53 @@ ADMIN_IDS: List[int] = env.list("ADMIN_IDS", subcast=int)
 """Список ID администраторов, загружаемый из файла .env и преобразованный в целые числа."""
 GOOGLE_SHEET_ID: str = env.str("GOOGLE_SHEET_ID")
 """ID Google Sheets таблицы, загружаемый из файла .env."""
+SHEETS_FLUSH_INTERVAL: float = env.float("SHEETS_FLUSH_INTERVAL", 1.0)
+"""Максимальное время (в секундах), которое заявка ждет в очереди перед записью в Google Sheets."""
+SHEETS_BATCH_SIZE: int = env.int("SHEETS_BATCH_SIZE", 50)
+"""Количество заявок в очереди, при котором они записываются в Google Sheets немедленно."""
 
-# Чтение статуса бота из файла
-STATUS_FILE = "bot_status.json"
-if os.path.exists(STATUS_FILE):
-    with open(STATUS_FILE, "r") as f:
-        bot_status = json.load(f)
-else:
-    bot_status = {"is_active": True}
-    with open(STATUS_FILE, "w") as f:
-        json.dump(bot_status, f)
-
-# Функция для обновления статуса
-def update_bot_status(status: bool) -> None:
-    global bot_status
-    bot_status["is_active"] = status
-    with open(STATUS_FILE, "w") as f:
-        json.dump(bot_status, f)
-        logger.info(f"Статус бота обновлен: {'включен' if status else 'выключен'}")
-
-bot_status: Dict[str, bool] = bot_status
-"""Словарь для хранения статуса бота, где 'is_active' указывает, включен ли бот."""
\ No newline at end of file
+BROADCAST_RATE: float = env.float("BROADCAST_RATE", 25.0)
+"""Максимальная скорость массовой рассылки, сообщений в секунду (лимит Telegram - около 30)."""
+BROADCAST_CONCURRENCY: int = env.int("BROADCAST_CONCURRENCY", 10)
+"""Максимальное количество одновременных запросов к Bot API при рассылке."""
+BOT_API_CONNECTION_LIMIT: int = env.int("BOT_API_CONNECTION_LIMIT", 100)
+"""Максимальное количество одновременных соединений с Bot API на один токен."""
+CONTROL_SOCKET: str = env.str("CONTROL_SOCKET", "bot_control.sock")
+"""Путь к Unix-сокету, через который админ-бот управляет основным ботом."""
+
+WORKERS: int = env.int("WORKERS", 1)
+"""Количество рабочих процессов основного бота; обновления распределяются между ними по ID пользователя."""
+
+WEBHOOK_URL: str = env.str("WEBHOOK_URL", "")
+"""Публичный HTTPS-адрес для приема обновлений через webhook. Если не задан, боты используют long polling."""
+WEBHOOK_HOST: str = env.str("WEBHOOK_HOST", "0.0.0.0")
+"""Адрес, на котором встроенный веб-сервер принимает обновления."""
+WEBHOOK_PORT: int = env.int("WEBHOOK_PORT", 8080)
+"""Порт веб-сервера основного бота."""
+ADMIN_WEBHOOK_PORT: int = env.int("ADMIN_WEBHOOK_PORT", 8081)
+"""Порт веб-сервера админ-бота."""
+WEBHOOK_SECRET: str = env.str("WEBHOOK_SECRET", "") or secrets.token_urlsafe(32)
+"""Секретный токен, которым Telegram подписывает запросы webhook. Если не задан, генерируется при запуске."""
+
+METRICS_HOST: str = env.str("METRICS_HOST", "127.0.0.1")
+"""Адрес серверов метрик в формате Prometheus (по умолчанию доступны только локально)."""
+METRICS_PORT: int = env.int("METRICS_PORT", 8090)
+"""Порт сервера метрик основного бота; рабочие процессы используют следующие порты (METRICS_PORT + 1 и далее). 0 - серверы метрик отключены."""
+ADMIN_METRICS_PORT: int = env.int("ADMIN_METRICS_PORT", 8089)
+"""Порт сервера метрик админ-бота (0 - отключен)."""
+
+LOG_LEVEL: str = env.str("LOG_LEVEL", "WARNING").upper()
+"""Уровень логирования (DEBUG, INFO, WARNING, ERROR)."""
+LOG_JSON: bool = env.bool("LOG_JSON", False)
+"""Записывать логи в формате JSON Lines (одна запись - один объект JSON) вместо текстового формата."""
+LOG_MAX_BYTES: int = env.int("LOG_MAX_BYTES", 10 * 1024 * 1024)
+"""Размер файла лога (в байтах), при котором он ротируется."""
+LOG_BACKUP_COUNT: int = env.int("LOG_BACKUP_COUNT", 5)
+"""Количество хранимых старых файлов лога."""
+LOG_ROTATE_WHEN: str = env.str("LOG_ROTATE_WHEN", "")
+"""Интервал ротации лога по времени (например, midnight). Если задан, заменяет ротацию по размеру."""
+
+setup_logging(
+    level=LOG_LEVEL, json_lines=LOG_JSON, max_bytes=LOG_MAX_BYTES,
+    backup_count=LOG_BACKUP_COUNT, when=LOG_ROTATE_WHEN
+)
@@ -13,9 +13,10 @@ from keyboards.main_menu import get_main_menu
 from keyboards.phone_keyboard import get_phone_keyboard
 from keyboards.rooms_keyboard import get_rooms_keyboard
 from keyboards.property_type_keyboard import get_property_type_keyboard
-from utils.text_manager import get_text
-from utils.google_sheets import append_row
-from utils.notify_admin import notify_admins
+from utils.text_manager import get_text, TextAction
+from utils.fast_dispatch import fast_dispatch, ANY_STATE
+from utils.outbox import outbox
+from utils.notify_admin import notify_admins_in_background
 
 router = Router()
 
@@ -30,7 +31,8 @@ class PropertySearch(StatesGroup):
     condition = State()     # Выбор состояния (только для исторического центра)
     phone = State()         # Поделиться контактом или отказ
 
-@router.message(F.text == get_text("main_menu", "search_property"))
+@router.message(TextAction("main_menu.search_property"))
+@fast_dispatch.route("main_menu.search_property", state=ANY_STATE)
 async def start_search(message: Message, state: FSMContext) -> None:
     """
     Обработчик команды для начала процесса подбора недвижимости.
@@ -47,7 +49,7 @@ async def start_search(message: Message, state: FSMContext) -> None:
     )
 
 # Новый роутер для обработки "Отмена" на этапе property_type
-@router.message(PropertySearch.property_type, F.text == get_text("main_menu", "cancel"))
+@router.message(PropertySearch.property_type, TextAction("main_menu.cancel"))
 async def cancel_property_type(message: Message, state: FSMContext) -> None:
     """
     Обработчик нажатия 'Отмена' на этапе выбора типа недвижимости.
@@ -57,15 +59,19 @@ async def cancel_property_type(message: Message, state: FSMContext) -> None:
         message (Message): Объект сообщения от пользователя.
         state (FSMContext): Контекст состояния FSM для управления процессом.
     """
-    logger.info(f"Пользователь {message.from_user.id} нажал 'Отмена' на этапе выбора типа, возвращаю в главное меню")
+    logger.info("Пользователь %s нажал 'Отмена' на этапе выбора типа, возвращаю в главное меню", message.from_user.id)
     await message.answer("Возврат в главное меню.", reply_markup=get_main_menu())
     await state.clear()
 
-@router.message(PropertySearch.property_type, F.text.in_([
-    get_text("main_menu", "new_build"),
-    get_text("main_menu", "secondary"),
-    get_text("main_menu", "historic")
-]))
+@router.message(PropertySearch.property_type, TextAction(
+    "main_menu.new_build",
+    "main_menu.secondary",
+    "main_menu.historic"
+))
+@fast_dispatch.route(
+    "main_menu.new_build", "main_menu.secondary", "main_menu.historic",
+    state=PropertySearch.property_type
+)
 async def process_property_type(message: Message, state: FSMContext) -> None:
     """
     Обработчик выбора типа недвижимости.
@@ -91,7 +97,7 @@ async def process_rooms(message: Message, state: FSMContext) -> None:
         state (FSMContext): Контекст состояния FSM для управления процессом.
     """
     if message.text == get_text("main_menu", "cancel"):
-        logger.info(f"Пользователь {message.from_user.id} нажал 'Отмена' на этапе выбора комнат, возвращаю в главное меню")
+        logger.info("Пользователь %s нажал 'Отмена' на этапе выбора комнат, возвращаю в главное меню", message.from_user.id)
         await message.answer("Возврат в главное меню.", reply_markup=get_main_menu())
         await state.clear()
         return
@@ -110,7 +116,7 @@ async def process_district(message: Message, state: FSMContext) -> None:
         state (FSMContext): Контекст состояния FSM для управления процессом.
     """
     if message.text == get_text("main_menu", "cancel"):
-        logger.info(f"Пользователь {message.from_user.id} нажал 'Отмена' на этапе выбора района, возвращаю в главное меню")
+        logger.info("Пользователь %s нажал 'Отмена' на этапе выбора района, возвращаю в главное меню", message.from_user.id)
         await message.answer("Возврат в главное меню.", reply_markup=get_main_menu())
         await state.clear()
         return
@@ -129,7 +135,7 @@ async def process_budget(message: Message, state: FSMContext) -> None:
         state (FSMContext): Контекст состояния FSM для управления процессом.
     """
     if message.text == get_text("main_menu", "cancel"):
-        logger.info(f"Пользователь {message.from_user.id} нажал 'Отмена' на этапе выбора бюджета, возвращаю в главное меню")
+        logger.info("Пользователь %s нажал 'Отмена' на этапе выбора бюджета, возвращаю в главное меню", message.from_user.id)
         await message.answer("Возврат в главное меню.", reply_markup=get_main_menu())
         await state.clear()
         return
@@ -153,7 +159,7 @@ async def process_condition(message: Message, state: FSMContext) -> None:
         state (FSMContext): Контекст состояния FSM для управления процессом.
     """
     if message.text == get_text("main_menu", "cancel"):
-        logger.info(f"Пользователь {message.from_user.id} нажал 'Отмена' на этапе выбора состояния, возвращаю в главное меню")
+        logger.info("Пользователь %s нажал 'Отмена' на этапе выбора состояния, возвращаю в главное меню", message.from_user.id)
         await message.answer("Возврат в главное меню.", reply_markup=get_main_menu())
         await state.clear()
         return
@@ -165,14 +171,14 @@ async def process_condition(message: Message, state: FSMContext) -> None:
 async def process_phone(message: Message, state: FSMContext) -> None:
     """
     Обработчик получения контакта или отказа.
-    Сохраняет данные в Google Sheets и отправляет уведомление админам, либо возвращает в главное меню при нажатии 'Отмена'.
+    Сохраняет заявку в очередь для записи в Google Sheets и отправляет уведомление админам, либо возвращает в главное меню при нажатии 'Отмена'.
 
     Args:
         message (Message): Объект сообщения от пользователя.
         state (FSMContext): Контекст состояния FSM для управления процессом.
     """
     if message.text == get_text("main_menu", "cancel"):
-        logger.info(f"Пользователь {message.from_user.id} нажал 'Отмена' на этапе ввода телефона, возвращаю в главное меню")
+        logger.info("Пользователь %s нажал 'Отмена' на этапе ввода телефона, возвращаю в главное меню", message.from_user.id)
         await message.answer("Возврат в главное меню.", reply_markup=get_main_menu())
         await state.clear()
         return
@@ -189,7 +195,7 @@ async def process_phone(message: Message, state: FSMContext) -> None:
         f"{message.from_user.username}.t.me"
     ]
 
-    success = append_row("SearchRequests", row_data)
+    success = await outbox.put("SearchRequests", row_data)
     if success:
         notification_text = (f"<b>Новая заявка от бота\n</b>"
                              f"Заявка на подбор:\nТип: {data.get('property_type')}\n"
@@ -199,7 +205,7 @@ async def process_phone(message: Message, state: FSMContext) -> None:
                              f"Состояние: {data.get('condition') if data.get('condition') else '-'}\n"
                              f"Телефон: {data.get('phone', 'Не указан')}\n"
                              f"Telegram: @{message.from_user.username if message.from_user.username else 'Скрыт'}")
-        await notify_admins(notification_text)
+        notify_admins_in_background(notification_text)  # Ответ пользователю не ждет отправки уведомлений
     await message.answer(
         get_text("responses", "success" if success else "error"),
         reply_markup=get_main_menu()
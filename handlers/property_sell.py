@@ -8,9 +8,10 @@ from utils.logger import logger
 
 from keyboards.main_menu import get_main_menu
 from keyboards.phone_keyboard import get_phone_keyboard
-from utils.notify_admin import notify_admins
-from utils.text_manager import get_text
-from utils.google_sheets import append_row
+from utils.notify_admin import notify_admins_in_background
+from utils.text_manager import get_text, TextAction
+from utils.fast_dispatch import fast_dispatch
+from utils.outbox import outbox
 from states.sell_states import SellStates
 
 router = Router()
@@ -21,7 +22,8 @@ class SellStates(StatesGroup):
     """
     phone = State()  # Поделиться контактом или отказ
 
-@router.message(F.text == get_text("main_menu", "sell_property"))
+@router.message(TextAction("main_menu.sell_property"))
+@fast_dispatch.route("main_menu.sell_property")
 async def start_sell(message: Message, state: FSMContext) -> None:
     """
     Обработчик команды для начала процесса подачи заявки на продажу.
@@ -38,26 +40,26 @@ async def start_sell(message: Message, state: FSMContext) -> None:
 async def process_sell(message: Message, state: FSMContext) -> None:
     """
     Обработчик получения контакта или отказа для заявки на продажу.
-    Сохраняет данные в Google Sheets и отправляет уведомление админам, либо возвращает в главное меню при нажатии 'Отмена'.
+    Сохраняет заявку в очередь для записи в Google Sheets и отправляет уведомление админам, либо возвращает в главное меню при нажатии 'Отмена'.
 
     Args:
         message (Message): Объект сообщения от пользователя.
         state (FSMContext): Контекст состояния FSM для управления процессом.
     """
     if message.text == get_text("main_menu", "cancel"):
-        logger.info(f"Пользователь {message.from_user.id} нажал 'Отмена' на этапе ввода телефона в процессе продажи, возвращаю в главное меню")
+        logger.info("Пользователь %s нажал 'Отмена' на этапе ввода телефона в процессе продажи, возвращаю в главное меню", message.from_user.id)
         await message.answer("Возврат в главное меню.", reply_markup=get_main_menu())
         await state.clear()
         return
     phone = message.contact.phone_number if message.content_type == "contact" else None
-    success = append_row("SellRequests", [phone if phone else "Отказался",
-                                         f"{message.from_user.username}.t.me" if message.from_user.username else "Скрыт",])
+    success = await outbox.put("SellRequests", [phone if phone else "Отказался",
+                                             f"{message.from_user.username}.t.me" if message.from_user.username else "Скрыт",])
     if success:
         notification_text = (f"<b>Новая заявка от бота\n</b>"
                             f"Заявка на продажу:\n"
                             f"Телефон: {phone if phone else 'Не указан'}\n"
                             f"Telegram: @{message.from_user.username if message.from_user.username else 'Скрыт'}")
-        await notify_admins(notification_text)
+        notify_admins_in_background(notification_text)  # Ответ пользователю не ждет отправки уведомлений
     await message.answer(
         get_text("responses", "success" if success else "error"),
         reply_markup=get_main_menu()
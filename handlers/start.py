@@ -1,16 +1,21 @@
 # handlers/start.py
 from aiogram import Router, F
-from aiogram.types import Message, FSInputFile
+from aiogram.types import Message
 from aiogram.fsm.context import FSMContext
 import logging
 from utils.logger import logger
 
 from keyboards.main_menu import get_main_menu
-from utils.text_manager import get_text
+from utils.text_manager import get_text, TextAction
+from utils.fast_dispatch import fast_dispatch, ANY_STATE
 from utils.database import db
+from utils.media_cache import media_cache
 
 router = Router()
 
+WELCOME_PHOTO = "pic/7694cf01-b877-4a89-be7a-3c1c3db2ff13.jpg"
+"""Путь к картинке приветственного сообщения."""
+
 @router.message(F.text == "/start")
 async def cmd_start(message: Message, state: FSMContext) -> None:
     """
@@ -23,18 +28,18 @@ async def cmd_start(message: Message, state: FSMContext) -> None:
     """
     # Регистрируем пользователя в базе данных
     if not await db.register_user(message.from_user.id):
-        logger.error(f"Не удалось зарегистрировать пользователя {message.from_user.id}")
-    else:
-        logger.info(f"Пользователь {message.from_user.id} успешно обработан в базе данных")
+        logger.error("Не удалось зарегистрировать пользователя %s", message.from_user.id)
 
-    photo = FSInputFile("pic/7694cf01-b877-4a89-be7a-3c1c3db2ff13.jpg")
-    await message.answer_photo(
-        photo=photo,
+    # Картинка загружается в Telegram один раз, дальше отправляется по сохраненному file_id
+    await media_cache.answer_photo(
+        message,
+        WELCOME_PHOTO,
         caption=get_text("welcome", "greeting"),
         reply_markup=get_main_menu()
     )
 
-@router.message(F.text == get_text("main_menu", "cancel"))
+@router.message(TextAction("main_menu.cancel"))
+@fast_dispatch.route("main_menu.cancel", state=ANY_STATE)
 async def process_cancel(message: Message, state: FSMContext) -> None:
     """
     Обработчик команды 'Отмена' для возврата в главное меню.
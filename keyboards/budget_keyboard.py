@@ -1,26 +1,14 @@
 # keyboards/budget_keyboard.py
-from aiogram.types import ReplyKeyboardMarkup, KeyboardButton
+from aiogram.types import ReplyKeyboardMarkup
+from utils.keyboard_registry import get_keyboard
 
 def get_budget_keyboard() -> ReplyKeyboardMarkup:
     """
-    Создает клавиатуру для выбора бюджета недвижимости.
-    Предоставляет четыре диапазона бюджета и кнопку "Назад".
+    Возвращает клавиатуру для выбора бюджета недвижимости.
+    Предоставляет четыре диапазона бюджета и кнопку "Отмена".
+    Клавиатура описана в texts/keyboards.yaml и собрана один раз при запуске.
 
     Returns:
         ReplyKeyboardMarkup: Клавиатура с кнопками выбора бюджета.
     """
-    keyboard = ReplyKeyboardMarkup(
-        keyboard=[
-            [
-                KeyboardButton(text="До 5 млн"),
-                KeyboardButton(text="5-10 млн")
-            ],
-            [
-                KeyboardButton(text="10-20 млн"),
-                KeyboardButton(text="20+ млн"),
-                KeyboardButton(text="Отмена")
-            ]
-        ],
-        resize_keyboard=True
-    )
-    return keyboard
\ No newline at end of file
+    return get_keyboard("budget")
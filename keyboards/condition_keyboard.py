@@ -1,17 +1,14 @@
 #keyboards/condition_keyboard.py
-from aiogram.types import ReplyKeyboardMarkup, KeyboardButton
+from aiogram.types import ReplyKeyboardMarkup
+from utils.keyboard_registry import get_keyboard
 
-def get_condition_keyboard():
-    keyboard = ReplyKeyboardMarkup(
-        keyboard=[
-            [
-                KeyboardButton(text="Под ремонт"),
-                KeyboardButton(text="С ремонтом")
-            ],
-            [
-                KeyboardButton(text="Отмена")
-            ]
-        ],
-        resize_keyboard=True
-    )
-    return keyboard
\ No newline at end of file
+def get_condition_keyboard() -> ReplyKeyboardMarkup:
+    """
+    Возвращает клавиатуру для выбора состояния недвижимости.
+    Содержит кнопки "Под ремонт", "С ремонтом" и "Отмена".
+    Клавиатура описана в texts/keyboards.yaml и собрана один раз при запуске.
+
+    Returns:
+        ReplyKeyboardMarkup: Клавиатура с кнопками выбора состояния.
+    """
+    return get_keyboard("condition")
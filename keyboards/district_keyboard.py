@@ -1,27 +1,14 @@
 # keyboards/district_keyboard.py
-from aiogram.types import ReplyKeyboardMarkup, KeyboardButton
+from aiogram.types import ReplyKeyboardMarkup
+from utils.keyboard_registry import get_keyboard
 
 def get_district_keyboard() -> ReplyKeyboardMarkup:
     """
-    Создает клавиатуру для выбора района недвижимости.
-    Предоставляет пять вариантов районов и кнопку "Назад".
+    Возвращает клавиатуру для выбора района недвижимости.
+    Предоставляет пять вариантов районов и кнопку "Отмена".
+    Клавиатура описана в texts/keyboards.yaml и собрана один раз при запуске.
 
     Returns:
         ReplyKeyboardMarkup: Клавиатура с кнопками выбора района.
     """
-    keyboard = ReplyKeyboardMarkup(
-        keyboard=[
-            [
-                KeyboardButton(text="Центр"),
-                KeyboardButton(text="Север"),
-                KeyboardButton(text="Юг")
-            ],
-            [
-                KeyboardButton(text="Восток"),
-                KeyboardButton(text="Запад"),
-                KeyboardButton(text="Отмена")
-            ]
-        ],
-        resize_keyboard=True
-    )
-    return keyboard
\ No newline at end of file
+    return get_keyboard("district")
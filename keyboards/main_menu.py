@@ -1,22 +1,15 @@
 # keyboards/main_menu.py
-from aiogram.types import ReplyKeyboardMarkup, KeyboardButton
-from utils.text_manager import get_text
+from aiogram.types import ReplyKeyboardMarkup
+from utils.keyboard_registry import get_keyboard
 
 def get_main_menu() -> ReplyKeyboardMarkup:
     """
-    Создает клавиатуру главного меню бота.
+    Возвращает клавиатуру главного меню бота.
     Содержит кнопки для подбора недвижимости, продажи и записи на экскурсию.
-    Тексты кнопок берутся из файла texts/main_menu.yaml.
+    Тексты кнопок берутся из файла texts/main_menu.yaml, клавиатура описана в texts/keyboards.yaml
+    и собрана один раз при запуске.
 
     Returns:
         ReplyKeyboardMarkup: Клавиатура с кнопками главного меню.
     """
-    keyboard = ReplyKeyboardMarkup(
-        keyboard=[
-            [KeyboardButton(text=get_text("main_menu", "search_property"))],
-            [KeyboardButton(text=get_text("main_menu", "sell_property"))],
-            [KeyboardButton(text=get_text("main_menu", "excursion"))],
-        ],
-        resize_keyboard=True
-    )
-    return keyboard
\ No newline at end of file
+    return get_keyboard("main_menu")
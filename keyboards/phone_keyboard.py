@@ -1,24 +1,15 @@
 # keyboards/phone_keyboard.py
-from aiogram.types import ReplyKeyboardMarkup, KeyboardButton
+from aiogram.types import ReplyKeyboardMarkup
+from utils.keyboard_registry import get_keyboard
 
 def get_phone_keyboard() -> ReplyKeyboardMarkup:
     """
-    Создает клавиатуру для запроса контакта пользователя.
-    Содержит кнопки "Поделиться контактом", "Отказаться" и "Назад".
+    Возвращает клавиатуру для запроса контакта пользователя.
+    Содержит кнопки "Поделиться контактом", "Отказаться" и "Отмена".
     Клавиатура одноразовая и исчезает после выбора.
+    Клавиатура описана в texts/keyboards.yaml и собрана один раз при запуске.
 
     Returns:
         ReplyKeyboardMarkup: Клавиатура для запроса контакта.
     """
-    keyboard = ReplyKeyboardMarkup(
-        keyboard=[
-            [
-                KeyboardButton(text="Поделиться контактом", request_contact=True),
-                KeyboardButton(text="Отказаться"),
-                KeyboardButton(text="Отмена")
-            ]
-        ],
-        resize_keyboard=True,
-        one_time_keyboard=True  # Клавиатура исчезнет после выбора
-    )
-    return keyboard
\ No newline at end of file
+    return get_keyboard("phone")
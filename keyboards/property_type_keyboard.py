@@ -1,28 +1,15 @@
 # keyboards/property_type_keyboard.py
-from aiogram.types import ReplyKeyboardMarkup, KeyboardButton
-from utils.text_manager import get_text
+from aiogram.types import ReplyKeyboardMarkup
+from utils.keyboard_registry import get_keyboard
 
 def get_property_type_keyboard() -> ReplyKeyboardMarkup:
     """
-    Создает клавиатуру для выбора типа недвижимости.
-    Содержит кнопки "Новостройка", "Вторичное жилье", "Исторический центр" и "Назад".
-    Тексты кнопок берутся из файла texts/main_menu.yaml.
-    Клавиатура одноразовая и исчезает после выбора.
+    Возвращает клавиатуру для выбора типа недвижимости.
+    Содержит кнопки "Новостройка", "Вторичное жилье", "Исторический центр" и "Отмена".
+    Тексты кнопок берутся из файла texts/main_menu.yaml, клавиатура описана в texts/keyboards.yaml
+    и собрана один раз при запуске.
 
     Returns:
         ReplyKeyboardMarkup: Клавиатура для выбора типа недвижимости.
     """
-    keyboard = ReplyKeyboardMarkup(
-        keyboard=[
-            [
-                KeyboardButton(text=get_text("main_menu", "new_build")),
-                KeyboardButton(text=get_text("main_menu", "secondary"))
-            ],
-            [
-                KeyboardButton(text=get_text("main_menu", "historic")),
-                KeyboardButton(text=get_text("main_menu", "cancel"))
-            ]
-        ],
-        resize_keyboard=True
-    )
-    return keyboard
\ No newline at end of file
+    return get_keyboard("property_type")
@@ -1,26 +1,14 @@
 # keyboards/rooms_keyboard.py
-from aiogram.types import ReplyKeyboardMarkup, KeyboardButton
+from aiogram.types import ReplyKeyboardMarkup
+from utils.keyboard_registry import get_keyboard
 
 def get_rooms_keyboard() -> ReplyKeyboardMarkup:
     """
-    Создает клавиатуру для выбора количества комнат.
-    Содержит кнопки "1", "2", "3", "4+" и кнопку "Назад".
+    Возвращает клавиатуру для выбора количества комнат.
+    Содержит кнопки "1", "2", "3", "4+" и кнопку "Отмена".
+    Клавиатура описана в texts/keyboards.yaml и собрана один раз при запуске.
 
     Returns:
         ReplyKeyboardMarkup: Клавиатура для выбора количества комнат.
     """
-    keyboard = ReplyKeyboardMarkup(
-        keyboard=[
-            [
-                KeyboardButton(text="1"),
-                KeyboardButton(text="2"),
-                KeyboardButton(text="3")
-            ],
-            [
-                KeyboardButton(text="4+"),
-                KeyboardButton(text="Отмена")
-            ]
-        ],
-        resize_keyboard=True
-    )
-    return keyboard
\ No newline at end of file
+    return get_keyboard("rooms")
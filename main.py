@@ -1,15 +1,25 @@
 # main.py
 import asyncio
-from aiogram import Bot, Dispatcher
-from aiogram.client.default import DefaultBotProperties
+from typing import Any, List, Optional
+from aiogram import Dispatcher
 from aiogram.types import Update
 from aiogram.dispatcher.middlewares.base import BaseMiddleware
-import json
-import os
 import logging
-from utils.logger import logger
-from config import BOT_TOKEN, bot_status, update_bot_status, STATUS_FILE
+from utils.logger import logger, setup_logging
+from config import BOT_TOKEN, WEBHOOK_URL, WEBHOOK_PORT, WORKERS, METRICS_PORT
 from utils.database import db
+from utils.bot_registry import bot_registry
+from utils.bot_status import status_watcher
+from utils.control_channel import ControlServer
+from utils.outbox import outbox
+from utils.notify_admin import wait_background_notifications
+from utils.google_sheets import gs_client
+from utils.text_manager import text_manager
+from utils.fast_dispatch import fast_dispatch
+from utils import metrics
+from utils.fsm_storage import SqliteStorage
+from utils.webhook import run_webhook
+from utils.workers import WorkerPool, UpdateForwarder, UpdateConsumer, ignore_stop_signals
 
 from handlers import start, property_search, property_sell, excursion, callback_handlers
 
@@ -17,6 +27,7 @@ class PauseMiddleware(BaseMiddleware):
     """
     Middleware для проверки статуса паузы бота перед обработкой каждого обновления.
     Если бот паузирован (is_active = false), игнорирует обновления.
+    Статус хранится в памяти status_watcher, поэтому проверка не обращается к диску.
     """
     async def __call__(self, handler, event: Update, data: dict) -> None:
         """
@@ -27,46 +38,164 @@ class PauseMiddleware(BaseMiddleware):
             event (Update): Обновление от Telegram.
             data (dict): Данные контекста для обработки.
         """
-        with open(STATUS_FILE, "r") as f:
-            status = json.load(f)
-        if not status.get("is_active", True):
+        if not status_watcher.is_active:
             user_id = event.message.from_user.id if event.message else "unknown"
-            logger.info(f"Бот паузирован, обновление от {user_id} проигнорировано.")
+            logger.info("Бот паузирован, обновление от %s проигнорировано.", user_id)
             return  # Игнорируем обновление
         return await handler(event, data)
 
+ROUTERS = (
+    start.router,
+    property_search.router,
+    property_sell.router,
+    excursion.router,
+    callback_handlers.router
+)
+"""Роутеры основного бота в порядке проверки."""
+
+def log_sheets_connect_failure(task: asyncio.Task) -> None:
+    """
+    Логирует исключение фонового подключения к Google Sheets (ошибки авторизации warm_up логирует сам).
+
+    Args:
+        task (asyncio.Task): Завершившаяся задача подключения.
+    """
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Ошибка подключения к Google Sheets: %s", task.exception())
+
+def get_allowed_updates() -> List[str]:
+    """
+    Собирает типы обновлений, которые обрабатывают роутеры бота.
+
+    Returns:
+        List[str]: Типы обновлений для getUpdates или setWebhook.
+    """
+    return sorted({update_type for router in ROUTERS for update_type in router.resolve_used_update_types()})
+
 async def main() -> None:
     """
     Главная асинхронная функция для запуска основного бота.
-    Инициализирует бота, регистрирует роутеры и начинает polling.
+    Инициализирует бота, регистрирует роутеры и начинает прием обновлений:
+    через webhook, если задан WEBHOOK_URL, иначе через polling.
+    Если WORKERS больше 1, этот процесс только принимает обновления и распределяет их
+    по рабочим процессам (см. run_worker), а также доставляет заявки в Google Sheets.
     """
-    bot = Bot(token=BOT_TOKEN, default=DefaultBotProperties(parse_mode="HTML"))
-    dp = Dispatcher()
-
-    # Инициализация базы данных
+    bot = bot_registry.get(BOT_TOKEN)
+    storage: Optional[SqliteStorage] = None
+    # Инициализация базы данных; миграции схемы применяются здесь, до запуска рабочих процессов
     await db.connect()
+    if WORKERS <= 1:
+        # Состояния FSM сохраняются на диск: пользователь продолжит заполнение заявки после перезапуска
+        storage = SqliteStorage()
+        await storage.connect()
+    dp = Dispatcher(storage=storage)
+
+    # Подключение к Google Sheets идет в фоне: бот начинает принимать обновления сразу,
+    # а заявки до окончания подключения копятся в очереди
+    sheets_connect_task = asyncio.create_task(asyncio.to_thread(gs_client.warm_up))
+    sheets_connect_task.add_done_callback(log_sheets_connect_failure)
+    # Очередь заявок: доставка в Google Sheets идет в фоне (только в этом процессе)
+    await outbox.connect()
+    outbox.start()
+
+    # Статус паузы приходит от админ-бота через канал управления;
+    # опрос файла статуса нужен только если канал не удалось запустить
+    control_server = ControlServer(status_watcher)
+    status_watcher.start(poll=not await control_server.start())
+    # Метрики процесса в формате Prometheus (у рабочих процессов - свои серверы на следующих портах)
+    metrics_server = metrics.MetricsServer(METRICS_PORT)
+    await metrics_server.start()
 
     # Регистрация middleware для проверки паузы
     dp.update.middleware(PauseMiddleware())
 
-    # Регистрация роутеров
-    dp.include_routers(
-        start.router,
-        property_search.router,
-        property_sell.router,
-        excursion.router,
-        callback_handlers.router
-    )
+    workers: Optional[WorkerPool] = None
+    if storage is None:
+        # Обновления обрабатываются в рабочих процессах
+        workers = WorkerPool(WORKERS, run_worker)
+        workers.start()
+        dp.update.middleware(UpdateForwarder(workers))
+    else:
+        # Регистрация роутеров; нажатия на кнопки меню передаются обработчикам напрямую
+        dp.include_routers(*ROUTERS)
+        dp.message.outer_middleware(fast_dispatch)
+        metrics.install(dp)
+        # Тексты и клавиатуры перечитываются при изменении файлов в texts/
+        text_manager.start()
 
     try:
         logger.info("Бот запущен.")
-        await dp.start_polling(bot)
+        if WEBHOOK_URL:
+            await run_webhook(dp, bot, "/webhook/main", WEBHOOK_PORT, get_allowed_updates())
+        else:
+            # Входной процесс передает обновления по очереди, чтобы сохранить их порядок для каждого пользователя
+            await dp.start_polling(bot, handle_as_tasks=workers is None, allowed_updates=get_allowed_updates())
     finally:
-        await dp.stop_polling()
-        await bot.session.close()
+        sheets_connect_task.cancel()  # Подключение повторится при первой записи заявки
+        await asyncio.gather(sheets_connect_task, return_exceptions=True)
+        if workers is not None:
+            await workers.stop()  # Рабочие процессы дообрабатывают полученные обновления
+        await control_server.stop()
+        await metrics_server.stop()
+        await status_watcher.stop()
+        await text_manager.stop()
+        await outbox.close()  # Недоставленные заявки остаются в очереди до следующего запуска
+        if storage is not None:
+            await storage.close()  # Сохраняем несохраненные состояния FSM
+        await wait_background_notifications()  # Дожидаемся уведомлений администраторов о заявках
+        await bot_registry.close()  # Закрываем сессии основного бота и бота уведомлений
         await db.close()  # Закрываем базу данных
         logger.info("Основной бот завершил работу.")
 
+async def worker_main(index: int, queue: Any) -> None:
+    """
+    Главная асинхронная функция рабочего процесса: обрабатывает обновления пользователей,
+    закрепленных за процессом. База данных, очередь заявок и состояния FSM хранятся
+    в общих файлах SQLite; заявки доставляет в Google Sheets входной процесс.
+
+    Args:
+        index (int): Номер рабочего процесса.
+        queue (Any): Очередь обновлений процесса.
+    """
+    bot = bot_registry.get(BOT_TOKEN)
+    await db.connect()
+    await outbox.connect()
+    storage = SqliteStorage()
+    await storage.connect()
+    dp = Dispatcher(storage=storage)
+    dp.include_routers(*ROUTERS)
+    dp.message.outer_middleware(fast_dispatch)
+    metrics.install(dp)
+    metrics_server = metrics.MetricsServer(METRICS_PORT and METRICS_PORT + 1 + index)
+    await metrics_server.start()
+    text_manager.start()
+
+    try:
+        logger.info("Рабочий процесс %s запущен.", index)
+        await UpdateConsumer(dp, bot, queue).run()
+    finally:
+        await text_manager.stop()
+        await metrics_server.stop()
+        await outbox.close()
+        await storage.close()
+        await wait_background_notifications()
+        await bot_registry.close()
+        await db.close()
+        logger.info("Рабочий процесс %s завершил работу.", index)
+
+def run_worker(index: int, queue: Any) -> None:
+    """
+    Точка входа рабочего процесса.
+
+    Args:
+        index (int): Номер рабочего процесса.
+        queue (Any): Очередь обновлений процесса.
+    """
+    ignore_stop_signals()
+    # Каждый процесс пишет в свой файл, чтобы ротация одного файла не конфликтовала между процессами
+    setup_logging(file_name=f"bot.worker{index}.log")
+    asyncio.run(worker_main(index, queue))
+
 if __name__ == "__main__":
     try:
         asyncio.run(main())
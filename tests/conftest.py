@@ -0,0 +1,99 @@
+# tests/conftest.py
+import asyncio
+import os
+import sys
+import tempfile
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional
+
+import pytest
+from aiogram import Bot
+from aiogram.client.session.base import BaseSession
+from aiogram.methods import TelegramMethod
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+"""Корень проекта, из которого импортируются модули бота."""
+TEST_ENV = {
+    "BOT_TOKEN": "123:test",
+    "ADMIN_BOT_TOKEN": "456:test",
+    "ADMIN_IDS": "1",
+    "GOOGLE_SHEET_ID": "test",
+    "WEBHOOK_HOST": "127.0.0.1",
+    "METRICS_PORT": "0",
+    "ADMIN_METRICS_PORT": "0",
+}
+"""Значения обязательных переменных .env для тестов."""
+
+def pytest_configure(config) -> None:
+    """
+    Готовит окружение до импорта модулей бота: config.py требует файл .env в текущей директории
+    и создает рядом с ним файлы состояния, поэтому тесты работают во временной директории.
+    Обязательные переменные задаются через окружение процесса.
+    """
+    sys.path.insert(0, ROOT_DIR)
+    work_dir = tempfile.mkdtemp(prefix="realtor_bot_tests_")
+    open(os.path.join(work_dir, ".env"), "w").close()
+    os.chdir(work_dir)
+    for name, value in TEST_ENV.items():
+        os.environ.setdefault(name, value)
+
+class RecordingSession(BaseSession):
+    """
+    Сессия Bot API для тестов: запросы не уходят в Telegram, а записываются,
+    при необходимости с имитацией задержки сети.
+    """
+    def __init__(self, latency: float = 0.0,
+                 responses: Optional[Dict[str, Callable[[TelegramMethod], Any]]] = None) -> None:
+        """
+        Args:
+            latency (float): Задержка ответа на каждый запрос, в секундах.
+            responses (Optional[Dict[str, Callable[[TelegramMethod], Any]]]): Ответы на методы Bot API
+                по названию метода (например, "GetMe"); на остальные методы сессия отвечает True.
+        """
+        super().__init__()
+        self.latency = latency
+        self.responses = responses or {}
+        self.requests: List[TelegramMethod] = []
+
+    async def make_request(self, bot: Bot, method: TelegramMethod, timeout: Optional[int] = None) -> Any:
+        """
+        Записывает запрос и отвечает по responses, а по умолчанию - True (как setWebhook, deleteWebhook и т.п.).
+
+        Args:
+            bot (Bot): Бот, от имени которого выполняется запрос.
+            method (TelegramMethod): Метод Bot API.
+            timeout (Optional[int]): Время ожидания ответа.
+
+        Returns:
+            Any: Результат запроса.
+        """
+        self.requests.append(method)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        respond = self.responses.get(type(method).__name__)
+        return respond(method) if respond else True
+
+    async def stream_content(self, url: str, headers: Optional[Dict[str, Any]] = None, timeout: int = 30,
+                             chunk_size: int = 65536, raise_for_status: bool = True) -> AsyncGenerator[bytes, None]:
+        """
+        Скачивание файлов в тестах не используется.
+        """
+        yield b""
+
+    async def close(self) -> None:
+        """
+        Закрывать нечего: сессия не открывает соединений.
+        """
+
+    def methods(self) -> List[str]:
+        """
+        Returns:
+            List[str]: Названия выполненных методов Bot API в порядке вызова.
+        """
+        return [type(method).__name__ for method in self.requests]
+
+@pytest.fixture
+def bot() -> Bot:
+    """
+    Бот с сессией RecordingSession: обработчики работают как обычно, но без обращений к Telegram.
+    """
+    return Bot("123:test", session=RecordingSession())
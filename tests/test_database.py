@@ -0,0 +1,170 @@
+# tests/test_database.py
+import asyncio
+import multiprocessing
+import os
+import sqlite3
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable, Tuple
+
+from utils.database import Database
+
+PROCESS_WRITES = 200
+"""Количество записей, которые каждый из двух процессов делает в общий users.db."""
+SYNTHETIC_USERS = 1_000_000
+"""Размер синтетической таблицы users для бенчмарка потокового чтения получателей рассылки."""
+
+def test_registration_does_not_block_other_process(tmp_path) -> None:
+    """
+    Основной бот и админ-бот работают с одним users.db: ни регистрация нового пользователя,
+    ни повторный /start уже зарегистрированного не должны оставлять открытую транзакцию,
+    из-за которой запись во втором соединении падает с "database is locked".
+    """
+    db_name = os.path.join(tmp_path, "users.db")
+
+    async def scenario() -> None:
+        first_run = Database(db_name)
+        await first_run.connect()
+        await first_run.register_user(1)
+        await first_run.close()  # Сохраняет регистрацию
+
+        # После перезапуска кэш пользователей пуст, и /start доходит до базы данных
+        main_db, admin_db = Database(db_name), Database(db_name)
+        await main_db.connect()
+        await admin_db.connect()
+        try:
+            assert await main_db.register_user(1)  # Пользователь уже есть, запрос ничего не меняет
+            assert await main_db.register_user(2)  # Новый пользователь
+            job_id, total, skipped = await asyncio.wait_for(admin_db.create_broadcast_job("{}", 1), timeout=10)
+            assert (total, skipped) == (2, 0)
+            await admin_db.set_users_active([1], False)
+        finally:
+            await main_db.close()
+            await admin_db.close()
+
+    asyncio.run(scenario())
+
+async def write_from_process(db_name: str, start: Any) -> None:
+    """
+    Записи второго процесса: регистрации новых пользователей и изменения их статуса доставки.
+
+    Args:
+        db_name (str): Путь к файлу базы данных.
+        start (Any): Событие одновременного начала записи в обоих процессах.
+    """
+    db = Database(db_name)
+    await db.connect()
+    try:
+        await asyncio.to_thread(start.wait)
+        for user_id in range(PROCESS_WRITES + 1, 2 * PROCESS_WRITES + 1):
+            assert await db.register_user(user_id)
+            if user_id % 10 == 0:
+                await db.set_users_active([user_id], False)
+    finally:
+        await db.close()
+
+def run_writer_process(db_name: str, start: Any) -> None:
+    """
+    Точка входа второго процесса (запускается через spawn, как рабочие процессы бота).
+
+    Args:
+        db_name (str): Путь к файлу базы данных.
+        start (Any): Событие одновременного начала записи.
+    """
+    asyncio.run(write_from_process(db_name, start))
+
+def test_two_processes_share_database(tmp_path) -> None:
+    """
+    Два процесса (как входной и рабочий процессы бота или основной бот и админ-бот) одновременно
+    пишут в один users.db: благодаря WAL и busy_timeout ни одна запись не падает с "database is locked",
+    а чтение в родительском процессе не блокирует запись во втором.
+    """
+    db_name = os.path.join(tmp_path, "users.db")
+    context = multiprocessing.get_context("spawn")
+    start = context.Event()
+
+    async def scenario() -> None:
+        db = Database(db_name)
+        await db.connect()  # Миграции применяются до запуска второго процесса, как в main.py
+        process = context.Process(target=run_writer_process, args=(db_name, start))
+        process.start()
+        try:
+            start.set()
+            for user_id in range(1, PROCESS_WRITES + 1):
+                assert await db.register_user(user_id)
+                if user_id % 20 == 0:
+                    job_id, total, skipped = await db.create_broadcast_job("{}", 1)
+                    async for user_ids in db.iter_user_ids(0, 50):
+                        await db.claim_broadcast_users(job_id, user_ids)
+                    await db.set_broadcast_job_status(job_id, "done")
+            await asyncio.to_thread(process.join, 60)
+            assert process.exitcode == 0
+
+            cursor = await db.reader.execute("SELECT COUNT(*), SUM(is_active) FROM users")
+            assert tuple(await cursor.fetchone()) == (2 * PROCESS_WRITES, 2 * PROCESS_WRITES - PROCESS_WRITES // 10)
+        finally:
+            if process.is_alive():
+                process.kill()
+            await db.close()
+
+    asyncio.run(scenario())
+
+async def measure_memory(read: Callable[[], Awaitable[int]]) -> Tuple[int, int, float]:
+    """
+    Выполняет чтение пользователей, отслеживая пиковый объем памяти.
+
+    Args:
+        read (Callable[[], Awaitable[int]]): Чтение, возвращающее количество прочитанных ID.
+
+    Returns:
+        Tuple[int, int, float]: Количество ID, пиковый прирост памяти в байтах и время чтения в секундах.
+    """
+    tracemalloc.start()
+    try:
+        started = time.perf_counter()
+        count = await read()
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return count, peak, elapsed
+
+def test_iter_user_ids_memory_is_flat(tmp_path) -> None:
+    """
+    Бенчмарк на синтетической таблице users из миллиона строк: память при потоковом чтении получателей
+    не зависит от размера аудитории, в отличие от чтения всего списка через get_all_users.
+    """
+    db_name = os.path.join(tmp_path, "users.db")
+
+    async def scenario() -> None:
+        db = Database(db_name)
+        await db.connect()
+        with sqlite3.connect(db_name) as connection:
+            connection.executemany(
+                "INSERT INTO users (user_id, timestamp) VALUES (?, '2024-01-01 00:00:00')",
+                ((user_id,) for user_id in range(1, SYNTHETIC_USERS + 1))
+            )
+        try:
+            async def stream(after_user_id: int) -> int:
+                count = 0
+                async for user_ids in db.iter_user_ids(after_user_id):
+                    count += len(user_ids)
+                return count
+
+            async def fetch_all() -> int:
+                return len(await db.get_all_users())
+
+            tail = await measure_memory(lambda: stream(SYNTHETIC_USERS - SYNTHETIC_USERS // 10))
+            full = await measure_memory(lambda: stream(0))
+            everything = await measure_memory(fetch_all)
+        finally:
+            await db.close()
+
+        for name, (count, peak, elapsed) in (("iter_user_ids, 10% таблицы", tail), ("iter_user_ids", full),
+                                             ("get_all_users", everything)):
+            print(f"\n{name}: {count} ID, пик памяти {peak / 1024:.0f} КБ, {elapsed:.2f} с", end="")
+        assert (tail[0], full[0], everything[0]) == (SYNTHETIC_USERS // 10, SYNTHETIC_USERS, SYNTHETIC_USERS)
+        assert full[1] < 2 * tail[1]
+        assert full[1] < everything[1] / 10
+
+    asyncio.run(scenario())
@@ -0,0 +1,78 @@
+# tests/test_fast_dispatch.py
+import asyncio
+import time
+from typing import Dict, List
+
+from aiogram import Bot, Dispatcher, Router
+from aiogram.types import Message, Update
+
+from utils.fast_dispatch import FastDispatch
+from utils.text_manager import TextAction, text_manager
+
+HANDLER_COUNTS = (10, 50, 200)
+"""Количество обработчиков кнопок меню, при котором измеряется время маршрутизации."""
+DISPATCHED_UPDATES = 2000
+"""Количество обновлений в каждом замере."""
+
+def build_dispatcher(buttons: int, fast: bool) -> Dispatcher:
+    """
+    Создает диспетчер с обработчиками синтетических кнопок меню, зарегистрированными как в роутерах бота:
+    фильтром TextAction и, для быстрого пути, в таблице FastDispatch.
+
+    Args:
+        buttons (int): Количество обработчиков.
+        fast (bool): Подключить ли быстрый путь маршрутизации.
+
+    Returns:
+        Dispatcher: Диспетчер с обработчиками.
+    """
+    dp = Dispatcher()
+    router = Router()
+    fast_dispatch = FastDispatch()
+    for index in range(buttons):
+        async def handle(message: Message) -> None:
+            pass
+
+        router.message(TextAction(f"bench.button_{index}"))(fast_dispatch.route(f"bench.button_{index}")(handle))
+    dp.include_router(router)
+    if fast:
+        dp.message.outer_middleware(fast_dispatch)
+    return dp
+
+def test_dispatch_time_as_handlers_are_added(bot: Bot, monkeypatch) -> None:
+    """
+    Бенчмарк времени маршрутизации нажатия на кнопку меню в зависимости от количества обработчиков:
+    обычная маршрутизация aiogram проверяет фильтры по очереди, а быстрый путь находит обработчик
+    одним поиском в словаре, поэтому его время не растет с количеством кнопок.
+    """
+    for index in range(max(HANDLER_COUNTS)):
+        monkeypatch.setitem(text_manager._actions, f"Кнопка {index}", f"bench.button_{index}")
+    timings: Dict[bool, List[float]] = {False: [], True: []}
+
+    async def scenario() -> None:
+        for buttons in HANDLER_COUNTS:
+            # Нажимается последняя кнопка: при обычной маршрутизации ее фильтр проверяется последним
+            update = Update.model_validate({
+                "update_id": 1,
+                "message": {
+                    "message_id": 1,
+                    "date": 0,
+                    "chat": {"id": 1, "type": "private"},
+                    "from": {"id": 1, "is_bot": False, "first_name": "Test"},
+                    "text": f"Кнопка {buttons - 1}",
+                },
+            })
+            for fast in (False, True):
+                dp = build_dispatcher(buttons, fast)
+                started = time.perf_counter()
+                for _ in range(DISPATCHED_UPDATES):
+                    await dp.feed_update(bot, update)
+                timings[fast].append((time.perf_counter() - started) / DISPATCHED_UPDATES)
+
+    asyncio.run(scenario())
+    print("\nОбработчиков: " + ", ".join(
+        f"{buttons} - aiogram {plain * 1e6:.0f} мкс, быстрый путь {fast * 1e6:.0f} мкс"
+        for buttons, plain, fast in zip(HANDLER_COUNTS, timings[False], timings[True])
+    ))
+    assert timings[True][-1] < 2 * timings[True][0]
+    assert timings[True][-1] < timings[False][-1] / 2
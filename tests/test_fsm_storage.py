@@ -0,0 +1,77 @@
+# tests/test_fsm_storage.py
+import asyncio
+import os
+import time
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import BaseStorage, StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from handlers.property_search import PropertySearch
+from utils.fsm_storage import SqliteStorage
+
+FUNNEL_USERS = 2000
+"""Количество пользователей, проходящих сценарий подбора в бенчмарке хранилищ состояний."""
+FUNNEL = (
+    (PropertySearch.property_type, "property_type", "Квартира"),
+    (PropertySearch.rooms, "rooms", "2"),
+    (PropertySearch.district, "district", "Центр"),
+    (PropertySearch.budget, "budget", "10"),
+    (PropertySearch.condition, "condition", "-"),
+    (PropertySearch.phone, "phone", "+79000000000"),
+)
+"""Шаги сценария подбора: состояние и данные, сохраняемые на шаге."""
+
+async def run_funnel(storage: BaseStorage) -> float:
+    """
+    Проводит пользователей по сценарию подбора так, как это делают диспетчер и обработчики:
+    на каждое обновление читается состояние, затем обновляются данные и устанавливается следующее состояние.
+
+    Args:
+        storage (BaseStorage): Хранилище состояний.
+
+    Returns:
+        float: Среднее время работы с хранилищем на одно обновление, в секундах.
+    """
+    started = time.perf_counter()
+    for user_id in range(1, FUNNEL_USERS + 1):
+        state = FSMContext(storage, StorageKey(bot_id=123, chat_id=user_id, user_id=user_id))
+        for next_state, field, value in FUNNEL:
+            await state.get_state()
+            await state.update_data({field: value})
+            await state.set_state(next_state)
+    return (time.perf_counter() - started) / (FUNNEL_USERS * len(FUNNEL))
+
+def test_sqlite_storage_against_memory_storage(tmp_path) -> None:
+    """
+    Бенчмарк SqliteStorage в сравнении с MemoryStorage: чтение и запись состояний идут через кэш в памяти,
+    поэтому стоимость обновления сопоставима с MemoryStorage, а состояния переживают перезапуск.
+    """
+    db_name = os.path.join(tmp_path, "fsm.db")
+
+    async def scenario() -> None:
+        memory_storage = MemoryStorage()
+        memory = await run_funnel(memory_storage)
+        await memory_storage.close()
+
+        storage = SqliteStorage(db_name)
+        await storage.connect()
+        sqlite = await run_funnel(storage)
+        started = time.perf_counter()
+        await storage.close()  # Сохраняет изменения, еще не записанные фоновой задачей
+        close = time.perf_counter() - started
+
+        restarted = SqliteStorage(db_name)
+        await restarted.connect()
+        try:
+            key = StorageKey(bot_id=123, chat_id=FUNNEL_USERS, user_id=FUNNEL_USERS)
+            assert await restarted.get_state(key) == PropertySearch.phone.state
+            assert await restarted.get_data(key) == {field: value for _, field, value in FUNNEL}
+        finally:
+            await restarted.close()
+
+        print(f"\nMemoryStorage: {memory * 1e6:.1f} мкс на обновление, SqliteStorage: {sqlite * 1e6:.1f} мкс "
+              f"на обновление, сохранение при остановке: {close * 1000:.0f} мс")
+        assert sqlite < 5 * memory
+
+    asyncio.run(scenario())
@@ -0,0 +1,217 @@
+# tests/test_google_sheets.py
+import asyncio
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List
+
+from aiogram import Bot
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.types import Message
+
+import handlers.property_search as property_search
+from handlers.property_search import PropertySearch
+from utils.google_sheets import SHEET_HEADERS, GoogleSheetsClient, gs_client
+from utils.outbox import LeadOutbox
+
+SHEETS_LATENCY = 1.0
+"""Время (в секундах), за которое медленный Google Sheets выполняет одну запись."""
+LEADS = 20
+"""Количество пользователей, одновременно отправляющих заявку, пока Google Sheets занят записью."""
+APPENDED_LEADS = 5
+"""Количество заявок, записываемых в лист каждого размера при измерении трафика."""
+
+def make_contact_message(bot: Bot, user_id: int) -> Message:
+    """
+    Создает сообщение с контактом пользователя, привязанное к тестовому боту.
+
+    Args:
+        bot (Bot): Бот, от имени которого обработчик отвечает пользователю.
+        user_id (int): ID пользователя.
+
+    Returns:
+        Message: Сообщение с контактом.
+    """
+    return Message.model_validate({
+        "message_id": user_id,
+        "date": 0,
+        "chat": {"id": user_id, "type": "private"},
+        "from": {"id": user_id, "is_bot": False, "first_name": "Test", "username": f"user{user_id}"},
+        "contact": {"phone_number": f"+7900{user_id:07d}", "first_name": "Test"},
+    }, context={"bot": bot})
+
+def test_leads_do_not_wait_for_slow_sheets(bot: Bot, monkeypatch, tmp_path) -> None:
+    """
+    Бенчмарк задержки обработки заявок, пока Google Sheets медленно выполняет запись:
+    заявки пользователей сохраняются в очередь и получают ответ, не дожидаясь записи в таблицу,
+    а все заявки затем доставляются в Google Sheets.
+    """
+    writing = threading.Event()
+    delivered: List[List[Any]] = []
+
+    def slow_append_rows(rows_by_sheet: Dict[str, List[List[Any]]]) -> bool:
+        writing.set()
+        time.sleep(SHEETS_LATENCY)  # gspread синхронный: поток занят на все время запроса
+        delivered.extend(rows_by_sheet["SearchRequests"])
+        return True
+
+    outbox = LeadOutbox(os.path.join(tmp_path, "outbox.db"))
+    monkeypatch.setattr(gs_client, "append_rows", slow_append_rows)
+    monkeypatch.setattr(property_search, "outbox", outbox)
+    monkeypatch.setattr(property_search, "notify_admins_in_background", lambda text: None)
+    storage = MemoryStorage()
+
+    async def submit_lead(user_id: int) -> float:
+        state = FSMContext(storage, StorageKey(bot_id=bot.id, chat_id=user_id, user_id=user_id))
+        await state.set_state(PropertySearch.phone)
+        await state.update_data(property_type="Квартира", rooms="2", district="Центр", budget="10", condition="-")
+        started = time.perf_counter()
+        await property_search.process_phone(make_contact_message(bot, user_id), state)
+        return time.perf_counter() - started
+
+    async def scenario() -> None:
+        await outbox.connect()
+        outbox.start()
+        try:
+            await submit_lead(0)
+            # Первая заявка пишется в таблицу, остальные приходят во время записи
+            await asyncio.to_thread(writing.wait, 5)
+            latencies = await asyncio.gather(*(submit_lead(user_id) for user_id in range(1, LEADS + 1)))
+            print(f"\nЗаявок: {LEADS}, запись в Sheets: {SHEETS_LATENCY:.1f} с, "
+                  f"макс. время ответа: {max(latencies) * 1000:.1f} мс")
+            assert max(latencies) < SHEETS_LATENCY / 4
+
+            deadline = time.monotonic() + 10 * SHEETS_LATENCY
+            while len(delivered) < LEADS + 1 and time.monotonic() < deadline:
+                await asyncio.sleep(0.1)
+        finally:
+            await outbox.close()
+        assert sorted(row[6] for row in delivered) == sorted(f"user{user_id}.t.me" for user_id in range(LEADS + 1))
+        assert bot.session.methods().count("SendMessage") == LEADS + 1
+
+    asyncio.run(scenario())
+
+class CountingWorksheet:
+    """
+    Лист таблицы в памяти, считающий байты ответов, которые пришлось бы скачать из Google Sheets.
+    """
+    def __init__(self, spreadsheet: "CountingSpreadsheet", sheet_id: int, rows: List[List[str]]) -> None:
+        """
+        Args:
+            spreadsheet (CountingSpreadsheet): Таблица, в которой учитывается трафик.
+            sheet_id (int): ID листа.
+            rows (List[List[str]]): Строки листа, включая заголовок.
+        """
+        self.spreadsheet = spreadsheet
+        self.id = sheet_id
+        self.rows = rows
+
+    def row_values(self, row: int) -> List[str]:
+        """
+        Args:
+            row (int): Номер строки (с 1).
+
+        Returns:
+            List[str]: Значения строки.
+        """
+        return self.spreadsheet.download(self.rows[row - 1] if len(self.rows) >= row else [])
+
+    def get_all_values(self) -> List[List[str]]:
+        """
+        Returns:
+            List[List[str]]: Все строки листа.
+        """
+        return self.spreadsheet.download(self.rows)
+
+    def append_row(self, values: List[Any], **kwargs: Any) -> None:
+        """
+        Args:
+            values (List[Any]): Значения добавляемой строки.
+        """
+        self.spreadsheet.upload({"values": [values]})
+        self.rows.append(list(values))
+
+class CountingSpreadsheet:
+    """
+    Таблица Google Sheets в памяти, считающая объем запросов и ответов в байтах.
+    """
+    def __init__(self, rows: List[List[str]]) -> None:
+        """
+        Args:
+            rows (List[List[str]]): Строки единственного листа SearchRequests, включая заголовок.
+        """
+        self.bytes = 0
+        self.sheet = CountingWorksheet(self, 1, rows)
+
+    def download(self, response: Any) -> Any:
+        """
+        Учитывает ответ Google Sheets.
+
+        Args:
+            response (Any): Данные ответа.
+
+        Returns:
+            Any: Те же данные.
+        """
+        self.bytes += len(json.dumps(response, ensure_ascii=False).encode())
+        return response
+
+    def upload(self, body: Any) -> None:
+        """
+        Учитывает тело запроса к Google Sheets.
+
+        Args:
+            body (Any): Данные запроса.
+        """
+        self.bytes += len(json.dumps(body, ensure_ascii=False).encode())
+
+    def worksheet(self, title: str) -> CountingWorksheet:
+        """
+        Args:
+            title (str): Название листа.
+
+        Returns:
+            CountingWorksheet: Лист таблицы.
+        """
+        self.download({"sheetId": self.sheet.id, "title": title})
+        return self.sheet
+
+    def batch_update(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Выполняет запросы appendCells.
+
+        Args:
+            body (Dict[str, Any]): Тело запроса batchUpdate.
+
+        Returns:
+            Dict[str, Any]: Ответ Google Sheets.
+        """
+        self.upload(body)
+        for request in body["requests"]:
+            for row in request["appendCells"]["rows"]:
+                self.sheet.rows.append([value["userEnteredValue"]["stringValue"] for value in row["values"]])
+        return self.download({"replies": [{} for _ in body["requests"]]})
+
+def test_append_traffic_does_not_grow_with_sheet() -> None:
+    """
+    Объем данных, передаваемых при записи заявок, не зависит от количества строк, уже накопленных в листе:
+    лист не скачивается ради номера следующей строки.
+    """
+    traffic = {}
+    for sheet_rows in (10, 1_000, 100_000):
+        lead = ["Квартира", "2", "Центр", "10", "-", "+79000000000", "user.t.me", "2024-01-01 00:00:00"]
+        spreadsheet = CountingSpreadsheet([SHEET_HEADERS["SearchRequests"]] + [lead] * sheet_rows)
+        client = GoogleSheetsClient()
+        client.spreadsheet = spreadsheet  # Подключение к таблице уже выполнено
+        for _ in range(APPENDED_LEADS):
+            assert client.append_rows({"SearchRequests": [lead]})
+        assert len(spreadsheet.sheet.rows) == 1 + sheet_rows + APPENDED_LEADS
+        traffic[sheet_rows] = spreadsheet.bytes
+
+    print("\nБайт на заявку при размере листа: " + ", ".join(
+        f"{sheet_rows} строк - {total / APPENDED_LEADS:.0f}" for sheet_rows, total in traffic.items()
+    ))
+    assert len(set(traffic.values())) == 1
@@ -0,0 +1,123 @@
+# tests/test_logger.py
+import asyncio
+import itertools
+import logging
+import logging.handlers
+import os
+import sys
+import time
+from typing import Callable, Dict, List
+
+from utils import logger as logger_module
+from utils.logger import logger, setup_logging
+
+LOGGED_UPDATES = 2000
+"""Количество обновлений, каждое из которых пишет две записи лога, в каждом замере."""
+PROBE_INTERVAL = 0.001
+"""Интервал (в секундах), с которым проба измеряет задержку цикла событий."""
+DISK_STALL = 0.02
+"""Задержка (в секундах) записи в файл при имитации медленного диска."""
+STALL_EVERY = 20
+"""Каждая какая запись в файл задерживается при имитации медленного диска."""
+
+async def measure_loop_latency() -> List[float]:
+    """
+    Обрабатывает поток обновлений, которые пишут в лог, и одновременно измеряет задержку цикла событий:
+    насколько позже запланированного просыпается задача, ожидающая PROBE_INTERVAL.
+
+    Returns:
+        List[float]: Задержки пробуждения в секундах, по возрастанию.
+    """
+    done = False
+    delays: List[float] = []
+
+    async def probe() -> None:
+        while not done:
+            started = time.perf_counter()
+            await asyncio.sleep(PROBE_INTERVAL)
+            delays.append(time.perf_counter() - started - PROBE_INTERVAL)
+
+    async def handle(user_id: int) -> None:
+        logger.info("Пользователь %s нажал кнопку %s", user_id, "Подобрать недвижимость")
+        await asyncio.sleep(0)
+        logger.info("Пользователь %s выбрал тип недвижимости: %s", user_id, "Квартира")
+
+    probe_task = asyncio.create_task(probe())
+    for user_id in range(LOGGED_UPDATES):
+        await handle(user_id)
+        if user_id % 100 == 0:
+            await asyncio.sleep(PROBE_INTERVAL)  # Обновления приходят пачками
+    done = True
+    await probe_task
+    return sorted(delays)
+
+def percentile(values: List[float], share: float) -> float:
+    """
+    Args:
+        values (List[float]): Значения по возрастанию.
+        share (float): Доля (например, 0.99).
+
+    Returns:
+        float: Перцентиль значений.
+    """
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+def stalling(emit: Callable) -> Callable:
+    """
+    Оборачивает запись в файл так, чтобы каждая STALL_EVERY-я запись ждала DISK_STALL, как на медленном диске.
+
+    Args:
+        emit (Callable): Исходный метод emit обработчика.
+
+    Returns:
+        Callable: Метод emit с задержками.
+    """
+    calls = itertools.count()
+
+    def slow_emit(self: logging.Handler, record: logging.LogRecord) -> None:
+        if next(calls) % STALL_EVERY == 0:
+            time.sleep(DISK_STALL)
+        emit(self, record)
+
+    return slow_emit
+
+def test_loop_latency_with_logging(monkeypatch, tmp_path) -> None:
+    """
+    Бенчмарк задержки цикла событий при обработке обновлений с выключенным (WARNING) и включенным (INFO)
+    логированием. На медленном диске запись через очередь сравнивается с прежней синхронной
+    записью в файл прямо из цикла событий.
+    """
+    settings = dict(logger_module._settings)
+    file_name = os.path.join(tmp_path, "bot.log")
+    root = logging.getLogger()
+    results: Dict[str, List[float]] = {}
+    try:
+        for name, level in (("логирование выключено", "WARNING"), ("логирование включено", "INFO")):
+            setup_logging(level=level, file_name=file_name)
+            results[name] = asyncio.run(measure_loop_latency())
+
+        monkeypatch.setattr(logging.handlers.RotatingFileHandler, "emit",
+                            stalling(logging.handlers.RotatingFileHandler.emit))
+        setup_logging(level="INFO", file_name=file_name)
+        results["медленный диск, очередь"] = asyncio.run(measure_loop_latency())
+
+        # Прежняя схема: обработчик файла подключен к корневому логгеру и пишет из цикла событий
+        setup_logging(level="WARNING", file_name=file_name)
+        file_handler = logging.handlers.RotatingFileHandler(os.path.join(tmp_path, "sync.log"), encoding="utf-8")
+        root.addHandler(file_handler)
+        root.setLevel("INFO")
+        try:
+            results["медленный диск, синхронная запись"] = asyncio.run(measure_loop_latency())
+        finally:
+            root.removeHandler(file_handler)
+            file_handler.close()
+    finally:
+        setup_logging(**settings)
+
+    for name, delays in results.items():
+        print(f"\n{name}: задержка цикла событий p50 {percentile(delays, 0.5) * 1000:.2f} мс, "
+              f"p99 {percentile(delays, 0.99) * 1000:.2f} мс, макс. {delays[-1] * 1000:.2f} мс", end="")
+    # Поток записи логов конкурирует с циклом событий за GIL не дольше интервала переключения потоков
+    switch = sys.getswitchinterval()
+    assert percentile(results["логирование включено"], 0.99) < percentile(results["логирование выключено"], 0.99) + 2 * switch
+    assert results["медленный диск, очередь"][-1] < DISK_STALL <= results["медленный диск, синхронная запись"][-1]
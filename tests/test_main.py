@@ -0,0 +1,117 @@
+# tests/test_main.py
+import asyncio
+import json
+import os
+import time
+from typing import Any, List
+
+from aiogram import Bot
+from aiogram.methods import GetUpdates, SendPhoto
+from aiogram.types import Message, Update, User
+
+import main
+from handlers import start
+from utils.google_sheets import gs_client
+from conftest import ROOT_DIR, RecordingSession
+
+SHEETS_CONNECT_TIME = 3.0
+"""Время (в секундах), за которое медленный Google Sheets выполняет подключение и подготовку листов."""
+MIDDLEWARE_CALLS = 100_000
+"""Количество обновлений, пропускаемых через PauseMiddleware при измерении ее накладных расходов."""
+
+def test_first_update_does_not_wait_for_sheets(monkeypatch) -> None:
+    """
+    Бенчмарк времени до обработки первого обновления после запуска main(): пока Google Sheets
+    подключается, бот уже получает обновления через polling и отвечает на /start.
+    """
+    updates: List[List[Update]] = [[Update.model_validate({
+        "update_id": 1,
+        "message": {
+            "message_id": 1,
+            "date": 0,
+            "chat": {"id": 1, "type": "private"},
+            "from": {"id": 1, "is_bot": False, "first_name": "Test"},
+            "text": "/start",
+        },
+    })]]
+
+    def get_updates(method: GetUpdates) -> List[Update]:
+        return updates.pop() if updates else []
+
+    def send_photo(method: SendPhoto) -> Message:
+        return Message.model_validate({
+            "message_id": 2,
+            "date": 0,
+            "chat": {"id": method.chat_id, "type": "private"},
+            "photo": [{"file_id": "photo", "file_unique_id": "photo", "width": 1, "height": 1}],
+        })
+
+    # Задержка ответа не дает циклу polling занять цикл событий пустыми ответами getUpdates
+    session = RecordingSession(latency=0.01, responses={
+        "GetMe": lambda method: User(id=123, is_bot=True, first_name="Bot", username="test_bot"),
+        "GetUpdates": get_updates,
+        "SendPhoto": send_photo,
+    })
+    bot = Bot("123:test", session=session)
+
+    def slow_warm_up(*args: Any) -> bool:
+        time.sleep(SHEETS_CONNECT_TIME)
+        return True
+
+    monkeypatch.setattr(main.bot_registry, "get", lambda token: bot)
+    monkeypatch.setattr(gs_client, "warm_up", slow_warm_up)
+    monkeypatch.setattr(start, "WELCOME_PHOTO", os.path.join(ROOT_DIR, start.WELCOME_PHOTO))
+
+    async def scenario() -> float:
+        started = time.perf_counter()
+        bot_task = asyncio.create_task(main.main())
+        try:
+            while "SendPhoto" not in session.methods():
+                assert not bot_task.done(), "main() завершился до обработки первого обновления"
+                await asyncio.sleep(0.005)
+            return time.perf_counter() - started
+        finally:
+            bot_task.cancel()
+            await asyncio.gather(bot_task, return_exceptions=True)
+
+    first_update = asyncio.run(scenario())
+    print(f"\nПодключение к Sheets: {SHEETS_CONNECT_TIME:.1f} с, время до ответа на первое обновление: "
+          f"{first_update * 1000:.0f} мс")
+    assert first_update < SHEETS_CONNECT_TIME / 3
+
+def test_pause_middleware_overhead() -> None:
+    """
+    Микробенчмарк накладных расходов PauseMiddleware на одно обновление в сравнении с прежней проверкой,
+    читавшей bot_status.json на каждое обновление.
+    """
+    with open("bot_status.json", "w") as f:
+        json.dump({"is_active": True}, f)
+    event = Update.model_validate({"update_id": 1})
+    middleware = main.PauseMiddleware()
+
+    async def handler(event: Update, data: dict) -> None:
+        pass
+
+    async def direct(handler: Any, event: Update, data: dict) -> None:
+        await handler(event, data)
+
+    async def file_check(handler: Any, event: Update, data: dict) -> None:
+        with open("bot_status.json", "r") as f:
+            if json.load(f).get("is_active", True):
+                return await handler(event, data)
+
+    async def measure(call: Any) -> float:
+        started = time.perf_counter()
+        for _ in range(MIDDLEWARE_CALLS):
+            await call(handler, event, {})
+        return (time.perf_counter() - started) / MIDDLEWARE_CALLS
+
+    async def scenario() -> None:
+        baseline = await measure(direct)
+        overhead = await measure(middleware) - baseline
+        file_overhead = await measure(file_check) - baseline
+        print(f"\nPauseMiddleware: {overhead * 1e6:.2f} мкс на обновление, "
+              f"чтение bot_status.json: {file_overhead * 1e6:.2f} мкс на обновление")
+        assert overhead < file_overhead / 5
+
+    asyncio.run(scenario())
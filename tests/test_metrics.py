@@ -0,0 +1,82 @@
+# tests/test_metrics.py
+import asyncio
+import gc
+import time
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Message, Update
+
+from utils import metrics
+from utils.metrics import Counter, Histogram
+
+RECORDED_VALUES = 200_000
+"""Количество записей в метрику в замере стоимости одной записи."""
+DISPATCHED_UPDATES = 500
+"""Количество обновлений в замере накладных расходов middleware метрик."""
+MEASUREMENT_ROUNDS = 20
+"""Количество повторов замера накладных расходов middleware метрик."""
+
+def test_metrics_overhead(bot: Bot) -> None:
+    """
+    Бенчмарк стоимости записи в счетчик и гистограмму и накладных расходов middleware метрик
+    на одно обновление, проходящее через диспетчер.
+    """
+    counter = Counter("bench_total", "Тестовый счетчик.", ("type",))
+    histogram = Histogram("bench_seconds", "Тестовая гистограмма.", ("type",))
+
+    started = time.perf_counter()
+    for _ in range(RECORDED_VALUES):
+        counter.inc("message")
+    inc = (time.perf_counter() - started) / RECORDED_VALUES
+    started = time.perf_counter()
+    for _ in range(RECORDED_VALUES):
+        histogram.observe(0.01, "message")
+    observe = (time.perf_counter() - started) / RECORDED_VALUES
+    assert counter.values[("message",)] == RECORDED_VALUES
+
+    update = Update.model_validate({
+        "update_id": 7,
+        "message": {
+            "message_id": 1,
+            "date": 0,
+            "chat": {"id": 1, "type": "private"},
+            "from": {"id": 1, "is_bot": False, "first_name": "Test"},
+            "text": "Подобрать недвижимость",
+        },
+    })
+
+    async def dispatch(with_metrics: bool) -> float:
+        dp = Dispatcher()
+
+        @dp.message()
+        async def handle(message: Message) -> None:
+            pass
+
+        if with_metrics:
+            metrics.install(dp)
+        started = time.perf_counter()
+        for _ in range(DISPATCHED_UPDATES):
+            await dp.feed_update(bot, update)
+        return (time.perf_counter() - started) / DISPATCHED_UPDATES
+
+    async def scenario() -> None:
+        # Замеры чередуются и берется лучший результат, чтобы сгладить шум планировщика
+        timings = {False: [], True: []}
+        for _ in range(MEASUREMENT_ROUNDS):
+            for with_metrics in (False, True):
+                timings[with_metrics].append(await dispatch(with_metrics))
+        plain, instrumented = min(timings[False]), min(timings[True])
+        overhead = instrumented - plain
+        print(f"\nCounter.inc: {inc * 1e6:.2f} мкс, Histogram.observe: {observe * 1e6:.2f} мкс, "
+              f"обновление без метрик: {plain * 1e6:.0f} мкс, middleware метрик: {overhead * 1e6:.1f} мкс "
+              f"на обновление ({overhead / plain:.0%})")
+        assert overhead < plain / 4
+
+    # Как и timeit, замеряем без сборщика мусора: его запуски зависят от объектов, оставленных другими тестами
+    gc.collect()
+    gc.disable()
+    try:
+        asyncio.run(scenario())
+    finally:
+        gc.enable()
+    assert max(inc, observe) < 2e-6
@@ -0,0 +1,87 @@
+# tests/test_start.py
+import asyncio
+import os
+import time
+from typing import Any, List
+
+from aiogram import Bot
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.methods import SendPhoto
+from aiogram.types import Message
+
+from handlers import start
+from utils import media_cache
+from utils.database import Database
+from conftest import ROOT_DIR, RecordingSession
+
+START_USERS = 500
+"""Количество пользователей, нажимающих /start в каждом сценарии микробенчмарка."""
+
+def test_start_for_new_and_returning_users(monkeypatch, tmp_path) -> None:
+    """
+    Микробенчмарк обработки /start для новых пользователей, для вернувшихся после перезапуска бота
+    (кэш пуст, запрос к базе данных ничего не меняет) и для повторных нажатий (кэш, без обращения к базе данных).
+    """
+    def send_photo(method: SendPhoto) -> Message:
+        return Message.model_validate({
+            "message_id": 1,
+            "date": 0,
+            "chat": {"id": method.chat_id, "type": "private"},
+            "photo": [{"file_id": "photo", "file_unique_id": "photo", "width": 1, "height": 1}],
+        })
+
+    bot = Bot("123:test", session=RecordingSession(responses={"SendPhoto": send_photo}))
+    db_name = os.path.join(tmp_path, "users.db")
+    storage = MemoryStorage()
+    monkeypatch.setattr(start, "WELCOME_PHOTO", os.path.join(ROOT_DIR, start.WELCOME_PHOTO))
+
+    async def press_start(user_id: int) -> None:
+        message = Message.model_validate({
+            "message_id": user_id,
+            "date": 0,
+            "chat": {"id": user_id, "type": "private"},
+            "from": {"id": user_id, "is_bot": False, "first_name": "Test"},
+            "text": "/start",
+        }, context={"bot": bot})
+        state = FSMContext(storage, StorageKey(bot_id=bot.id, chat_id=user_id, user_id=user_id))
+        await start.cmd_start(message, state)
+
+    async def measure(db: Database) -> List[float]:
+        queries: List[Any] = []
+        execute = db.db.execute
+
+        async def counting_execute(*args: Any) -> Any:
+            queries.append(args[0])
+            return await execute(*args)
+
+        db.db.execute = counting_execute
+        try:
+            started = time.perf_counter()
+            for user_id in range(1, START_USERS + 1):
+                await press_start(user_id)
+        finally:
+            db.db.execute = execute
+        return [(time.perf_counter() - started) / START_USERS, len(queries) / START_USERS]
+
+    async def run(db: Database) -> List[List[float]]:
+        monkeypatch.setattr(start, "db", db)
+        monkeypatch.setattr(media_cache, "db", db)
+        await db.connect()
+        try:
+            await press_start(0)  # Картинка загружается один раз и дальше отправляется по file_id
+            return [await measure(db), await measure(db)]
+        finally:
+            await db.close()
+
+    async def scenario() -> None:
+        new, repeated = await run(Database(db_name))
+        returning, _ = await run(Database(db_name))
+        for name, (seconds, queries) in (("новый пользователь", new), ("вернувшийся после перезапуска", returning),
+                                         ("повторный /start", repeated)):
+            print(f"\n/start, {name}: {seconds * 1e6:.0f} мкс, запросов на запись: {queries:.0f}", end="")
+        assert (new[1], returning[1], repeated[1]) == (1, 1, 0)
+        assert repeated[0] < new[0]
+
+    asyncio.run(scenario())
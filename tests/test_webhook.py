@@ -0,0 +1,92 @@
+# tests/test_webhook.py
+import asyncio
+import socket
+from typing import Any, Dict
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Message
+from aiohttp import ClientSession, ClientTimeout
+
+from config import WEBHOOK_SECRET
+from utils.webhook import run_webhook
+
+PATH = "/webhook/test"
+"""Путь, по которому тестовый сервер принимает обновления."""
+
+def free_port() -> int:
+    """
+    Returns:
+        int: Свободный локальный порт, выбранный операционной системой.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def make_update(update_id: int, text: str) -> Dict[str, Any]:
+    """
+    Создает синтетическое обновление с текстовым сообщением в формате Bot API.
+
+    Args:
+        update_id (int): ID обновления.
+        text (str): Текст сообщения.
+
+    Returns:
+        Dict[str, Any]: Обновление в формате JSON.
+    """
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": 0,
+            "chat": {"id": 1, "type": "private"},
+            "from": {"id": 1, "is_bot": False, "first_name": "Test"},
+            "text": text,
+        },
+    }
+
+def test_webhook_dispatches_updates_with_secret(bot: Bot) -> None:
+    """
+    Локальный заменитель Telegram отправляет синтетические обновления на webhook: запрос с правильным
+    секретным токеном передается диспетчеру, с неверным или без токена - отклоняется, а ответ 200
+    возвращается до завершения обработки обновления.
+    """
+    port = free_port()
+    received = []
+    started, release = asyncio.Event(), asyncio.Event()
+    dp = Dispatcher()
+
+    @dp.message()
+    async def handle(message: Message) -> None:
+        received.append(message.text)
+        started.set()
+        await release.wait()  # Обработка продолжается после ответа Telegram
+
+    async def scenario() -> None:
+        server = asyncio.create_task(run_webhook(dp, bot, PATH, port, ["message"]))
+        try:
+            while "SetWebhook" not in bot.session.methods():
+                await asyncio.sleep(0.01)
+            set_webhook = bot.session.requests[0]
+            assert (set_webhook.url, set_webhook.secret_token, set_webhook.allowed_updates) == (PATH, WEBHOOK_SECRET, ["message"])
+
+            url = f"http://127.0.0.1:{port}{PATH}"
+            # Без ответа до окончания обработки запрос с правильным токеном завершится по таймауту
+            async with ClientSession(timeout=ClientTimeout(total=5)) as session:
+                for headers in ({"X-Telegram-Bot-Api-Secret-Token": "wrong"}, {}):
+                    async with session.post(url, json=make_update(1, "forged"), headers=headers) as response:
+                        assert response.status == 401
+
+                headers = {"X-Telegram-Bot-Api-Secret-Token": WEBHOOK_SECRET}
+                async with session.post(url, json=make_update(2, "hello"), headers=headers) as response:
+                    assert response.status == 200
+            # Ответ получен, пока обработчик ждет release
+            await asyncio.wait_for(started.wait(), timeout=5)
+            release.set()
+            await asyncio.sleep(0)
+            assert received == ["hello"]
+        finally:
+            server.cancel()
+            await asyncio.gather(server, return_exceptions=True)
+        assert bot.session.methods()[-1] == "DeleteWebhook"
+
+    asyncio.run(scenario())
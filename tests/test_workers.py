@@ -0,0 +1,180 @@
+# tests/test_workers.py
+import asyncio
+import os
+import time
+from typing import Any, Dict, List
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Message
+
+from utils.workers import UpdateConsumer, WorkerPool
+from conftest import RecordingSession
+
+RESULTS_FILE = "worker_results.txt"
+"""Файл (во временной директории тестов), в который тестовый рабочий процесс записывает обработанные обновления."""
+CRASH_MARKER = "worker_crashed"
+"""Файл-отметка о том, что тестовый рабочий процесс уже завершался аварийно."""
+HANDLER_CPU_TIME = 0.005
+"""Процессорное время (в секундах), которое обработчик бенчмарка тратит на одно обновление."""
+BENCHMARK_UPDATES = 200
+"""Количество обновлений в замере пропускной способности пула."""
+
+def run_crashing_worker(index: int, queue: Any) -> None:
+    """
+    Тестовый рабочий процесс: записывает номера обновлений в RESULTS_FILE,
+    а на обновлении с признаком crash один раз завершается аварийно.
+
+    Args:
+        index (int): Номер рабочего процесса.
+        queue (Any): Очередь обновлений процесса.
+    """
+    while (item := queue.get()) is not None:
+        user_id, update = item
+        if update.get("crash") and not os.path.exists(CRASH_MARKER):
+            open(CRASH_MARKER, "w").close()
+            os._exit(3)
+        with open(RESULTS_FILE, "a") as f:
+            f.write(f"{user_id}:{update['n']}\n")
+
+def read_results() -> List[str]:
+    """
+    Returns:
+        List[str]: Обработанные обновления в порядке обработки.
+    """
+    if not os.path.exists(RESULTS_FILE):
+        return []
+    with open(RESULTS_FILE) as f:
+        return f.read().split()
+
+def test_dead_worker_restarts_with_pending_updates() -> None:
+    """
+    Рабочий процесс, завершившийся аварийно, перезапускается с новой очередью: обновления,
+    оставшиеся в очереди умершего процесса и пришедшие во время перезапуска, обрабатываются
+    новым процессом в исходном порядке.
+    """
+    for path in (RESULTS_FILE, CRASH_MARKER):
+        if os.path.exists(path):
+            os.remove(path)
+
+    async def scenario() -> None:
+        pool = WorkerPool(1, run_crashing_worker)
+        pool.start()
+        old_queue = pool.queues[0]
+        submitted = 0
+        try:
+            pool.submit(1, {"n": 0})
+            pool.submit(1, {"n": 1, "crash": True})  # Теряется вместе с процессом, который его прочитал
+            # Обновления идут и до, и во время, и после перезапуска процесса
+            for submitted in range(2, 80):
+                pool.submit(1, {"n": submitted})
+                await asyncio.sleep(0.05)
+        finally:
+            await pool.stop()
+        assert pool.queues[0] is not old_queue
+        assert read_results() == [f"1:{n}" for n in [0, *range(2, submitted + 1)]]
+
+    asyncio.run(scenario())
+
+async def consume_cpu_bound(index: int, queue: Any) -> None:
+    """
+    Обрабатывает очередь через UpdateConsumer и диспетчер aiogram, как рабочий процесс бота,
+    но обработчик сообщений нагружает процессор на HANDLER_CPU_TIME. При первом обновлении процесс
+    создает файл готовности, после остановки записывает количество обработанных обновлений.
+
+    Args:
+        index (int): Номер рабочего процесса.
+        queue (Any): Очередь обновлений процесса.
+    """
+    handled = 0
+    dp = Dispatcher()
+
+    @dp.message()
+    async def handle(message: Message) -> None:
+        nonlocal handled
+        if not handled:
+            open(f"worker_ready_{index}", "w").close()
+        deadline = time.process_time() + HANDLER_CPU_TIME
+        while time.process_time() < deadline:
+            pass
+        handled += 1
+
+    await UpdateConsumer(dp, Bot("123:test", session=RecordingSession()), queue).run()
+    with open(f"worker_handled_{index}", "w") as f:
+        f.write(str(handled))
+
+def run_cpu_bound_worker(index: int, queue: Any) -> None:
+    """
+    Точка входа рабочего процесса бенчмарка.
+
+    Args:
+        index (int): Номер рабочего процесса.
+        queue (Any): Очередь обновлений процесса.
+    """
+    asyncio.run(consume_cpu_bound(index, queue))
+
+def make_message_update(update_id: int, user_id: int) -> Dict[str, Any]:
+    """
+    Args:
+        update_id (int): ID обновления.
+        user_id (int): ID пользователя.
+
+    Returns:
+        Dict[str, Any]: Обновление с текстовым сообщением в формате Bot API.
+    """
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": 0,
+            "chat": {"id": user_id, "type": "private"},
+            "from": {"id": user_id, "is_bot": False, "first_name": "Test"},
+            "text": "Подобрать недвижимость",
+        },
+    }
+
+async def measure_throughput(workers: int) -> float:
+    """
+    Измеряет пропускную способность пула рабочих процессов без учета времени их запуска.
+
+    Args:
+        workers (int): Количество рабочих процессов.
+
+    Returns:
+        float: Обработанных обновлений в секунду.
+    """
+    for index in range(workers):
+        for path in (f"worker_ready_{index}", f"worker_handled_{index}"):
+            if os.path.exists(path):
+                os.remove(path)
+    pool = WorkerPool(workers, run_cpu_bound_worker)
+    pool.start()
+    try:
+        # Первое обновление каждому процессу: замер начинается, когда все процессы готовы
+        for user_id in range(workers):
+            pool.submit(user_id, make_message_update(user_id, user_id))
+        while not all(os.path.exists(f"worker_ready_{index}") for index in range(workers)):
+            await asyncio.sleep(0.01)
+        started = time.perf_counter()
+        for update_id in range(BENCHMARK_UPDATES):
+            user_id = workers + update_id
+            pool.submit(user_id, make_message_update(user_id, user_id))
+    finally:
+        await pool.stop()  # Процессы дообрабатывают очереди перед завершением
+    elapsed = time.perf_counter() - started
+    handled = 0
+    for index in range(workers):
+        with open(f"worker_handled_{index}") as f:
+            handled += int(f.read())
+    assert handled == workers + BENCHMARK_UPDATES
+    return BENCHMARK_UPDATES / elapsed
+
+def test_throughput_scales_with_workers() -> None:
+    """
+    Бенчмарк пропускной способности пула с одним и двумя рабочими процессами на обработчике,
+    ограниченном процессором. Масштабирование проверяется, если процессу доступно хотя бы два ядра.
+    """
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    one, two = asyncio.run(measure_throughput(1)), asyncio.run(measure_throughput(2))
+    print(f"\nЯдер: {cores}, обновлений в секунду: 1 процесс - {one:.0f}, 2 процесса - {two:.0f}")
+    if cores >= 2:
+        assert two > 1.5 * one
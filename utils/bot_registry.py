@@ -0,0 +1,59 @@
+# utils/bot_registry.py
+import asyncio
+from typing import Dict
+
+from aiogram import Bot
+from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
+
+import logging
+from utils.logger import logger
+from config import BOT_API_CONNECTION_LIMIT
+from utils.metrics import RequestMetricsMiddleware
+
+class BotRegistry:
+    """
+    Реестр экземпляров Bot: один бот и один пул keep-alive соединений на каждый токен.
+    Используется основным ботом, админ-ботом и уведомлениями администраторов,
+    чтобы не создавать новые aiohttp-сессии (и TLS-соединения) на каждую операцию.
+    """
+    def __init__(self, limit: int = BOT_API_CONNECTION_LIMIT) -> None:
+        """
+        Инициализация реестра.
+
+        Args:
+            limit (int): Максимальное количество одновременных соединений с Bot API на один токен.
+        """
+        self.limit = limit
+        self._bots: Dict[str, Bot] = {}
+
+    def get(self, token: str) -> Bot:
+        """
+        Возвращает бота для токена, создавая его при первом обращении.
+        Боты используют HTML-форматирование по умолчанию; запросы к Bot API учитываются в метриках.
+
+        Args:
+            token (str): Токен бота.
+
+        Returns:
+            Bot: Экземпляр бота с общей сессией.
+        """
+        bot = self._bots.get(token)
+        if bot is None:
+            session = AiohttpSession(limit=self.limit)
+            session.middleware(RequestMetricsMiddleware())  # Длительность и ошибки запросов к Bot API
+            bot = Bot(token=token, session=session, default=DefaultBotProperties(parse_mode="HTML"))
+            self._bots[token] = bot
+        return bot
+
+    async def close(self) -> None:
+        """
+        Закрывает сессии всех созданных ботов.
+        """
+        bots, self._bots = list(self._bots.values()), {}
+        await asyncio.gather(*(bot.session.close() for bot in bots), return_exceptions=True)
+        if bots:
+            logger.info("Закрыто сессий Bot API: %s", len(bots))
+
+# Глобальный реестр ботов
+bot_registry = BotRegistry()
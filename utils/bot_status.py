@@ -0,0 +1,107 @@
+# utils/bot_status.py
+import asyncio
+import json
+import os
+from typing import Optional
+
+import logging
+from utils.logger import logger
+
+STATUS_FILE = "bot_status.json"
+"""Файл, в котором сохраняется статус бота между перезапусками."""
+POLL_INTERVAL = 1.0
+"""Интервал (в секундах) проверки времени изменения файла статуса."""
+
+class BotStatusWatcher:
+    """
+    Хранит признак активности бота в памяти. Изменения приходят от админ-бота через канал
+    управления (utils/control_channel.py); если он недоступен, статус обновляется по изменению файла.
+    Проверка паузы на каждое обновление сводится к чтению атрибута, без обращения к диску.
+    """
+    def __init__(self, path: str = STATUS_FILE) -> None:
+        """
+        Инициализация наблюдателя за статусом.
+
+        Args:
+            path (str): Путь к файлу статуса бота.
+        """
+        self.path = path
+        self.is_active: bool = True
+        self._mtime: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def load(self) -> None:
+        """
+        Читает статус из файла. Если файла нет, бот считается включенным;
+        при ошибке чтения сохраняется предыдущее значение.
+        """
+        if not os.path.exists(self.path):
+            return
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+            with open(self.path, "r") as f:
+                status = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error("Ошибка чтения статуса бота из %s: %s", self.path, e)
+            return
+        self._mtime = mtime
+        is_active = bool(status.get("is_active", True))
+        if is_active != self.is_active:
+            logger.info("Статус бота изменен: %s", 'включен' if is_active else 'выключен')
+        self.is_active = is_active
+
+    def set(self, is_active: bool) -> None:
+        """
+        Применяет новый статус и сохраняет его в файл, чтобы он пережил перезапуск.
+
+        Args:
+            is_active (bool): True - бот включен, False - бот на паузе.
+        """
+        self.is_active = is_active
+        try:
+            with open(self.path, "w") as f:
+                json.dump({"is_active": is_active}, f)
+            self._mtime = os.stat(self.path).st_mtime_ns
+        except OSError as e:
+            logger.error("Ошибка сохранения статуса бота в %s: %s", self.path, e)
+            return
+        logger.info("Статус бота обновлен: %s", 'включен' if is_active else 'выключен')
+
+    def start(self, poll: bool = True) -> None:
+        """
+        Загружает текущий статус и, если нужно, запускает фоновую проверку изменений файла.
+
+        Args:
+            poll (bool): Следить за изменением файла. Не требуется, когда работает канал управления.
+        """
+        self.load()
+        if poll and self._task is None:
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        """
+        Останавливает фоновую проверку изменений файла.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _watch(self) -> None:
+        """
+        Периодически сравнивает время изменения файла статуса и перечитывает его при изменении.
+        """
+        while True:
+            await asyncio.sleep(POLL_INTERVAL)
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError:
+                continue
+            if mtime != self._mtime:
+                self.load()
+
+# Глобальный экземпляр наблюдателя за статусом бота
+status_watcher = BotStatusWatcher()
@@ -0,0 +1,739 @@
+# utils/broadcast.py
+import asyncio
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from aiogram import Bot
+from aiogram.exceptions import (
+    TelegramBadRequest, TelegramEntityTooLarge, TelegramForbiddenError, TelegramMigrateToChat,
+    TelegramNetworkError, TelegramRetryAfter, TelegramServerError
+)
+from aiogram.types import (
+    BufferedInputFile, InlineKeyboardMarkup, InputFile, InputMediaDocument,
+    InputMediaPhoto, InputMediaVideo, Message
+)
+
+import logging
+from utils.logger import logger
+from utils.database import db
+from utils.bot_registry import bot_registry
+from utils.metrics import BROADCAST_MESSAGES
+from config import ADMIN_BOT_TOKEN, BROADCAST_RATE, BROADCAST_CONCURRENCY
+
+PROGRESS_INTERVAL = 5.0
+"""Интервал (в секундах) между отчетами о ходе рассылки."""
+MAX_RETRY_AFTER_ATTEMPTS = 3
+"""Сколько раз повторять отправку одному пользователю после ответа RetryAfter."""
+CHECKPOINT_INTERVAL = 2.0
+"""Интервал (в секундах) сохранения результатов доставки в базу данных."""
+INPUT_MEDIA = {"photo": InputMediaPhoto, "video": InputMediaVideo, "document": InputMediaDocument}
+"""Классы элементов альбома по типу медиафайла."""
+MAX_UPLOAD_ATTEMPTS = 3
+"""Сколько раз пытаться загрузить медиа рассылки в основной бот при сетевых ошибках и сбоях Telegram."""
+
+def is_unreachable(error: Exception) -> bool:
+    """
+    Проверяет, означает ли ошибка отправки, что пользователь недоступен:
+    заблокировал бота, удалил аккаунт или чат не найден.
+
+    Args:
+        error (Exception): Ошибка отправки сообщения.
+
+    Returns:
+        bool: True, если пользователю не стоит отправлять сообщения до следующей команды /start.
+    """
+    if isinstance(error, TelegramForbiddenError):
+        return True
+    return isinstance(error, TelegramBadRequest) and "chat not found" in str(error).lower()
+
+class BroadcastMediaError(Exception):
+    """
+    Медиа рассылки не удалось скачать из админ-бота или загрузить в основной бот
+    (например, файл больше 20 МБ или Telegram его не принял). Ошибка не зависит от получателя,
+    поэтому рассылка прерывается.
+    """
+
+class TokenBucket:
+    """
+    Глобальный ограничитель скорости отправки (token bucket).
+    Общий для всех рассылок, чтобы суммарная скорость не превышала лимит Telegram.
+    """
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        """
+        Инициализация ограничителя.
+
+        Args:
+            rate (float): Количество сообщений в секунду.
+            capacity (Optional[float]): Максимальный запас токенов. По умолчанию равен rate.
+        """
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """
+        Ожидает, пока не появится токен на отправку одного сообщения.
+        """
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Приостанавливает выдачу токенов (например, после ответа RetryAfter от Telegram).
+
+        Args:
+            seconds (float): Длительность паузы в секундах.
+        """
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0
+
+class BroadcastMessage:
+    """
+    Сообщение рассылки: текст или медиа (фото, видео, документ, альбом) с подписью
+    в HTML-форматировании и необязательная инлайн-клавиатура.
+    Медиа скачивается из админ-бота один раз до начала рассылки и загружается в Telegram
+    от имени основного бота вместе с отправкой первому получателю; остальным получателям
+    отправляется по file_id. Ошибка загрузки, не связанная с получателем, запоминается,
+    и следующие отправки сразу завершаются с BroadcastMediaError без повторной загрузки.
+    """
+    def __init__(self, text: Optional[str], reply_markup: Optional[InlineKeyboardMarkup] = None,
+                 media: Optional[List[Dict[str, Optional[str]]]] = None, media_group: bool = False) -> None:
+        """
+        Args:
+            text (Optional[str]): Текст сообщения или подпись к медиа (с HTML-форматированием).
+            reply_markup (Optional[InlineKeyboardMarkup]): Клавиатура с кнопками (не поддерживается для альбомов).
+            media (Optional[List[Dict[str, Optional[str]]]]): Медиафайлы: type (photo, video, document),
+                source_file_id (file_id в админ-боте), file_name и file_id (в основном боте, после загрузки).
+            media_group (bool): Отправлять медиафайлы альбомом.
+        """
+        self.text = text
+        self.reply_markup = reply_markup
+        self.media = media or []
+        self.media_group = media_group
+        self._upload_lock = asyncio.Lock()
+        self._contents: Dict[str, bytes] = {}
+        self._upload_attempts = 0
+        self._upload_error: Optional[str] = None
+
+    @property
+    def uploaded(self) -> bool:
+        """Признак того, что все медиафайлы уже загружены в основной бот (или медиа нет)."""
+        return all(item.get("file_id") for item in self.media)
+
+    async def prepare(self) -> None:
+        """
+        Скачивает медиафайлы из админ-бота до начала рассылки (file_id разных ботов несовместимы).
+        Ничего не делает, если медиа уже загружено в основной бот. Если файл не удалось скачать
+        (например, он больше 20 МБ), вызывает BroadcastMediaError.
+        """
+        if self._upload_error is not None:
+            raise BroadcastMediaError(self._upload_error)
+        if self.uploaded:
+            return
+        for item in self.media:
+            source_file_id = item["source_file_id"]
+            if source_file_id in self._contents:
+                continue
+            try:
+                buffer = await bot_registry.get(ADMIN_BOT_TOKEN).download(source_file_id)
+            except Exception as e:
+                self._fail_upload(f"не удалось скачать файл {item.get('file_name') or item['type']}: {e}")
+                raise BroadcastMediaError(self._upload_error) from e
+            self._contents[source_file_id] = buffer.read()
+
+    async def send(self, bot: Bot, user_id: int) -> None:
+        """
+        Отправляет сообщение одному пользователю. Если медиа еще не загружено в основной бот,
+        загружает его при этой отправке и запоминает file_id для остальных получателей.
+        Если медиа не удалось загрузить независимо от получателя, вызывает BroadcastMediaError.
+
+        Args:
+            bot (Bot): Бот, от имени которого выполняется рассылка.
+            user_id (int): ID получателя.
+        """
+        if not self.media:
+            await bot.send_message(user_id, self.text, parse_mode="HTML", reply_markup=self.reply_markup)
+            return
+        if not self.uploaded:
+            async with self._upload_lock:
+                if not self.uploaded:
+                    await self._upload(bot, user_id)
+                    return
+        await self._send_media(bot, user_id, [item["file_id"] for item in self.media])
+
+    async def _upload(self, bot: Bot, user_id: int) -> None:
+        """
+        Загружает медиа в основной бот отправкой одному пользователю и запоминает file_id.
+        Если ошибка связана с получателем (заблокировал бота, RetryAfter), загрузка повторится
+        при отправке следующему; сетевые ошибки и сбои Telegram повторяются до MAX_UPLOAD_ATTEMPTS раз,
+        остальные ошибки (файл отклонен, слишком большой) сразу прерывают рассылку.
+
+        Args:
+            bot (Bot): Бот, от имени которого выполняется рассылка.
+            user_id (int): ID получателя.
+        """
+        await self.prepare()
+        files = [BufferedInputFile(self._contents[item["source_file_id"]], filename=item.get("file_name") or item["type"])
+                 for item in self.media]
+        try:
+            messages = await self._send_media(bot, user_id, files)
+        except Exception as e:
+            if is_unreachable(e) or isinstance(e, (TelegramRetryAfter, TelegramMigrateToChat)):
+                raise
+            self._upload_attempts += 1
+            transient = isinstance(e, (TelegramNetworkError, TelegramServerError)) and not isinstance(e, TelegramEntityTooLarge)
+            if transient and self._upload_attempts < MAX_UPLOAD_ATTEMPTS:
+                raise
+            self._fail_upload(f"Telegram не принял медиа: {e}")
+            raise BroadcastMediaError(self._upload_error) from e
+        for item, message in zip(self.media, messages):
+            item["file_id"] = self._extract_file_id(message)
+        self._contents.clear()
+        logger.info("Медиа рассылки загружено в основной бот (%s файл(ов))", len(self.media))
+
+    def _fail_upload(self, error: str) -> None:
+        """
+        Запоминает ошибку загрузки медиа, чтобы следующие отправки не повторяли ее.
+
+        Args:
+            error (str): Описание ошибки.
+        """
+        self._upload_error = error
+        self._contents.clear()
+
+    async def _send_media(self, bot: Bot, user_id: int, files: List[Union[str, InputFile]]) -> List[Message]:
+        """
+        Отправляет медиа одному пользователю: одиночным сообщением или альбомом.
+
+        Args:
+            bot (Bot): Бот, от имени которого выполняется рассылка.
+            user_id (int): ID получателя.
+            files (List[Union[str, InputFile]]): file_id или загружаемые файлы в порядке self.media.
+
+        Returns:
+            List[Message]: Отправленные сообщения.
+        """
+        if self.media_group:
+            media = [
+                INPUT_MEDIA[item["type"]](media=file, caption=self.text if index == 0 else None, parse_mode="HTML")
+                for index, (item, file) in enumerate(zip(self.media, files))
+            ]
+            return await bot.send_media_group(user_id, media)
+        send = {"photo": bot.send_photo, "video": bot.send_video, "document": bot.send_document}[self.media[0]["type"]]
+        return [await send(user_id, files[0], caption=self.text, parse_mode="HTML", reply_markup=self.reply_markup)]
+
+    @staticmethod
+    def _extract_file_id(message: Message) -> str:
+        """
+        Получает file_id медиафайла из отправленного сообщения.
+
+        Args:
+            message (Message): Отправленное сообщение.
+
+        Returns:
+            str: file_id в основном боте.
+        """
+        if message.photo:
+            return message.photo[-1].file_id
+        if message.video:
+            return message.video.file_id
+        return message.document.file_id
+
+    def to_json(self) -> str:
+        """
+        Сериализует сообщение для хранения в задаче рассылки.
+
+        Returns:
+            str: Сообщение в формате JSON.
+        """
+        data: Dict[str, Any] = {"text": self.text}
+        if self.reply_markup is not None:
+            data["reply_markup"] = self.reply_markup.model_dump(exclude_none=True)
+        if self.media:
+            data["media"] = self.media
+            data["media_group"] = self.media_group
+        return json.dumps(data, ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, payload: str) -> "BroadcastMessage":
+        """
+        Восстанавливает сообщение из задачи рассылки.
+
+        Args:
+            payload (str): Сообщение в формате JSON.
+
+        Returns:
+            BroadcastMessage: Сообщение рассылки.
+        """
+        data = json.loads(payload)
+        reply_markup = data.get("reply_markup")
+        return cls(
+            data["text"],
+            InlineKeyboardMarkup.model_validate(reply_markup) if reply_markup else None,
+            data.get("media"),
+            data.get("media_group", False)
+        )
+
+class BroadcastStats:
+    """
+    Счетчики хода рассылки с расчетом скорости и оставшегося времени.
+    """
+    def __init__(self, total: int, sent: int = 0, failed: int = 0, unknown: int = 0,
+                 blocked: int = 0, skipped: int = 0) -> None:
+        """
+        Args:
+            total (int): Общее количество получателей.
+            sent (int): Количество уже доставленных сообщений (при возобновлении рассылки).
+            failed (int): Количество уже учтенных ошибок (при возобновлении рассылки).
+            unknown (int): Количество получателей, доставка которым не подтверждена из-за сбоя.
+            blocked (int): Количество получателей, оказавшихся недоступными во время рассылки.
+            skipped (int): Количество пользователей, пропущенных как недоступные еще до рассылки.
+        """
+        self.total = total
+        self.sent = sent
+        self.failed = failed
+        self.unknown = unknown
+        self.blocked = blocked
+        self.skipped = skipped
+        self._started = time.monotonic()
+        self._started_processed = self.processed
+
+    @property
+    def processed(self) -> int:
+        """Количество обработанных получателей."""
+        return self.sent + self.failed + self.unknown + self.blocked
+
+    @property
+    def throughput(self) -> float:
+        """Средняя скорость рассылки с момента запуска (или возобновления), сообщений в секунду."""
+        elapsed = time.monotonic() - self._started
+        return (self.processed - self._started_processed) / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Оценка оставшегося времени в секундах или None, если скорость еще неизвестна."""
+        throughput = self.throughput
+        if not throughput:
+            return None
+        return max(self.total - self.processed, 0) / throughput
+
+    def format(self) -> str:
+        """
+        Формирует текстовый отчет о ходе рассылки.
+
+        Returns:
+            str: Отчет для администратора.
+        """
+        eta = self.eta
+        text = (f"Отправлено: {self.sent} из {self.total}\n"
+                f"Ошибок: {self.failed}\n")
+        if self.blocked:
+            text += f"Заблокировали бота: {self.blocked}\n"
+        if self.skipped:
+            text += f"Пропущено недоступных: {self.skipped}\n"
+        if self.unknown:
+            text += f"Не подтверждено после сбоя: {self.unknown}\n"
+        return text + (f"Скорость: {self.throughput:.1f} сообщ./с\n"
+                       f"Осталось: {'-' if eta is None else f'~{int(eta)} с'}")
+
+class BroadcastJob:
+    """
+    Выполняемая задача рассылки: сообщение, статистика и управление (пауза, продолжение, отмена).
+    Состояние доставки каждому получателю хранится в users.db.
+    """
+    def __init__(self, job_id: int, message: BroadcastMessage, admin_chat_id: int,
+                 stats: BroadcastStats, status: str = "running", cursor: int = 0) -> None:
+        """
+        Args:
+            job_id (int): ID задачи в базе данных.
+            message (BroadcastMessage): Сообщение рассылки.
+            admin_chat_id (int): ID чата администратора для отчетов.
+            stats (BroadcastStats): Статистика рассылки.
+            status (str): Начальный статус: running или paused.
+            cursor (int): Последний ID пользователя, уже выбранный из таблицы users.
+        """
+        self.job_id = job_id
+        self.message = message
+        self.admin_chat_id = admin_chat_id
+        self.stats = stats
+        self.status = status
+        self.cursor = cursor
+        self.error: Optional[str] = None
+        self._results: List[Tuple[str, int]] = []
+        # file_id медиа в основном боте сохраняются вместе с задачей, чтобы после перезапуска не загружать его снова
+        self._media_saved = message.uploaded
+        self._resumed = asyncio.Event()
+        if status == "running":
+            self._resumed.set()
+
+    def record(self, user_id: int, state: str) -> None:
+        """
+        Запоминает результат доставки до следующей контрольной точки.
+
+        Args:
+            user_id (int): ID получателя.
+            state (str): Состояние доставки: sent, failed, blocked (пользователь недоступен)
+                или pending (получатель возвращен в очередь).
+        """
+        self._results.append((state, user_id))
+        if state == "sent":
+            self.stats.sent += 1
+        elif state == "failed":
+            self.stats.failed += 1
+        elif state == "blocked":
+            self.stats.blocked += 1
+
+    async def checkpoint(self) -> None:
+        """
+        Сохраняет накопленные результаты доставки в базу данных, отмечает недоступных
+        получателей в таблице users и после загрузки медиа сохраняет сообщение с его file_id.
+        """
+        if not self._media_saved and self.message.uploaded:
+            await db.set_broadcast_payload(self.job_id, self.message.to_json())
+            self._media_saved = True
+        if self._results:
+            results, self._results = self._results, []
+            try:
+                await db.save_broadcast_results(self.job_id, results)
+            except Exception:
+                self._results = results + self._results  # Результаты сохранятся при следующей контрольной точке
+                raise
+            blocked = [user_id for state, user_id in results if state == "blocked"]
+            if blocked:
+                await db.set_users_active(blocked, False)
+
+    async def wait_running(self) -> bool:
+        """
+        Ожидает, пока задача не будет продолжена, если она на паузе.
+
+        Returns:
+            bool: True, если задачу нужно выполнять дальше, False если она отменена.
+        """
+        await self._resumed.wait()
+        return self.status == "running"
+
+    def set_status(self, status: str) -> None:
+        """
+        Изменяет статус задачи в памяти.
+
+        Args:
+            status (str): Новый статус: running, paused, cancelled или failed.
+        """
+        self.status = status
+        if status == "paused":
+            self._resumed.clear()
+        else:
+            self._resumed.set()
+
+ProgressCallback = Callable[[BroadcastJob, bool], Awaitable[None]]
+"""Функция отчета о ходе рассылки: получает задачу и признак завершения."""
+
+class Broadcaster:
+    """
+    Движок массовой рассылки. Отправляет сообщения с ограниченной параллельностью
+    под общим ограничителем скорости, учитывает RetryAfter и работает в фоне,
+    периодически сохраняя состояние доставки и сообщая о ходе рассылки.
+    После перезапуска незавершенные задачи продолжаются с места остановки без повторных отправок.
+    """
+    def __init__(self, rate: float = BROADCAST_RATE, concurrency: int = BROADCAST_CONCURRENCY) -> None:
+        """
+        Инициализация движка.
+
+        Args:
+            rate (float): Максимальная суммарная скорость отправки, сообщений в секунду.
+            concurrency (int): Максимальное количество одновременных запросов к Bot API.
+        """
+        self.bucket = TokenBucket(rate)
+        self.concurrency = concurrency
+        self.jobs: Dict[int, BroadcastJob] = {}
+        self._tasks: Dict[int, asyncio.Task] = {}
+
+    async def create(self, bot: Bot, message: BroadcastMessage, admin_chat_id: int,
+                     on_progress: Optional[ProgressCallback] = None) -> BroadcastJob:
+        """
+        Сохраняет новую задачу рассылки всем доступным пользователям и запускает ее в фоне.
+
+        Args:
+            bot (Bot): Бот, от имени которого выполняется рассылка.
+            message (BroadcastMessage): Сообщение рассылки.
+            admin_chat_id (int): ID чата администратора для отчетов.
+            on_progress (Optional[ProgressCallback]): Функция отчета о ходе рассылки.
+
+        Returns:
+            BroadcastJob: Запущенная задача.
+        """
+        job_id, total, skipped = await db.create_broadcast_job(message.to_json(), admin_chat_id)
+        job = BroadcastJob(job_id, message, admin_chat_id, BroadcastStats(total, skipped=skipped))
+        self._start(bot, job, on_progress)
+        return job
+
+    async def resume_unfinished(self, bot: Bot,
+                                make_progress: Optional[Callable[[BroadcastJob], ProgressCallback]] = None) -> List[BroadcastJob]:
+        """
+        Восстанавливает незавершенные задачи после перезапуска. Получатели, отправка которым
+        была прервана, помечаются как неподтвержденные и повторно не получают сообщение.
+
+        Args:
+            bot (Bot): Бот, от имени которого выполняется рассылка.
+            make_progress (Optional[Callable[[BroadcastJob], ProgressCallback]]): Фабрика функций отчета для задач.
+
+        Returns:
+            List[BroadcastJob]: Восстановленные задачи.
+        """
+        jobs = []
+        for job_id, status, payload, admin_chat_id, total, skipped, cursor in await db.get_unfinished_broadcast_jobs():
+            await db.mark_broadcast_inflight_unknown(job_id)
+            counts = await db.get_broadcast_counts(job_id)
+            stats = BroadcastStats(total, counts.get("sent", 0), counts.get("failed", 0), counts.get("unknown", 0),
+                                   counts.get("blocked", 0), skipped)
+            job = BroadcastJob(job_id, BroadcastMessage.from_json(payload), admin_chat_id, stats, status, cursor)
+            self._start(bot, job, make_progress(job) if make_progress else None)
+            jobs.append(job)
+            logger.info("Рассылка %s восстановлена (%s): %s из %s обработано", job_id, status, stats.processed, stats.total)
+        return jobs
+
+    def get(self, job_id: Optional[int] = None) -> Optional[BroadcastJob]:
+        """
+        Возвращает задачу по ID или последнюю незавершенную задачу.
+
+        Args:
+            job_id (Optional[int]): ID задачи.
+
+        Returns:
+            Optional[BroadcastJob]: Задача или None, если она не найдена.
+        """
+        if job_id is not None:
+            return self.jobs.get(job_id)
+        return self.jobs[max(self.jobs)] if self.jobs else None
+
+    async def set_status(self, job: BroadcastJob, status: str) -> None:
+        """
+        Ставит задачу на паузу, продолжает или отменяет ее.
+
+        Args:
+            job (BroadcastJob): Задача рассылки.
+            status (str): Новый статус: running, paused или cancelled.
+        """
+        await db.set_broadcast_job_status(job.job_id, status)
+        job.set_status(status)
+        logger.info("Рассылка %s: статус изменен на %s", job.job_id, status)
+
+    async def stop(self) -> None:
+        """
+        Останавливает все задачи при завершении работы, сохраняя результаты доставки.
+        Задачи остаются незавершенными и продолжаются при следующем запуске.
+        """
+        for task in list(self._tasks.values()):
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    def _start(self, bot: Bot, job: BroadcastJob, on_progress: Optional[ProgressCallback]) -> None:
+        """
+        Запускает выполнение задачи в фоне.
+
+        Args:
+            bot (Bot): Бот, от имени которого выполняется рассылка.
+            job (BroadcastJob): Задача рассылки.
+            on_progress (Optional[ProgressCallback]): Функция отчета о ходе рассылки.
+        """
+        self.jobs[job.job_id] = job
+        task = asyncio.create_task(self._run(bot, job, on_progress))
+        self._tasks[job.job_id] = task
+
+        def cleanup(_: asyncio.Task) -> None:
+            self._tasks.pop(job.job_id, None)
+            self.jobs.pop(job.job_id, None)
+
+        task.add_done_callback(cleanup)
+
+    async def _run(self, bot: Bot, job: BroadcastJob, on_progress: Optional[ProgressCallback]) -> None:
+        """
+        Выполняет задачу: поставщик потоком выбирает получателей порциями и помечает их как отправляемые,
+        обработчики отправляют сообщения, результаты периодически сохраняются в базу данных.
+        На паузе выбор получателей останавливается, уже выбранные возвращаются в очередь.
+
+        Args:
+            bot (Bot): Бот, от имени которого выполняется рассылка.
+            job (BroadcastJob): Задача рассылки.
+            on_progress (Optional[ProgressCallback]): Функция отчета о ходе рассылки.
+        """
+        async def checkpoints() -> None:
+            reported = time.monotonic()
+            while True:
+                await asyncio.sleep(CHECKPOINT_INTERVAL)
+                try:
+                    await job.checkpoint()
+                except Exception as e:
+                    logger.error("Ошибка сохранения хода рассылки %s: %s", job.job_id, e)
+                if job.status == "running" and time.monotonic() - reported >= PROGRESS_INTERVAL:
+                    reported = time.monotonic()
+                    await self._report(on_progress, job, False)
+
+        checkpointer = asyncio.create_task(checkpoints())
+        try:
+            await job.message.prepare()
+            while await job.wait_running():
+                await self._send_pending(bot, job)
+                await job.checkpoint()
+                if job.status == "running":
+                    # Получатели, возвращенные в очередь при быстрой паузе и продолжении, досылаются
+                    counts = await db.get_broadcast_counts(job.job_id)
+                    if not counts.get("pending"):
+                        break
+        except Exception as e:
+            # Задача завершается, а не остается "running" без выполнения: администратор получает итоговый отчет
+            logger.error("Рассылка %s прервана ошибкой: %s", job.job_id, e)
+            job.error = str(e)
+            job.set_status("failed")
+            try:
+                await db.set_broadcast_job_status(job.job_id, "failed")
+            except Exception as status_error:
+                logger.error("Ошибка сохранения статуса рассылки %s: %s", job.job_id, status_error)
+        finally:
+            checkpointer.cancel()
+            try:
+                await job.checkpoint()
+            except Exception as e:
+                logger.error("Ошибка сохранения хода рассылки %s: %s", job.job_id, e)
+        if job.status == "running":
+            await self.set_status(job, "done")
+        logger.info("Рассылка %s завершена (%s): отправлено %s, ошибок %s, недоступны %s",
+                    job.job_id, job.status, job.stats.sent, job.stats.failed, job.stats.blocked)
+        await self._report(on_progress, job, True)
+
+    async def _send_pending(self, bot: Bot, job: BroadcastJob) -> None:
+        """
+        Один проход по ожидающим получателям задачи, пока она не поставлена на паузу или не отменена.
+
+        Args:
+            bot (Bot): Бот, от имени которого выполняется рассылка.
+            job (BroadcastJob): Задача рассылки.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+
+        async def claim() -> None:
+            # Сначала получатели, возвращенные в очередь на паузе
+            after_user_id = 0
+            while job.status == "running":
+                user_ids = await db.claim_broadcast_recipients(job.job_id, after_user_id, self.concurrency)
+                if not user_ids:
+                    break
+                after_user_id = user_ids[-1]
+                for user_id in user_ids:
+                    await queue.put(user_id)
+            # Затем новые получатели потоком из таблицы users, начиная с сохраненной позиции
+            if job.status == "running":
+                async for user_ids in db.iter_user_ids(job.cursor, self.concurrency):
+                    await db.claim_broadcast_users(job.job_id, user_ids)
+                    job.cursor = user_ids[-1]
+                    for user_id in user_ids:
+                        await queue.put(user_id)
+                    if job.status != "running":
+                        break
+
+        async def produce() -> None:
+            error: Optional[Exception] = None
+            try:
+                await claim()
+            except Exception as e:
+                error = e
+            # Обработчики завершаются и при ошибке выбора получателей, дослав уже выбранных
+            for _ in range(self.concurrency):
+                await queue.put(None)
+            if error is not None:
+                raise error
+
+        async def consume() -> None:
+            while (user_id := await queue.get()) is not None:
+                if job.status != "running":
+                    job.record(user_id, "pending")
+                    continue
+                try:
+                    result = await self._send(bot, user_id, job.message)
+                except BroadcastMediaError:
+                    job.record(user_id, "pending")  # Сообщение не отправлено, получатель остается в очереди
+                    raise
+                BROADCAST_MESSAGES.inc(result)
+                job.record(user_id, result)
+
+        producer = asyncio.create_task(produce())
+        consumers = [asyncio.create_task(consume()) for _ in range(self.concurrency)]
+        try:
+            # Обработчики завершаются, когда поставщик закончил (в том числе с ошибкой) и очередь разобрана
+            await asyncio.gather(*consumers)
+            await producer
+        finally:
+            # При ошибке обработчика или остановке оставшиеся задачи не должны ждать очередь бесконечно
+            for task in [producer, *consumers]:
+                task.cancel()
+            await asyncio.gather(producer, *consumers, return_exceptions=True)
+            # Выбранные, но не отправленные получатели возвращаются в очередь рассылки
+            while not queue.empty():
+                user_id = queue.get_nowait()
+                if user_id is not None:
+                    job.record(user_id, "pending")
+
+    async def _send(self, bot: Bot, user_id: int, message: BroadcastMessage) -> str:
+        """
+        Отправляет сообщение одному получателю с учетом ограничителя скорости и RetryAfter.
+        BroadcastMediaError передается вызывающему: рассылка прерывается.
+
+        Args:
+            bot (Bot): Бот, от имени которого выполняется рассылка.
+            user_id (int): ID получателя.
+            message (BroadcastMessage): Сообщение рассылки.
+
+        Returns:
+            str: Состояние доставки: sent, blocked (пользователь недоступен) или failed.
+        """
+        for _ in range(MAX_RETRY_AFTER_ATTEMPTS + 1):
+            await self.bucket.acquire()
+            try:
+                await message.send(bot, user_id)
+                return "sent"
+            except TelegramRetryAfter as e:
+                logger.warning("Telegram ограничил частоту отправки, пауза %s с", e.retry_after)
+                self.bucket.pause(e.retry_after)
+            except BroadcastMediaError:
+                raise  # Прерывает рассылку: отправка остальным получателям завершится той же ошибкой
+            except Exception as e:
+                if is_unreachable(e):
+                    logger.info("Пользователь %s недоступен и исключен из рассылок: %s", user_id, e)
+                    return "blocked"
+                logger.error("Ошибка отправки пользователю %s: %s", user_id, e)
+                return "failed"
+        return "failed"
+
+    @staticmethod
+    async def _report(on_progress: Optional[ProgressCallback], job: BroadcastJob, finished: bool) -> None:
+        """
+        Вызывает функцию отчета, не прерывая рассылку при ее ошибке.
+
+        Args:
+            on_progress (Optional[ProgressCallback]): Функция отчета о ходе рассылки.
+            job (BroadcastJob): Задача рассылки.
+            finished (bool): Признак завершения задачи.
+        """
+        if on_progress is None:
+            return
+        try:
+            await on_progress(job, finished)
+        except Exception as e:
+            logger.error("Ошибка отчета о ходе рассылки: %s", e)
+
+# Глобальный движок рассылок с общим ограничителем скорости
+broadcaster = Broadcaster()
@@ -0,0 +1,151 @@
+# utils/control_channel.py
+import asyncio
+import json
+import os
+from typing import Any, Dict, Optional
+
+import logging
+from utils.logger import logger
+from utils.bot_status import BotStatusWatcher
+from config import CONTROL_SOCKET
+
+REQUEST_TIMEOUT = 3.0
+"""Время ожидания ответа основного бота на команду админ-бота, в секундах."""
+
+class ControlServer:
+    """
+    Канал управления основным ботом через локальный Unix-сокет.
+    Админ-бот отправляет команды (JSON-строка на запрос), основной бот сразу применяет
+    их к статусу в памяти и отвечает подтверждением с фактическим состоянием.
+    """
+    def __init__(self, status: BotStatusWatcher, path: str = CONTROL_SOCKET) -> None:
+        """
+        Инициализация сервера управления.
+
+        Args:
+            status (BotStatusWatcher): Хранилище статуса основного бота.
+            path (str): Путь к Unix-сокету.
+        """
+        self.status = status
+        self.path = path
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> bool:
+        """
+        Запускает прием команд на Unix-сокете.
+
+        Returns:
+            bool: True, если сервер запущен, False если Unix-сокеты недоступны на этой платформе.
+        """
+        if not hasattr(asyncio, "start_unix_server"):
+            logger.warning("Unix-сокеты недоступны, канал управления не запущен.")
+            return False
+        if os.path.exists(self.path):
+            os.remove(self.path)  # Сокет, оставшийся от предыдущего запуска
+        try:
+            self._server = await asyncio.start_unix_server(self._handle, path=self.path)
+        except OSError as e:
+            logger.error("Не удалось запустить канал управления на %s: %s", self.path, e)
+            return False
+        logger.info("Канал управления запущен: %s", self.path)
+        return True
+
+    async def stop(self) -> None:
+        """
+        Останавливает сервер и удаляет файл сокета.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Обрабатывает одно подключение: читает команду и отправляет подтверждение.
+
+        Args:
+            reader (asyncio.StreamReader): Поток чтения подключения.
+            writer (asyncio.StreamWriter): Поток записи подключения.
+        """
+        try:
+            line = await asyncio.wait_for(reader.readline(), timeout=REQUEST_TIMEOUT)
+            response = self._execute(json.loads(line))
+        except Exception as e:
+            logger.error("Ошибка обработки команды канала управления: %s", e)
+            response = {"ok": False, "error": str(e)}
+        try:
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+        finally:
+            writer.close()
+
+    def _execute(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Выполняет команду канала управления.
+
+        Args:
+            request (Dict[str, Any]): Команда: {"command": "get_status"} или {"command": "set_status", "is_active": bool}.
+
+        Returns:
+            Dict[str, Any]: Подтверждение с фактическим статусом бота.
+        """
+        command = request.get("command")
+        if command == "set_status":
+            self.status.set(bool(request["is_active"]))
+        elif command != "get_status":
+            return {"ok": False, "error": f"unknown command: {command}"}
+        return {"ok": True, "is_active": self.status.is_active}
+
+async def send_command(request: Dict[str, Any], path: str = CONTROL_SOCKET) -> Optional[Dict[str, Any]]:
+    """
+    Отправляет команду основному боту и ожидает подтверждения.
+
+    Args:
+        request (Dict[str, Any]): Команда для основного бота.
+        path (str): Путь к Unix-сокету основного бота.
+
+    Returns:
+        Optional[Dict[str, Any]]: Ответ основного бота или None, если он недоступен.
+    """
+    if not hasattr(asyncio, "open_unix_connection"):
+        return None
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_unix_connection(path), timeout=REQUEST_TIMEOUT)
+    except (OSError, asyncio.TimeoutError):
+        return None
+    try:
+        writer.write(json.dumps(request).encode() + b"\n")
+        await writer.drain()
+        line = await asyncio.wait_for(reader.readline(), timeout=REQUEST_TIMEOUT)
+        response = json.loads(line)
+        return response if response.get("ok") else None
+    except Exception as e:
+        logger.error("Ошибка обмена с основным ботом по каналу управления: %s", e)
+        return None
+    finally:
+        writer.close()
+
+async def get_remote_status() -> Optional[bool]:
+    """
+    Запрашивает текущий статус основного бота.
+
+    Returns:
+        Optional[bool]: True/False - статус бота, None если основной бот недоступен.
+    """
+    response = await send_command({"command": "get_status"})
+    return response["is_active"] if response else None
+
+async def set_remote_status(is_active: bool) -> Optional[bool]:
+    """
+    Передает основному боту новый статус.
+
+    Args:
+        is_active (bool): True - включить бота, False - поставить на паузу.
+
+    Returns:
+        Optional[bool]: Статус, подтвержденный основным ботом, или None если он недоступен.
+    """
+    response = await send_command({"command": "set_status", "is_active": is_active})
+    return response["is_active"] if response else None
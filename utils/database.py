@@ -1,10 +1,75 @@
 # utils/database.py
-from typing import List
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
 import aiosqlite
 import logging
 from datetime import datetime  # Добавляем импорт datetime
 from utils.logger import logger
+from utils.metrics import DB_ERRORS, DB_SECONDS, timed
+
+SEEN_USERS_SIZE = 100_000
+"""Максимальное количество недавно зарегистрированных пользователей в памяти."""
+SEEN_USERS_TTL = 600.0
+"""Время (в секундах), в течение которого повторная регистрация пользователя не обращается к базе данных."""
+BUSY_TIMEOUT_MS = 5000
+"""Время (в миллисекундах) ожидания блокировки, занятой другим процессом, до ошибки "database is locked"."""
+CONNECTION_PRAGMAS = (
+    f"busy_timeout = {BUSY_TIMEOUT_MS}",
+    "synchronous = NORMAL",  # В режиме WAL не теряет целостность, fsync только при контрольных точках
+    "cache_size = -16000",  # 16 МБ страничного кэша
+    "mmap_size = 268435456",  # 256 МБ отображения файла в память
+    "temp_store = MEMORY",
+)
+"""Настройки, применяемые к каждому соединению с базой данных."""
+
+class SeenUserCache:
+    """
+    Ограниченный LRU-кэш недавно зарегистрированных пользователей со сроком жизни записей.
+    Срок жизни ограничивает устаревание: статус доставки может измениться в другом процессе
+    (например, рассылкой из админ-бота), и тогда /start должен снова дойти до базы данных.
+    """
+    def __init__(self, size: int = SEEN_USERS_SIZE, ttl: float = SEEN_USERS_TTL) -> None:
+        """
+        Args:
+            size (int): Максимальное количество записей.
+            ttl (float): Срок жизни записи в секундах.
+        """
+        self.size = size
+        self.ttl = ttl
+        self._expires: OrderedDict[int, float] = OrderedDict()
+
+    def __contains__(self, user_id: int) -> bool:
+        expires = self._expires.get(user_id)
+        if expires is None:
+            return False
+        if expires < time.monotonic():
+            del self._expires[user_id]
+            return False
+        self._expires.move_to_end(user_id)
+        return True
+
+    def add(self, user_id: int) -> None:
+        """
+        Запоминает пользователя, вытесняя самую давнюю запись при переполнении.
+
+        Args:
+            user_id (int): ID пользователя Telegram.
+        """
+        self._expires[user_id] = time.monotonic() + self.ttl
+        self._expires.move_to_end(user_id)
+        if len(self._expires) > self.size:
+            self._expires.popitem(last=False)
+
+    def discard(self, user_id: int) -> None:
+        """
+        Забывает пользователя, чтобы следующая регистрация дошла до базы данных.
+
+        Args:
+            user_id (int): ID пользователя Telegram.
+        """
+        self._expires.pop(user_id, None)
 
 class Database:
     """
@@ -20,32 +85,132 @@ class Database:
         """
         self.db_name = db_name
         self.db = None
+        self.reader = None
+        self.seen_users = SeenUserCache()
 
     async def connect(self) -> None:
         """
-        Устанавливает соединение с базой данных и создает таблицу users, если она не существует.
+        Открывает соединение для записи и соединение только для чтения, настраивает их
+        и приводит схему базы данных к текущей версии (таблицы users, broadcast_jobs,
+        broadcast_recipients и media_cache).
+        База данных используется основным ботом и админ-ботом одновременно, поэтому
+        включается режим WAL: чтение не блокирует запись, а запись ожидает освобождения
+        блокировки до BUSY_TIMEOUT_MS миллисекунд вместо ошибки "database is locked".
         """
         self.db = await aiosqlite.connect(self.db_name)
+        await self.db.execute("PRAGMA journal_mode = WAL")
+        await self._configure(self.db)
+        await self._migrate()
+        # Режим WAL сохраняется в файле базы данных, поэтому читающее соединение открывается после настройки
+        self.reader = await aiosqlite.connect(f"file:{self.db_name}?mode=ro", uri=True)
+        await self._configure(self.reader)
+        logger.info("Соединение с базой данных установлено.")
+
+    @staticmethod
+    async def _configure(connection: aiosqlite.Connection) -> None:
+        """
+        Применяет настройки соединения.
+
+        Args:
+            connection (aiosqlite.Connection): Соединение с базой данных.
+        """
+        for pragma in CONNECTION_PRAGMAS:
+            await connection.execute(f"PRAGMA {pragma}")
+
+    async def _migrate(self) -> None:
+        """
+        Последовательно применяет миграции схемы, номер версии хранится в PRAGMA user_version.
+        Версия читается и миграции применяются в одной транзакции с блокировкой записи,
+        поэтому процессы, подключающиеся одновременно, не применяют одну миграцию дважды.
+        """
+        await self.db.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = await self.db.execute("PRAGMA user_version")
+            (version,) = await cursor.fetchone()
+            migrations = [self._migrate_base_schema]
+            for number, migration in enumerate(migrations[version:], start=version + 1):
+                await migration()
+                await self.db.execute(f"PRAGMA user_version = {number}")
+                logger.info("Схема базы данных обновлена до версии %s", number)
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+
+    async def _migrate_base_schema(self) -> None:
+        """
+        Миграция 1: создает таблицы users, broadcast_jobs, broadcast_recipients и media_cache.
+        Базы, созданные до появления версий схемы, дополняются недостающими столбцами.
+        """
         await self.db.execute("""
             CREATE TABLE IF NOT EXISTS users (
                 user_id INTEGER PRIMARY KEY,
+                timestamp TEXT NOT NULL,
+                is_active INTEGER NOT NULL DEFAULT 1
+            )
+        """)
+        await self._add_column_if_missing("users", "is_active", "INTEGER NOT NULL DEFAULT 1")
+        await self.db.execute("CREATE INDEX IF NOT EXISTS idx_users_active ON users (is_active, user_id)")
+        await self.db.execute("""
+            CREATE TABLE IF NOT EXISTS broadcast_jobs (
+                job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                status TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                admin_chat_id INTEGER NOT NULL,
+                total INTEGER NOT NULL,
+                cursor INTEGER NOT NULL DEFAULT 0,
+                skipped INTEGER NOT NULL DEFAULT 0,
                 timestamp TEXT NOT NULL
             )
         """)
-        await self.db.commit()
-        logger.info("Соединение с базой данных установлено.")
+        await self._add_column_if_missing("broadcast_jobs", "skipped", "INTEGER NOT NULL DEFAULT 0")
+        await self.db.execute("""
+            CREATE TABLE IF NOT EXISTS broadcast_recipients (
+                job_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                state TEXT NOT NULL,
+                PRIMARY KEY (job_id, user_id)
+            ) WITHOUT ROWID
+        """)
+        await self.db.execute("""
+            CREATE TABLE IF NOT EXISTS media_cache (
+                content_hash TEXT PRIMARY KEY,
+                file_id TEXT NOT NULL
+            )
+        """)
+
+    async def _add_column_if_missing(self, table: str, column: str, definition: str) -> None:
+        """
+        Добавляет столбец в существующую таблицу, если его еще нет.
+
+        Args:
+            table (str): Имя таблицы.
+            column (str): Имя столбца.
+            definition (str): Тип и ограничения столбца.
+        """
+        cursor = await self.db.execute(f"PRAGMA table_info({table})")
+        if column not in {row[1] for row in await cursor.fetchall()}:
+            await self.db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+            logger.info("В таблицу %s добавлен столбец %s", table, column)
 
     async def close(self) -> None:
         """
-        Закрывает соединение с базой данных.
+        Закрывает соединения с базой данных.
         """
+        if self.reader:
+            await self.reader.close()
         if self.db:
             await self.db.close()
             logger.info("Соединение с базой данных закрыто.")
 
+    @timed(DB_SECONDS, DB_ERRORS)
     async def register_user(self, user_id: int) -> bool:
         """
-        Регистрирует нового пользователя в базе данных, если его еще нет.
+        Регистрирует нового пользователя в базе данных одним запросом (INSERT ... ON CONFLICT).
+        Пользователь, ранее заблокировавший бота, снова становится доступным для рассылок.
+        Недавно зарегистрированные пользователи берутся из кэша без обращения к базе данных.
+        Транзакция фиксируется сразу: в режиме WAL с synchronous = NORMAL это дешево, а открытая
+        транзакция держала бы блокировку записи users.db для других процессов.
 
         Args:
             user_id (int): ID пользователя Telegram.
@@ -53,42 +218,284 @@ class Database:
         Returns:
             bool: True, если регистрация успешна или пользователь уже зарегистрирован, False в случае ошибки.
         """
+        if user_id in self.seen_users:
+            return True
         try:
-            # Проверяем, существует ли пользователь
-            cursor = await self.db.execute("SELECT user_id FROM users WHERE user_id = ?", (user_id,))
-            exists = await cursor.fetchone()
-
-            if exists:
-                logger.info(f"Пользователь {user_id} уже зарегистрирован в базе данных")
-                return True
-
-            # Регистрируем нового пользователя
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            await self.db.execute(
-                "INSERT INTO users (user_id, timestamp) VALUES (?, ?)",
+            cursor = await self.db.execute(
+                "INSERT INTO users (user_id, timestamp) VALUES (?, ?) "
+                "ON CONFLICT (user_id) DO UPDATE SET is_active = 1 WHERE is_active = 0",
                 (user_id, timestamp)
             )
+            # Фиксируется и запрос, который ничего не изменил: sqlite3 уже начал транзакцию
             await self.db.commit()
-            logger.info(f"Пользователь {user_id} успешно зарегистрирован в базе данных")
+            if cursor.rowcount:
+                logger.info("Пользователь %s добавлен в список рассылки", user_id)
+            self.seen_users.add(user_id)
             return True
         except Exception as e:
-            logger.error(f"Ошибка регистрации пользователя {user_id}: {str(e)}")
+            logger.error("Ошибка регистрации пользователя %s: %s", user_id, e)
+            DB_ERRORS.inc("register_user")
+            if self.db is not None and self.db.in_transaction:
+                await self.db.rollback()  # Не оставляем транзакцию с блокировкой записи открытой
             return False
 
+    @timed(DB_SECONDS, DB_ERRORS)
     async def get_all_users(self) -> List[int]:
         """
-        Получает список всех зарегистрированных пользователей.
+        Получает список всех зарегистрированных пользователей, включая недоступных для рассылок.
 
         Returns:
             List[int]: Список ID пользователей.
         """
         try:
-            cursor = await self.db.execute("SELECT user_id FROM users")
+            cursor = await self.reader.execute("SELECT user_id FROM users")
             rows = await cursor.fetchall()
             return [row[0] for row in rows]
         except Exception as e:
-            logger.error(f"Ошибка получения списка пользователей: {str(e)}")
+            logger.error("Ошибка получения списка пользователей: %s", e)
+            DB_ERRORS.inc("get_all_users")
             return []
 
+    async def iter_user_ids(self, after_user_id: int = 0, chunk_size: int = 1000) -> AsyncIterator[List[int]]:
+        """
+        Потоково читает ID доступных для рассылок пользователей порциями по возрастанию
+        (keyset-пагинация WHERE user_id > ? LIMIT n), не загружая весь список в память.
+
+        Args:
+            after_user_id (int): Последний уже обработанный ID; чтение начинается со следующего.
+            chunk_size (int): Размер порции.
+
+        Yields:
+            List[int]: Очередная порция ID пользователей.
+        """
+        while True:
+            cursor = await self.reader.execute(
+                "SELECT user_id FROM users WHERE is_active = 1 AND user_id > ? ORDER BY user_id LIMIT ?",
+                (after_user_id, chunk_size)
+            )
+            user_ids = [row[0] for row in await cursor.fetchall()]
+            if not user_ids:
+                return
+            yield user_ids
+            after_user_id = user_ids[-1]
+
+    @timed(DB_SECONDS, DB_ERRORS)
+    async def set_users_active(self, user_ids: List[int], is_active: bool) -> None:
+        """
+        Изменяет статус доставки пользователей. Недоступные пользователи (заблокировали бота
+        или удалили аккаунт) пропускаются при рассылках до следующей команды /start.
+
+        Args:
+            user_ids (List[int]): ID пользователей.
+            is_active (bool): True - пользователь доступен для рассылок, False - недоступен.
+        """
+        await self.db.executemany(
+            "UPDATE users SET is_active = ? WHERE user_id = ?",
+            [(int(is_active), user_id) for user_id in user_ids]
+        )
+        await self.db.commit()
+        for user_id in user_ids:
+            self.seen_users.discard(user_id)
+
+    @timed(DB_SECONDS, DB_ERRORS)
+    async def create_broadcast_job(self, payload: str, admin_chat_id: int) -> Tuple[int, int, int]:
+        """
+        Создает задачу рассылки всем доступным пользователям.
+        Получатели не копируются заранее: они читаются из таблицы users по мере отправки.
+
+        Args:
+            payload (str): Сообщение рассылки в формате JSON.
+            admin_chat_id (int): ID чата администратора, которому отправляются отчеты о ходе рассылки.
+
+        Returns:
+            Tuple[int, int, int]: ID задачи, количество получателей и количество пропущенных недоступных пользователей.
+        """
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        cursor = await self.db.execute("SELECT is_active, COUNT(*) FROM users GROUP BY is_active")
+        counts = dict(await cursor.fetchall())
+        total, skipped = counts.get(1, 0), counts.get(0, 0)
+        cursor = await self.db.execute(
+            "INSERT INTO broadcast_jobs (status, payload, admin_chat_id, total, skipped, timestamp) "
+            "VALUES ('running', ?, ?, ?, ?, ?)",
+            (payload, admin_chat_id, total, skipped, timestamp)
+        )
+        job_id = cursor.lastrowid
+        await self.db.commit()
+        logger.info("Создана рассылка %s, получателей: %s, пропущено недоступных: %s", job_id, total, skipped)
+        return job_id, total, skipped
+
+    @timed(DB_SECONDS, DB_ERRORS)
+    async def get_unfinished_broadcast_jobs(self) -> List[Tuple[int, str, str, int, int, int, int]]:
+        """
+        Получает незавершенные (выполняемые или приостановленные) задачи рассылки.
+
+        Returns:
+            List[Tuple[int, str, str, int, int, int, int]]: Список (ID задачи, статус, сообщение в JSON,
+            ID чата администратора, количество получателей, количество пропущенных недоступных
+            пользователей, последний выбранный из users ID).
+        """
+        cursor = await self.reader.execute(
+            "SELECT job_id, status, payload, admin_chat_id, total, skipped, cursor FROM broadcast_jobs "
+            "WHERE status IN ('running', 'paused') ORDER BY job_id"
+        )
+        return await cursor.fetchall()
+
+    @timed(DB_SECONDS, DB_ERRORS)
+    async def set_broadcast_job_status(self, job_id: int, status: str) -> None:
+        """
+        Изменяет статус задачи рассылки.
+
+        Args:
+            job_id (int): ID задачи.
+            status (str): Новый статус: running, paused, cancelled, done или failed.
+        """
+        await self.db.execute("UPDATE broadcast_jobs SET status = ? WHERE job_id = ?", (status, job_id))
+        await self.db.commit()
+
+    @timed(DB_SECONDS, DB_ERRORS)
+    async def set_broadcast_payload(self, job_id: int, payload: str) -> None:
+        """
+        Обновляет сообщение задачи рассылки (например, после загрузки медиа в основной бот).
+
+        Args:
+            job_id (int): ID задачи.
+            payload (str): Сообщение рассылки в формате JSON.
+        """
+        await self.db.execute("UPDATE broadcast_jobs SET payload = ? WHERE job_id = ?", (payload, job_id))
+        await self.db.commit()
+
+    @timed(DB_SECONDS, DB_ERRORS)
+    async def get_broadcast_counts(self, job_id: int) -> Dict[str, int]:
+        """
+        Подсчитывает получателей задачи рассылки по состояниям доставки.
+
+        Args:
+            job_id (int): ID задачи.
+
+        Returns:
+            Dict[str, int]: Количество получателей для каждого состояния
+            (pending, sending, sent, failed, blocked, unknown).
+        """
+        cursor = await self.reader.execute(
+            "SELECT state, COUNT(*) FROM broadcast_recipients WHERE job_id = ? GROUP BY state",
+            (job_id,)
+        )
+        return {state: count for state, count in await cursor.fetchall()}
+
+    @timed(DB_SECONDS, DB_ERRORS)
+    async def claim_broadcast_recipients(self, job_id: int, after_user_id: int, limit: int) -> List[int]:
+        """
+        Выбирает следующую порцию получателей, возвращенных в очередь (например, при паузе),
+        по возрастанию user_id и помечает их как отправляемые. Отметка сохраняется до отправки,
+        поэтому после сбоя эти получатели не получат сообщение повторно.
+
+        Args:
+            job_id (int): ID задачи.
+            after_user_id (int): Последний user_id предыдущей порции.
+            limit (int): Размер порции.
+
+        Returns:
+            List[int]: ID получателей порции.
+        """
+        cursor = await self.db.execute(
+            "SELECT user_id FROM broadcast_recipients "
+            "WHERE job_id = ? AND state = 'pending' AND user_id > ? ORDER BY user_id LIMIT ?",
+            (job_id, after_user_id, limit)
+        )
+        user_ids = [row[0] for row in await cursor.fetchall()]
+        if user_ids:
+            await self.db.executemany(
+                "UPDATE broadcast_recipients SET state = 'sending' WHERE job_id = ? AND user_id = ?",
+                [(job_id, user_id) for user_id in user_ids]
+            )
+            await self.db.commit()
+        return user_ids
+
+    @timed(DB_SECONDS, DB_ERRORS)
+    async def claim_broadcast_users(self, job_id: int, user_ids: List[int]) -> None:
+        """
+        Добавляет очередную порцию пользователей в получатели задачи сразу в состоянии отправки
+        и сдвигает позицию задачи в таблице users. Отметка сохраняется до отправки,
+        поэтому после сбоя эти получатели не получат сообщение повторно.
+
+        Args:
+            job_id (int): ID задачи.
+            user_ids (List[int]): Порция ID пользователей по возрастанию.
+        """
+        await self.db.executemany(
+            "INSERT OR IGNORE INTO broadcast_recipients (job_id, user_id, state) VALUES (?, ?, 'sending')",
+            [(job_id, user_id) for user_id in user_ids]
+        )
+        await self.db.execute("UPDATE broadcast_jobs SET cursor = ? WHERE job_id = ?", (user_ids[-1], job_id))
+        await self.db.commit()
+
+    @timed(DB_SECONDS, DB_ERRORS)
+    async def save_broadcast_results(self, job_id: int, results: List[Tuple[str, int]]) -> None:
+        """
+        Сохраняет результаты доставки (контрольная точка рассылки).
+
+        Args:
+            job_id (int): ID задачи.
+            results (List[Tuple[str, int]]): Список (новое состояние, ID получателя).
+        """
+        await self.db.executemany(
+            "UPDATE broadcast_recipients SET state = ? WHERE job_id = ? AND user_id = ?",
+            [(state, job_id, user_id) for state, user_id in results]
+        )
+        await self.db.commit()
+
+    @timed(DB_SECONDS, DB_ERRORS)
+    async def mark_broadcast_inflight_unknown(self, job_id: int) -> int:
+        """
+        Помечает получателей, отправка которым была прервана сбоем, как неподтвержденных.
+        Таким получателям сообщение повторно не отправляется, чтобы исключить дубли.
+
+        Args:
+            job_id (int): ID задачи.
+
+        Returns:
+            int: Количество таких получателей.
+        """
+        cursor = await self.db.execute(
+            "UPDATE broadcast_recipients SET state = 'unknown' WHERE job_id = ? AND state = 'sending'",
+            (job_id,)
+        )
+        await self.db.commit()
+        return cursor.rowcount
+
+    @timed(DB_SECONDS, DB_ERRORS)
+    async def get_file_id(self, content_hash: str) -> Optional[str]:
+        """
+        Получает сохраненный file_id Telegram для файла с указанным хэшем содержимого.
+
+        Args:
+            content_hash (str): SHA-256 содержимого файла.
+
+        Returns:
+            Optional[str]: file_id или None, если файл еще не загружался.
+        """
+        cursor = await self.reader.execute("SELECT file_id FROM media_cache WHERE content_hash = ?", (content_hash,))
+        row = await cursor.fetchone()
+        return row[0] if row else None
+
+    @timed(DB_SECONDS, DB_ERRORS)
+    async def set_file_id(self, content_hash: str, file_id: Optional[str]) -> None:
+        """
+        Сохраняет file_id Telegram для файла или удаляет его, если file_id устарел.
+
+        Args:
+            content_hash (str): SHA-256 содержимого файла.
+            file_id (Optional[str]): file_id или None для удаления записи.
+        """
+        if file_id is None:
+            await self.db.execute("DELETE FROM media_cache WHERE content_hash = ?", (content_hash,))
+        else:
+            await self.db.execute(
+                "INSERT OR REPLACE INTO media_cache (content_hash, file_id) VALUES (?, ?)",
+                (content_hash, file_id)
+            )
+        await self.db.commit()
+
 # Глобальный экземпляр базы данных
 db = Database()
\ No newline at end of file
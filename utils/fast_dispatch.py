@@ -0,0 +1,82 @@
+# utils/fast_dispatch.py
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Union
+
+from aiogram.dispatcher.event.handler import CallableObject
+from aiogram.dispatcher.middlewares.base import BaseMiddleware
+from aiogram.fsm.state import State
+from aiogram.types import Message
+
+from utils.metrics import HANDLER_ERRORS, HANDLER_SECONDS, track
+from utils.text_manager import text_manager
+
+ANY_STATE = "*"
+"""Маршрут для любого состояния FSM, включая отсутствие состояния."""
+
+RouteState = Union[None, str, State]
+"""Состояние маршрута: None (нет состояния), ANY_STATE или состояние FSM."""
+
+class FastDispatch(BaseMiddleware):
+    """
+    Быстрый путь маршрутизации нажатий на кнопки: сообщение, текст которого соответствует
+    действию (см. TextManager.get_action), передается обработчику по ключу (состояние FSM, действие)
+    одним поиском в словаре, без проверки фильтров всех роутеров по очереди.
+    Сообщения с произвольным текстом проходят обычную маршрутизацию aiogram.
+
+    Маршруты ANY_STATE проверяются раньше маршрутов конкретных состояний, поэтому их
+    можно регистрировать только для обработчиков, которые и при обычной маршрутизации
+    срабатывают первыми (например, "Отмена" в первом роутере).
+    """
+    def __init__(self) -> None:
+        """
+        Инициализация таблицы маршрутов.
+        """
+        self.routes: Dict[Tuple[Optional[str], str], CallableObject] = {}
+
+    def route(self, *actions: str, state: Union[RouteState, Iterable[RouteState]] = None) -> Callable:
+        """
+        Декоратор, регистрирующий обработчик в таблице быстрого пути. Применяется вместе
+        с обычной регистрацией в роутере, которая остается запасным путем.
+
+        Args:
+            *actions (str): Действия в виде "категория.ключ".
+            state (Union[RouteState, Iterable[RouteState]]): Состояние или несколько состояний,
+                в которых действует маршрут. По умолчанию - только без состояния FSM.
+
+        Returns:
+            Callable: Декоратор, возвращающий обработчик без изменений.
+        """
+        states = state if isinstance(state, (list, tuple, set, frozenset)) else (state,)
+
+        def decorator(callback: Callable) -> Callable:
+            handler = CallableObject(callback)
+            for raw_state in states:
+                if isinstance(raw_state, State):
+                    raw_state = raw_state.state
+                for action in actions:
+                    key = (raw_state, action)
+                    if key in self.routes:
+                        raise ValueError(f"Маршрут {key} уже зарегистрирован")
+                    self.routes[key] = handler
+            return callback
+
+        return decorator
+
+    async def __call__(self, handler, event: Message, data: dict) -> Any:
+        """
+        Вызывает обработчик из таблицы маршрутов или передает сообщение обычной маршрутизации.
+
+        Args:
+            handler: Следующий обработчик в цепочке (обычная маршрутизация).
+            event (Message): Сообщение от пользователя.
+            data (dict): Данные контекста для обработки (включая state и raw_state).
+        """
+        action = text_manager.get_action(event.text)
+        if action is not None:
+            route = self.routes.get((ANY_STATE, action)) or self.routes.get((data.get("raw_state"), action))
+            if route is not None:
+                # Обработчики быстрого пути минуют middleware роутеров, поэтому измеряются здесь
+                return await track(HANDLER_SECONDS, HANDLER_ERRORS, route.callback.__name__, route.call(event, **data))
+        return await handler(event, data)
+
+# Глобальная таблица быстрого пути для основного бота
+fast_dispatch = FastDispatch()
@@ -0,0 +1,188 @@
+# utils/fsm_storage.py
+import asyncio
+import json
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import aiosqlite
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+
+import logging
+from utils.logger import logger
+from utils.database import CONNECTION_PRAGMAS
+
+FLUSH_INTERVAL = 0.5
+"""Максимальная задержка (в секундах) сохранения изменений состояний на диск."""
+
+class SqliteStorage(BaseStorage):
+    """
+    Хранилище состояний FSM в SQLite. Все состояния держатся в памяти (чтение не обращается к диску),
+    изменения сразу применяются к кэшу и сохраняются в базу данных пакетами в фоне,
+    поэтому пользователь, находящийся посреди сценария, продолжает его после перезапуска бота.
+    Данные состояний должны сериализоваться в JSON.
+    Файл может использоваться несколькими рабочими процессами (см. utils/workers.py): каждый пользователь
+    закреплен за одним процессом, поэтому процессы не перезаписывают состояния друг друга.
+    """
+    def __init__(self, db_name: str = "fsm.db") -> None:
+        """
+        Инициализация хранилища.
+
+        Args:
+            db_name (str): Имя файла базы данных состояний.
+        """
+        self.db_name = db_name
+        self.db = None
+        self._states: Dict[str, Optional[str]] = {}
+        self._data: Dict[str, Dict[str, Any]] = {}
+        self._dirty: Set[str] = set()
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def connect(self) -> None:
+        """
+        Открывает базу данных, создает таблицу fsm, если она не существует, и загружает сохраненные состояния в память.
+        """
+        self.db = await aiosqlite.connect(self.db_name)
+        await self.db.execute("PRAGMA journal_mode = WAL")
+        for pragma in CONNECTION_PRAGMAS:
+            await self.db.execute(f"PRAGMA {pragma}")
+        await self.db.execute("""
+            CREATE TABLE IF NOT EXISTS fsm (
+                key TEXT PRIMARY KEY,
+                state TEXT,
+                data TEXT NOT NULL
+            ) WITHOUT ROWID
+        """)
+        await self.db.commit()
+        cursor = await self.db.execute("SELECT key, state, data FROM fsm")
+        for key, state, data in await cursor.fetchall():
+            self._states[key] = state
+            self._data[key] = json.loads(data)
+        logger.info("Хранилище состояний открыто, восстановлено состояний: %s", len(self._states))
+
+    @staticmethod
+    def _key(key: StorageKey) -> str:
+        """
+        Преобразует ключ aiogram в строковый ключ таблицы.
+
+        Args:
+            key (StorageKey): Ключ хранилища.
+
+        Returns:
+            str: Ключ записи.
+        """
+        return ":".join(str(part) for part in (
+            key.bot_id, key.chat_id, key.user_id, key.thread_id,
+            getattr(key, "business_connection_id", None), key.destiny
+        ))
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        """
+        Устанавливает состояние.
+
+        Args:
+            key (StorageKey): Ключ хранилища.
+            state (StateType): Новое состояние или None для сброса.
+        """
+        record_key = self._key(key)
+        self._states[record_key] = state.state if isinstance(state, State) else state
+        self._mark_dirty(record_key)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        """
+        Получает состояние из памяти.
+
+        Args:
+            key (StorageKey): Ключ хранилища.
+
+        Returns:
+            Optional[str]: Текущее состояние.
+        """
+        return self._states.get(self._key(key))
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        """
+        Сохраняет данные состояния.
+
+        Args:
+            key (StorageKey): Ключ хранилища.
+            data (Dict[str, Any]): Данные, сериализуемые в JSON.
+        """
+        record_key = self._key(key)
+        self._data[record_key] = data.copy()
+        self._mark_dirty(record_key)
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        """
+        Получает копию данных состояния из памяти.
+
+        Args:
+            key (StorageKey): Ключ хранилища.
+
+        Returns:
+            Dict[str, Any]: Данные состояния.
+        """
+        return self._data.get(self._key(key), {}).copy()
+
+    async def close(self) -> None:
+        """
+        Сохраняет несохраненные изменения и закрывает базу данных.
+        """
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        if self.db:
+            await self.flush()
+            await self.db.close()
+            self.db = None
+            logger.info("Хранилище состояний закрыто.")
+
+    def _mark_dirty(self, record_key: str) -> None:
+        """
+        Отмечает запись для сохранения и планирует фоновое сохранение.
+
+        Args:
+            record_key (str): Ключ записи.
+        """
+        self._dirty.add(record_key)
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self) -> None:
+        """
+        Сохраняет накопленные изменения после задержки.
+        """
+        await asyncio.sleep(FLUSH_INTERVAL)
+        self._flush_task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error("Ошибка сохранения состояний FSM: %s", e)
+
+    async def flush(self) -> None:
+        """
+        Сохраняет измененные записи одной транзакцией. Записи без состояния и данных удаляются.
+        """
+        if not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, set()
+        upserts: List[Tuple[str, Optional[str], str]] = []
+        deletes: List[Tuple[str]] = []
+        for record_key in dirty:
+            state = self._states.get(record_key)
+            data = self._data.get(record_key)
+            if state is None and not data:
+                self._states.pop(record_key, None)
+                self._data.pop(record_key, None)
+                deletes.append((record_key,))
+            else:
+                upserts.append((record_key, state, json.dumps(data or {}, ensure_ascii=False)))
+        try:
+            if upserts:
+                await self.db.executemany("INSERT OR REPLACE INTO fsm (key, state, data) VALUES (?, ?, ?)", upserts)
+            if deletes:
+                await self.db.executemany("DELETE FROM fsm WHERE key = ?", deletes)
+            await self.db.commit()
+        except Exception:
+            # Записи будут сохранены при следующем изменении состояния или при закрытии хранилища
+            self._dirty |= dirty
+            raise
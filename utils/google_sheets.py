@@ -1,12 +1,13 @@
 # utils/google_sheets.py
+import threading
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
 from config import GOOGLE_SHEET_ID
 import os
-from typing import List, Any, Union
+from typing import Dict, List, Any, Optional, Union
 import logging
 from utils.logger import logger
-import sys
+from utils.metrics import SHEETS_ERRORS, SHEETS_SECONDS, timed
 from datetime import datetime
 
 SCOPES = [
@@ -14,6 +15,15 @@ SCOPES = [
     "https://www.googleapis.com/auth/drive"
 ]
 
+SHEET_HEADERS: Dict[str, List[str]] = {
+    "SearchRequests": ["Property Type", "Rooms", "District", "Budget", "Condition", "Phone", "Telegram", "Timestamp"],
+    "SellRequests": ["Phone", "Telegram", "Timestamp"],
+    "ExcursionRequests": ["Phone", "Telegram", "Timestamp"],
+}
+"""Заголовки листов с заявками, записываемые в пустой лист."""
+DEFAULT_HEADERS: List[str] = ["Phone", "Telegram", "Timestamp"]
+"""Заголовки для листов, отсутствующих в SHEET_HEADERS."""
+
 class GoogleSheetsClient:
     """
     Класс для взаимодействия с Google Sheets через gspread.
@@ -21,18 +31,60 @@ class GoogleSheetsClient:
     """
     def __init__(self) -> None:
         """
-        Инициализация клиента Google Sheets.
+        Инициализация клиента Google Sheets без обращений к сети.
+        Авторизация и открытие таблицы выполняются при первом вызове connect() или первой записи.
+        """
+        self.credentials_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "credentials.json")
+        self.client = None
+        self.spreadsheet = None
+        # gspread синхронный и не потокобезопасный: вызовы из пула потоков сериализуются
+        self._lock = threading.Lock()
+        # Кэш листов и числа колонок заголовка, чтобы не запрашивать их на каждую заявку
+        self._worksheets: Dict[str, gspread.Worksheet] = {}
+        self._headers_count: Dict[str, int] = {}
+
+    @property
+    def is_connected(self) -> bool:
+        """
+        Признак того, что таблица открыта и клиент готов к работе.
+        """
+        return self.spreadsheet is not None
+
+    @timed(SHEETS_SECONDS, SHEETS_ERRORS)
+    def connect(self) -> bool:
+        """
         Загружает учетные данные из credentials.json и открывает таблицу по GOOGLE_SHEET_ID.
-        Если файл credentials.json отсутствует, выводит сообщение и завершает выполнение.
+        Ошибки не прерывают работу бота: они логируются, а подключение повторяется при следующей записи.
+
+        Returns:
+            bool: True, если таблица открыта, False в случае ошибки.
         """
-        credentials_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "credentials.json")
-        if not os.path.exists(credentials_path):
+        with self._lock:
+            return self._connect()
+
+    def _connect(self) -> bool:
+        """
+        Реализация connect, выполняемая под блокировкой клиента.
+
+        Returns:
+            bool: True, если таблица открыта, False в случае ошибки.
+        """
+        if self.spreadsheet is not None:
+            return True
+        if not os.path.exists(self.credentials_path):
             message = "Файл credentials.json не найден в корне проекта. Пожалуйста, добавьте его и перезапустите бота."
             logger.error(message)
-            sys.exit(1)
-        self.credentials = ServiceAccountCredentials.from_json_keyfile_name(credentials_path, SCOPES)
-        self.client = gspread.authorize(self.credentials)
-        self.spreadsheet = self.client.open_by_key(GOOGLE_SHEET_ID)
+            return False
+        try:
+            credentials = ServiceAccountCredentials.from_json_keyfile_name(self.credentials_path, SCOPES)
+            self.client = gspread.authorize(credentials)
+            self.spreadsheet = self.client.open_by_key(GOOGLE_SHEET_ID)
+        except Exception as e:
+            logger.error("Error connecting to Google Sheets: %s", e)
+            SHEETS_ERRORS.inc("connect")
+            return False
+        logger.info("Соединение с Google Sheets установлено.")
+        return True
 
     def append_row(self, sheet_name: str, row_data: List[Any]) -> bool:
         """
@@ -46,38 +98,177 @@ class GoogleSheetsClient:
         Returns:
             bool: True, если строка успешно добавлена, False в случае ошибки.
         """
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return self.append_rows({sheet_name: [row_data + [timestamp]]})
+
+    @timed(SHEETS_SECONDS, SHEETS_ERRORS)
+    def append_rows(self, rows_by_sheet: Dict[str, List[List[Any]]]) -> bool:
+        """
+        Добавление нескольких строк в один или несколько листов одним запросом batchUpdate.
+        Строки передаются уже с временной меткой. Отсутствующие листы создаются,
+        в пустые листы записываются заголовки.
+
+        Args:
+            rows_by_sheet (Dict[str, List[List[Any]]]): Строки для добавления, сгруппированные по названию листа.
+
+        Returns:
+            bool: True, если все строки успешно добавлены, False в случае ошибки.
+        """
+        with self._lock:
+            return self._append_rows(rows_by_sheet)
+
+    def _append_rows(self, rows_by_sheet: Dict[str, List[List[Any]]]) -> bool:
+        """
+        Реализация append_rows, выполняемая под блокировкой клиента.
+
+        Args:
+            rows_by_sheet (Dict[str, List[List[Any]]]): Строки для добавления, сгруппированные по названию листа.
+
+        Returns:
+            bool: True, если все строки успешно добавлены, False в случае ошибки.
+        """
+        if not self._connect():
+            return False
         try:
+            requests = []
+            for sheet_name, rows in rows_by_sheet.items():
+                worksheet = self._get_worksheet(sheet_name)
+                headers_count = self._get_headers_count(sheet_name, worksheet)
+                # appendCells сам находит конец таблицы, поэтому лист не скачивается
+                # целиком ради номера следующей строки
+                requests.append({
+                    "appendCells": {
+                        "sheetId": worksheet.id,
+                        "rows": [self._to_row_data(row, headers_count) for row in rows],
+                        "fields": "userEnteredValue"
+                    }
+                })
+
+            self.spreadsheet.batch_update({"requests": requests})
+            for sheet_name, rows in rows_by_sheet.items():
+                logger.info("Successfully appended %s row(s) to %s: %s", len(rows), sheet_name, rows)
+            return True
+        except Exception as e:
+            # Кэш мог устареть (лист удален, переименован или очищен вручную)
+            for sheet_name in rows_by_sheet:
+                self._invalidate(sheet_name)
+            logger.error("Error appending rows to %s: %s", ', '.join(rows_by_sheet), e)
+            SHEETS_ERRORS.inc("append_rows")
+            return False
+
+    @staticmethod
+    def _to_row_data(row: List[Any], headers_count: int) -> Dict[str, Any]:
+        """
+        Преобразует строку в формат RowData для запроса appendCells.
+        Значения записываются как строки (аналог RAW), строка дополняется пустыми ячейками до ширины заголовка.
+
+        Args:
+            row (List[Any]): Значения ячеек строки.
+            headers_count (int): Количество колонок в заголовке листа.
+
+        Returns:
+            Dict[str, Any]: Описание строки для Sheets API.
+        """
+        values = list(row) + [""] * (headers_count - len(row))
+        return {
+            "values": [
+                {"userEnteredValue": {"stringValue": "" if value is None else str(value)}}
+                for value in values
+            ]
+        }
+
+    @timed(SHEETS_SECONDS, SHEETS_ERRORS)
+    def warm_up(self, sheet_names: Optional[List[str]] = None) -> bool:
+        """
+        Подключается к таблице и заранее получает листы и их заголовки, чтобы запись заявок выполнялась одним запросом.
+        Метаданные всех листов загружаются одним запросом, первые строки всех листов - одним
+        запросом values.batchGet. Отсутствующие листы создаются, в пустые записываются заголовки.
+
+        Args:
+            sheet_names (Optional[List[str]]): Названия листов. По умолчанию все листы из SHEET_HEADERS.
+
+        Returns:
+            bool: True, если все листы готовы к записи, False в случае ошибки.
+        """
+        sheet_names = list(sheet_names or SHEET_HEADERS)
+        with self._lock:
+            if not self._connect():
+                return False
+            try:
+                worksheets = {worksheet.title: worksheet for worksheet in self.spreadsheet.worksheets()}
+                for sheet_name in sheet_names:
+                    if sheet_name not in worksheets:
+                        self.create_sheet(sheet_name)
+                        worksheets[sheet_name] = self.spreadsheet.worksheet(sheet_name)
+
+                response = self.spreadsheet.values_batch_get([f"'{sheet_name}'!1:1" for sheet_name in sheet_names])
+                for sheet_name, value_range in zip(sheet_names, response.get("valueRanges", [])):
+                    headers = (value_range.get("values") or [[]])[0]
+                    if not headers:
+                        headers = SHEET_HEADERS.get(sheet_name, DEFAULT_HEADERS)
+                        worksheets[sheet_name].append_row(headers, table_range="A1")
+                    self._worksheets[sheet_name] = worksheets[sheet_name]
+                    self._headers_count[sheet_name] = len(headers)
+                logger.info("Google Sheets: листы %s готовы к записи", ', '.join(sheet_names))
+                return True
+            except Exception as e:
+                for sheet_name in sheet_names:
+                    self._invalidate(sheet_name)
+                logger.error("Error preparing sheets %s: %s", ', '.join(sheet_names), e)
+                SHEETS_ERRORS.inc("warm_up")
+                return False
+
+    def _invalidate(self, sheet_name: str) -> None:
+        """
+        Удаляет лист и его заголовок из кэша, чтобы при следующей записи они были получены заново.
+
+        Args:
+            sheet_name (str): Название листа.
+        """
+        self._worksheets.pop(sheet_name, None)
+        self._headers_count.pop(sheet_name, None)
+
+    def _get_worksheet(self, sheet_name: str) -> gspread.Worksheet:
+        """
+        Возвращает лист из кэша, при промахе получает его из таблицы (создавая при отсутствии).
+
+        Args:
+            sheet_name (str): Название листа.
+
+        Returns:
+            gspread.Worksheet: Объект листа.
+        """
+        worksheet = self._worksheets.get(sheet_name)
+        if worksheet is None:
             try:
                 worksheet = self.spreadsheet.worksheet(sheet_name)
             except gspread.exceptions.WorksheetNotFound:
                 self.create_sheet(sheet_name)
                 worksheet = self.spreadsheet.worksheet(sheet_name)
+            self._worksheets[sheet_name] = worksheet
+        return worksheet
 
-            all_values = worksheet.get_all_values()
-            if not all_values or (len(all_values) == 1 and not all_values[0]):
-                if sheet_name == "SearchRequests":
-                    headers = ["Property Type", "Rooms", "District", "Budget", "Condition", "Phone", "Telegram", "Timestamp"]
-                else:
-                    headers = ["Phone", "Telegram", "Timestamp"]
-                worksheet.append_row(headers)
-
-            # Добавляем временную метку в конец строки
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            row_data_with_timestamp = row_data + [timestamp]
-
-            all_rows = worksheet.get_all_values()
-            next_row = len(all_rows) + 1
+    def _get_headers_count(self, sheet_name: str, worksheet: gspread.Worksheet) -> int:
+        """
+        Возвращает число колонок заголовка листа, читая первую строку только при первом обращении.
+        Если лист пуст, записывает в него заголовки.
 
-            headers_count = len(worksheet.row_values(1)) if all_rows else 6
-            if len(row_data_with_timestamp) < headers_count:
-                row_data_with_timestamp.extend([""] * (headers_count - len(row_data_with_timestamp)))
+        Args:
+            sheet_name (str): Название листа.
+            worksheet (gspread.Worksheet): Объект листа.
 
-            worksheet.update(f"A{next_row}", [row_data_with_timestamp])
-            logger.info(f"Successfully appended row to {sheet_name} at row {next_row}: {row_data_with_timestamp}")
-            return True
-        except Exception as e:
-            logger.error(f"Error appending row to {sheet_name}: {str(e)}")
-            return False
+        Returns:
+            int: Количество колонок в заголовке.
+        """
+        headers_count = self._headers_count.get(sheet_name)
+        if headers_count is None:
+            headers = worksheet.row_values(1)
+            if not headers:
+                headers = SHEET_HEADERS.get(sheet_name, DEFAULT_HEADERS)
+                worksheet.append_row(headers, table_range="A1")
+            headers_count = len(headers)
+            self._headers_count[sheet_name] = headers_count
+        return headers_count
 
     def create_sheet(self, sheet_name: str) -> None:
         """
@@ -86,12 +277,16 @@ class GoogleSheetsClient:
         Args:
             sheet_name (str): Название создаваемого листа.
         """
+        if self.spreadsheet is None:
+            logger.error("Error creating sheet %s: Google Sheets is not connected", sheet_name)
+            return
         try:
             self.spreadsheet.add_worksheet(title=sheet_name, rows=100, cols=20)
-            logger.info(f"Created new sheet: {sheet_name}")
+            logger.info("Created new sheet: %s", sheet_name)
         except gspread.exceptions.APIError as e:
-            logger.error(f"Error creating sheet {sheet_name}: {str(e)}")
+            logger.error("Error creating sheet %s: %s", sheet_name, e)
 
+    @timed(SHEETS_SECONDS, SHEETS_ERRORS)
     def read_all_data(self, sheet_name: str) -> Union[List[List[str]], List]:
         """
         Чтение всех данных из указанного листа.
@@ -102,11 +297,14 @@ class GoogleSheetsClient:
         Returns:
             Union[List[List[str]], List]: Список строк с данными из листа или пустой список в случае ошибки.
         """
+        if not self.connect():
+            return []
         try:
             worksheet = self.spreadsheet.worksheet(sheet_name)
             return worksheet.get_all_values()
         except Exception as e:
-            logger.error(f"Error reading data from {sheet_name}: {str(e)}")
+            logger.error("Error reading data from %s: %s", sheet_name, e)
+            SHEETS_ERRORS.inc("read_all_data")
             return []
 
 gs_client = GoogleSheetsClient()
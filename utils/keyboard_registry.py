@@ -0,0 +1,108 @@
+# utils/keyboard_registry.py
+import os
+import yaml
+from typing import Any, Dict, Union
+import logging
+from utils.logger import logger
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup, KeyboardButton, ReplyKeyboardMarkup
+from utils.text_manager import get_text, text_manager
+
+Markup = Union[ReplyKeyboardMarkup, InlineKeyboardMarkup]
+
+class KeyboardRegistry:
+    """
+    Каталог клавиатур, описанных в texts/keyboards.yaml.
+    Клавиатуры собираются один раз при загрузке; объекты aiogram неизменяемы,
+    поэтому одна и та же клавиатура используется всеми обработчиками без пересоздания.
+    При перезагрузке текстов (или изменении texts/keyboards.yaml) клавиатуры собираются заново.
+    """
+    def __init__(self) -> None:
+        """
+        Инициализирует каталог и собирает клавиатуры из YAML-файла.
+        """
+        self.keyboards: Dict[str, Markup] = {}
+        self.load_keyboards()
+
+    def load_keyboards(self) -> None:
+        """
+        Загружает описание клавиатур из texts/keyboards.yaml и собирает их.
+        Тексты кнопок со ссылкой text_ref берутся из текущих текстов бота.
+        """
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        file_path = os.path.join(base_dir, "texts", "keyboards.yaml")
+        if not os.path.exists(file_path):
+            logger.error("Файл %s не найден", file_path)
+            return
+        with open(file_path, "r", encoding="utf-8") as f:
+            catalog: Dict[str, Dict[str, Any]] = yaml.safe_load(f) or {}
+        self.keyboards = {name: self._build(spec) for name, spec in catalog.items()}
+        logger.info("Загружено клавиатур: %s", len(self.keyboards))
+
+    def get_keyboard(self, name: str) -> Markup:
+        """
+        Получает собранную клавиатуру по имени.
+
+        Args:
+            name (str): Имя клавиатуры в texts/keyboards.yaml (например, "main_menu").
+
+        Returns:
+            Markup: Готовая клавиатура.
+        """
+        return self.keyboards[name]
+
+    @classmethod
+    def _build(cls, spec: Dict[str, Any]) -> Markup:
+        """
+        Собирает клавиатуру по описанию.
+
+        Args:
+            spec (Dict[str, Any]): Описание клавиатуры: type, rows и параметры reply-клавиатуры.
+
+        Returns:
+            Markup: Клавиатура.
+        """
+        if spec.get("type") == "inline":
+            return InlineKeyboardMarkup(inline_keyboard=[
+                [InlineKeyboardButton(**cls._button(button)) for button in row] for row in spec["rows"]
+            ])
+        return ReplyKeyboardMarkup(
+            keyboard=[[KeyboardButton(**cls._button(button)) for button in row] for row in spec["rows"]],
+            resize_keyboard=spec.get("resize_keyboard"),
+            one_time_keyboard=spec.get("one_time_keyboard")
+        )
+
+    @staticmethod
+    def _button(spec: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Преобразует описание кнопки в параметры кнопки aiogram.
+
+        Args:
+            spec (Union[str, Dict[str, Any]]): Текст кнопки или словарь с text/text_ref и другими полями.
+
+        Returns:
+            Dict[str, Any]: Параметры кнопки.
+        """
+        if not isinstance(spec, dict):
+            return {"text": str(spec)}
+        params = dict(spec)
+        text_ref = params.pop("text_ref", None)
+        if text_ref is not None:
+            category, key = text_ref.split(".", 1)
+            params["text"] = get_text(category, key)
+        return params
+
+keyboard_registry = KeyboardRegistry()
+text_manager.add_reload_listener(keyboard_registry.load_keyboards)
+
+def get_keyboard(name: str) -> Markup:
+    """
+    Глобальная функция для получения собранной клавиатуры по имени.
+
+    Args:
+        name (str): Имя клавиатуры в texts/keyboards.yaml (например, "main_menu").
+
+    Returns:
+        Markup: Готовая клавиатура.
+    """
+    return keyboard_registry.get_keyboard(name)
@@ -1,14 +1,107 @@
 # utils/logger.py
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
+from typing import Any, Dict, Optional
 
-# Настройка логгера
-logging.basicConfig(
-    level=logging.WARNING,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('bot.log'),  # Логи записываются в файл bot.log
-        logging.StreamHandler()          # Логи выводятся в консоль
-    ]
-)
-
-logger = logging.getLogger('realtor_bot')
\ No newline at end of file
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+"""Формат текстовых логов."""
+
+class JsonFormatter(logging.Formatter):
+    """
+    Форматирует запись лога как одну строку JSON (формат JSON Lines) для сборщиков логов.
+    """
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Args:
+            record (logging.LogRecord): Запись лога.
+
+        Returns:
+            str: Строка JSON с временем, уровнем, именем логгера, сообщением и номером процесса.
+        """
+        entry: Dict[str, Any] = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "process": record.process,
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+_settings: Dict[str, Any] = {
+    "level": "WARNING",
+    "json_lines": False,
+    "max_bytes": 10 * 1024 * 1024,
+    "backup_count": 5,
+    "when": "",
+    "file_name": "bot.log",
+}
+_listener: Optional[logging.handlers.QueueListener] = None
+
+def setup_logging(**settings: Any) -> None:
+    """
+    Настраивает логирование через очередь: обработчики вызовов logger.* только кладут запись
+    в очередь, а запись в файл и консоль выполняет отдельный поток, поэтому цикл событий
+    не блокируется на файловом вводе-выводе. Файл лога ротируется по размеру или по времени.
+    Повторный вызов заменяет переданные параметры и перезапускает поток записи;
+    остальные параметры сохраняются.
+
+    Args:
+        **settings: Параметры логирования:
+            level (str): Уровень логирования (например, "INFO").
+            json_lines (bool): Записывать логи в формате JSON Lines.
+            max_bytes (int): Размер файла лога, при котором он ротируется.
+            backup_count (int): Количество хранимых старых файлов лога.
+            when (str): Интервал ротации по времени (например, "midnight"); если задан, заменяет ротацию по размеру.
+            file_name (str): Имя файла лога.
+    """
+    global _listener
+    _settings.update(settings)
+    stop_logging()
+
+    if _settings["when"]:
+        file_handler: logging.Handler = logging.handlers.TimedRotatingFileHandler(
+            _settings["file_name"], when=_settings["when"], backupCount=_settings["backup_count"],
+            encoding="utf-8", delay=True
+        )
+    else:
+        file_handler = logging.handlers.RotatingFileHandler(
+            _settings["file_name"], maxBytes=_settings["max_bytes"],
+            backupCount=_settings["backup_count"], encoding="utf-8", delay=True
+        )
+    formatter = JsonFormatter() if _settings["json_lines"] else logging.Formatter(LOG_FORMAT)
+    handlers = [file_handler, logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(_settings["level"])
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers)
+    _listener.start()
+
+def stop_logging() -> None:
+    """
+    Дописывает накопленные в очереди записи и останавливает поток записи логов.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+# Настройка логгера с параметрами по умолчанию; config.py применяет параметры из .env
+setup_logging()
+atexit.register(stop_logging)
+
+logger = logging.getLogger('realtor_bot')
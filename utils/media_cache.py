@@ -0,0 +1,115 @@
+# utils/media_cache.py
+import asyncio
+import hashlib
+import os
+from typing import Any, Dict, Tuple
+
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import FSInputFile, Message
+
+import logging
+from utils.logger import logger
+from utils.database import db
+
+FILE_ID_ERRORS = ("wrong file identifier", "wrong remote file identifier", "file_reference_", "file_id_invalid")
+"""Фрагменты текста ошибок Bot API (в нижнем регистре), означающих, что file_id больше недействителен."""
+
+def is_file_id_error(error: TelegramBadRequest) -> bool:
+    """
+    Проверяет, что запрос отклонен из-за недействительного file_id, а не из-за других параметров
+    (подписи, parse_mode, клавиатуры): только в этом случае повторная загрузка файла имеет смысл.
+
+    Args:
+        error (TelegramBadRequest): Ошибка Bot API.
+
+    Returns:
+        bool: True, если ошибка относится к file_id.
+    """
+    message = error.message.lower()
+    return any(marker in message for marker in FILE_ID_ERRORS)
+
+def hash_file(path: str) -> str:
+    """
+    Вычисляет SHA-256 содержимого файла.
+
+    Args:
+        path (str): Путь к файлу.
+
+    Returns:
+        str: Хэш содержимого в шестнадцатеричном виде.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class MediaCache:
+    """
+    Кэш file_id Telegram для локальных файлов.
+    Файл загружается в Telegram один раз, дальше отправляется по file_id.
+    Ключ кэша - хэш содержимого файла, поэтому замена картинки приводит к новой загрузке.
+    """
+    def __init__(self) -> None:
+        """
+        Инициализация кэша.
+        """
+        self._hashes: Dict[str, Tuple[int, str]] = {}  # путь -> (время изменения, хэш)
+        self._file_ids: Dict[str, str] = {}  # хэш -> file_id
+
+    async def content_hash(self, path: str) -> str:
+        """
+        Вычисляет SHA-256 содержимого файла; файл перечитывается только при изменении.
+        Чтение и хэширование выполняются в отдельном потоке, чтобы не блокировать цикл событий.
+
+        Args:
+            path (str): Путь к файлу.
+
+        Returns:
+            str: Хэш содержимого в шестнадцатеричном виде.
+        """
+        mtime = os.stat(path).st_mtime_ns
+        cached = self._hashes.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        content_hash = await asyncio.to_thread(hash_file, path)
+        self._hashes[path] = (mtime, content_hash)
+        return content_hash
+
+    async def answer_photo(self, message: Message, path: str, **kwargs: Any) -> Message:
+        """
+        Отправляет фото в ответ на сообщение: по сохраненному file_id, а при его отсутствии
+        или устаревании - загрузкой файла с сохранением нового file_id.
+        Другие ошибки запроса (например, в подписи или клавиатуре) не сбрасывают file_id и передаются вызывающему.
+
+        Args:
+            message (Message): Сообщение, в чат которого отправляется фото.
+            path (str): Путь к файлу изображения.
+            **kwargs: Дополнительные параметры answer_photo (caption, reply_markup и т.д.).
+
+        Returns:
+            Message: Отправленное сообщение.
+        """
+        content_hash = await self.content_hash(path)
+        file_id = self._file_ids.get(content_hash) or await db.get_file_id(content_hash)
+        if file_id:
+            try:
+                sent = await message.answer_photo(photo=file_id, **kwargs)
+                self._file_ids[content_hash] = file_id
+                return sent
+            except TelegramBadRequest as e:
+                if not is_file_id_error(e):
+                    raise
+                logger.warning("file_id для %s устарел, файл будет загружен заново: %s", path, e)
+                self._file_ids.pop(content_hash, None)
+                await db.set_file_id(content_hash, None)
+
+        sent = await message.answer_photo(photo=FSInputFile(path), **kwargs)
+        file_id = sent.photo[-1].file_id
+        self._file_ids[content_hash] = file_id
+        await db.set_file_id(content_hash, file_id)
+        logger.info("Файл %s загружен в Telegram, file_id сохранен", path)
+        return sent
+
+# Глобальный экземпляр кэша file_id
+media_cache = MediaCache()
@@ -0,0 +1,486 @@
+# utils/metrics.py
+import asyncio
+import functools
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from aiogram import Dispatcher
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware
+from aiogram.dispatcher.middlewares.base import BaseMiddleware
+from aiogram.types import Update
+from aiohttp import ClientSession, ClientTimeout, web
+
+import logging
+from utils.logger import logger
+from config import METRICS_HOST
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+"""Границы интервалов гистограмм длительности, в секундах."""
+
+FETCH_TIMEOUT = 3.0
+"""Время ожидания ответа сервера метрик другого процесса, в секундах."""
+
+Labels = Tuple[str, ...]
+
+class Counter:
+    """
+    Счетчик событий с метками (например, количество ошибок по имени метода).
+    """
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> None:
+        """
+        Args:
+            name (str): Имя метрики в формате Prometheus (например, "bot_updates_total").
+            documentation (str): Описание метрики.
+            labelnames (Tuple[str, ...]): Имена меток.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """
+        Увеличивает счетчик.
+
+        Args:
+            *labels (str): Значения меток в порядке labelnames.
+            amount (float): Величина увеличения.
+        """
+        with self._lock:
+            self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def snapshot(self) -> List[List[Any]]:
+        """
+        Returns:
+            List[List[Any]]: Значения счетчика: [метки, значение].
+        """
+        with self._lock:
+            return [[list(labels), value] for labels, value in self.values.items()]
+
+class Histogram:
+    """
+    Гистограмма длительностей с метками: количество наблюдений по интервалам, сумма и общее количество.
+    """
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        """
+        Args:
+            name (str): Имя метрики в формате Prometheus (например, "bot_handler_seconds").
+            documentation (str): Описание метрики.
+            labelnames (Tuple[str, ...]): Имена меток.
+            buckets (Tuple[float, ...]): Возрастающие верхние границы интервалов.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # Метки -> [количество по интервалам (последний - выше всех границ), сумма, количество]
+        self.values: Dict[Labels, List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        """
+        Добавляет наблюдение.
+
+        Args:
+            value (float): Наблюдаемое значение (например, длительность в секундах).
+            *labels (str): Значения меток в порядке labelnames.
+        """
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            sample = self.values.get(labels)
+            if sample is None:
+                sample = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            sample[0][index] += 1
+            sample[1] += value
+            sample[2] += 1
+
+    def snapshot(self) -> List[List[Any]]:
+        """
+        Returns:
+            List[List[Any]]: Значения гистограммы: [метки, количество по интервалам, сумма, количество].
+        """
+        with self._lock:
+            return [[list(labels), list(counts), total, count] for labels, (counts, total, count) in self.values.items()]
+
+class MetricsRegistry:
+    """
+    Реестр метрик процесса. Метрики хранятся в памяти; обновление метрики - несколько операций
+    со словарем под блокировкой (обращения к Google Sheets выполняются в отдельных потоках),
+    поэтому сбор метрик можно не отключать.
+    """
+    def __init__(self) -> None:
+        """
+        Инициализация пустого реестра.
+        """
+        self.metrics: List[Any] = []
+        self.started = time.time()
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        """
+        Создает и регистрирует счетчик.
+
+        Args:
+            name (str): Имя метрики.
+            documentation (str): Описание метрики.
+            labelnames (Tuple[str, ...]): Имена меток.
+
+        Returns:
+            Counter: Счетчик.
+        """
+        metric = Counter(name, documentation, labelnames)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Histogram:
+        """
+        Создает и регистрирует гистограмму длительностей.
+
+        Args:
+            name (str): Имя метрики.
+            documentation (str): Описание метрики.
+            labelnames (Tuple[str, ...]): Имена меток.
+
+        Returns:
+            Histogram: Гистограмма.
+        """
+        metric = Histogram(name, documentation, labelnames)
+        self.metrics.append(metric)
+        return metric
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Снимок всех метрик для передачи другому процессу (например, админ-боту).
+
+        Returns:
+            Dict[str, Any]: Время запуска процесса и значения метрик по имени.
+        """
+        return {
+            "started": self.started,
+            "metrics": {
+                metric.name: {
+                    "type": metric.type,
+                    "labelnames": list(metric.labelnames),
+                    "buckets": list(getattr(metric, "buckets", ())),
+                    "samples": metric.snapshot(),
+                }
+                for metric in self.metrics
+            },
+        }
+
+    def render(self) -> str:
+        """
+        Формирует текст метрик в формате Prometheus (text exposition format 0.0.4).
+
+        Returns:
+            str: Текст для ответа на запрос /metrics.
+        """
+        lines = [
+            "# HELP process_start_time_seconds Время запуска процесса (Unix time).",
+            "# TYPE process_start_time_seconds gauge",
+            f"process_start_time_seconds {self.started}",
+        ]
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for sample in metric.snapshot():
+                labels = list(zip(metric.labelnames, sample[0]))
+                if metric.type == "counter":
+                    lines.append(f"{metric.name}{format_labels(labels)} {sample[1]}")
+                    continue
+                counts, total, count = sample[1:]
+                cumulative = 0
+                for bound, bucket_count in zip(metric.buckets + (float("inf"),), counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{metric.name}_bucket{format_labels(labels + [('le', le)])} {cumulative}")
+                lines.append(f"{metric.name}_sum{format_labels(labels)} {total}")
+                lines.append(f"{metric.name}_count{format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+def format_labels(labels: List[Tuple[str, str]]) -> str:
+    """
+    Форматирует метки в формате Prometheus.
+
+    Args:
+        labels (List[Tuple[str, str]]): Пары (имя, значение).
+
+    Returns:
+        str: Строка вида {name="value",...} или пустая строка.
+    """
+    if not labels:
+        return ""
+    escaped = (
+        name + '="' + str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') + '"'
+        for name, value in labels
+    )
+    return "{" + ",".join(escaped) + "}"
+
+async def track(histogram: Histogram, errors: Counter, label: str, awaitable: Awaitable[Any]) -> Any:
+    """
+    Ожидает корутину, записывая ее длительность в гистограмму, а исключение - в счетчик ошибок.
+
+    Args:
+        histogram (Histogram): Гистограмма длительности с одной меткой.
+        errors (Counter): Счетчик ошибок с той же меткой.
+        label (str): Значение метки (например, имя обработчика).
+        awaitable (Awaitable[Any]): Измеряемая корутина.
+
+    Returns:
+        Any: Результат корутины.
+    """
+    start = time.perf_counter()
+    try:
+        return await awaitable
+    except Exception:
+        errors.inc(label)
+        raise
+    finally:
+        histogram.observe(time.perf_counter() - start, label)
+
+def timed(histogram: Histogram, errors: Counter) -> Callable:
+    """
+    Декоратор, измеряющий длительность и ошибки функции или корутины (метка - имя функции).
+
+    Args:
+        histogram (Histogram): Гистограмма длительности с одной меткой.
+        errors (Counter): Счетчик ошибок с той же меткой.
+
+    Returns:
+        Callable: Декоратор.
+    """
+    def decorator(func: Callable) -> Callable:
+        label = func.__name__
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                return await track(histogram, errors, label, func(*args, **kwargs))
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                errors.inc(label)
+                raise
+            finally:
+                histogram.observe(time.perf_counter() - start, label)
+        return wrapper
+
+    return decorator
+
+def merge_snapshots(snapshots: List[Dict[str, Any]]) -> Dict[str, Dict[Labels, Any]]:
+    """
+    Суммирует снимки метрик нескольких процессов (например, рабочих процессов основного бота).
+
+    Args:
+        snapshots (List[Dict[str, Any]]): Снимки, полученные от MetricsRegistry.snapshot.
+
+    Returns:
+        Dict[str, Dict[Labels, Any]]: Значения по имени метрики и меткам: число для счетчиков,
+            [количество по интервалам, сумма, количество] для гистограмм.
+    """
+    merged: Dict[str, Dict[Labels, Any]] = {}
+    for snapshot in snapshots:
+        for name, metric in snapshot["metrics"].items():
+            values = merged.setdefault(name, {})
+            for sample in metric["samples"]:
+                labels = tuple(sample[0])
+                if metric["type"] == "counter":
+                    values[labels] = values.get(labels, 0.0) + sample[1]
+                    continue
+                counts, total, count = sample[1:]
+                current = values.get(labels)
+                if current is None:
+                    values[labels] = [list(counts), total, count]
+                else:
+                    current[0] = [a + b for a, b in zip(current[0], counts)]
+                    current[1] += total
+                    current[2] += count
+    return merged
+
+def estimate_quantile(counts: List[int], quantile: float, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> float:
+    """
+    Оценивает квантиль по гистограмме: верхняя граница интервала, в который он попадает.
+
+    Args:
+        counts (List[int]): Количество наблюдений по интервалам.
+        quantile (float): Квантиль от 0 до 1 (например, 0.95).
+        buckets (Tuple[float, ...]): Верхние границы интервалов.
+
+    Returns:
+        float: Оценка сверху; inf, если квантиль выше последней границы.
+    """
+    target = quantile * sum(counts)
+    cumulative = 0
+    for bound, count in zip(buckets + (float("inf"),), counts):
+        cumulative += count
+        if cumulative >= target:
+            return bound
+    return float("inf")
+
+async def fetch_snapshots(ports: List[int], host: str = METRICS_HOST) -> List[Dict[str, Any]]:
+    """
+    Запрашивает снимки метрик у серверов метрик других процессов.
+
+    Args:
+        ports (List[int]): Порты серверов метрик.
+        host (str): Адрес серверов метрик.
+
+    Returns:
+        List[Dict[str, Any]]: Полученные снимки; недоступные процессы пропускаются.
+    """
+    async def fetch(session: ClientSession, port: int) -> Optional[Dict[str, Any]]:
+        try:
+            async with session.get(f"http://{host}:{port}/metrics.json") as response:
+                return await response.json()
+        except Exception as e:
+            logger.warning("Метрики процесса на порту %s недоступны: %s", port, e)
+            return None
+
+    async with ClientSession(timeout=ClientTimeout(total=FETCH_TIMEOUT)) as session:
+        results = await asyncio.gather(*(fetch(session, port) for port in ports))
+    return [snapshot for snapshot in results if snapshot is not None]
+
+# Глобальный реестр метрик процесса
+registry = MetricsRegistry()
+
+UPDATES = registry.counter("bot_updates_total", "Полученные обновления Telegram.", ("type",))
+UPDATE_SECONDS = registry.histogram("bot_update_seconds", "Длительность обработки обновления.", ("type",))
+HANDLER_SECONDS = registry.histogram("bot_handler_seconds", "Длительность работы обработчика.", ("handler",))
+HANDLER_ERRORS = registry.counter("bot_handler_errors_total", "Исключения в обработчиках.", ("handler",))
+BOT_API_SECONDS = registry.histogram("bot_api_request_seconds", "Длительность запросов к Bot API.", ("method",))
+BOT_API_ERRORS = registry.counter("bot_api_errors_total", "Ошибки запросов к Bot API.", ("method",))
+SHEETS_SECONDS = registry.histogram("bot_sheets_seconds", "Длительность операций Google Sheets.", ("method",))
+SHEETS_ERRORS = registry.counter("bot_sheets_errors_total", "Ошибки операций Google Sheets.", ("method",))
+DB_SECONDS = registry.histogram("bot_db_seconds", "Длительность операций базы данных.", ("method",))
+DB_ERRORS = registry.counter("bot_db_errors_total", "Ошибки операций базы данных.", ("method",))
+NOTIFY_FAILURES = registry.counter("bot_notify_admins_failures_total", "Неудачные уведомления администраторов.")
+BROADCAST_MESSAGES = registry.counter("bot_broadcast_messages_total", "Сообщения рассылок по результату.", ("result",))
+
+class UpdateMetricsMiddleware(BaseMiddleware):
+    """
+    Внешний middleware обновлений: считает обновления по типу и измеряет полную длительность их обработки.
+    """
+    async def __call__(self, handler, event: Update, data: dict) -> Any:
+        """
+        Args:
+            handler: Следующий обработчик в цепочке.
+            event (Update): Обновление от Telegram.
+            data (dict): Данные контекста для обработки.
+        """
+        update_type = event.event_type
+        UPDATES.inc(update_type)
+        start = time.perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            UPDATE_SECONDS.observe(time.perf_counter() - start, update_type)
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """
+    Внутренний middleware событий: измеряет длительность и ошибки выбранного обработчика (метка - имя функции).
+    """
+    async def __call__(self, handler, event: Any, data: dict) -> Any:
+        """
+        Args:
+            handler: Обработчик события.
+            event (Any): Событие (сообщение, нажатие inline-кнопки и т.д.).
+            data (dict): Данные контекста; data["handler"] - выбранный обработчик.
+        """
+        handler_object = data.get("handler")
+        name = handler_object.callback.__name__ if handler_object is not None else "unknown"
+        return await track(HANDLER_SECONDS, HANDLER_ERRORS, name, handler(event, data))
+
+class RequestMetricsMiddleware(BaseRequestMiddleware):
+    """
+    Middleware сессии бота: измеряет длительность и ошибки запросов к Bot API по имени метода.
+    """
+    async def __call__(self, make_request, bot, method) -> Any:
+        """
+        Args:
+            make_request: Следующий обработчик запроса.
+            bot: Бот, выполняющий запрос.
+            method: Метод Bot API (например, SendMessage).
+        """
+        return await track(BOT_API_SECONDS, BOT_API_ERRORS, type(method).__name__, make_request(bot, method))
+
+def install(dp: Dispatcher) -> None:
+    """
+    Подключает сбор метрик обновлений и обработчиков к диспетчеру.
+
+    Args:
+        dp (Dispatcher): Диспетчер, обработчики которого выполняются в этом процессе.
+    """
+    dp.update.outer_middleware(UpdateMetricsMiddleware())
+    handler_metrics = HandlerMetricsMiddleware()
+    for name, observer in dp.observers.items():
+        if name not in ("update", "error"):
+            observer.middleware(handler_metrics)
+
+class MetricsServer:
+    """
+    Локальный HTTP-сервер метрик процесса: /metrics в формате Prometheus
+    и /metrics.json со снимком для админ-бота.
+    """
+    def __init__(self, port: int, host: str = METRICS_HOST) -> None:
+        """
+        Args:
+            port (int): Порт сервера; 0 - сервер не запускается.
+            host (str): Адрес сервера.
+        """
+        self.port = port
+        self.host = host
+        self._runner: Optional[web.AppRunner] = None
+
+    async def start(self) -> None:
+        """
+        Запускает сервер метрик. Ошибка запуска (например, занятый порт) не мешает работе бота.
+        """
+        if not self.port:
+            return
+        app = web.Application()
+        app.router.add_get("/metrics", self._metrics)
+        app.router.add_get("/metrics.json", self._metrics_json)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, self.host, self.port).start()
+        except OSError as e:
+            logger.error("Не удалось запустить сервер метрик на %s:%s: %s", self.host, self.port, e)
+            await runner.cleanup()
+            return
+        self._runner = runner
+        logger.info("Сервер метрик запущен: http://%s:%s/metrics", self.host, self.port)
+
+    async def stop(self) -> None:
+        """
+        Останавливает сервер метрик.
+        """
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @staticmethod
+    async def _metrics(request: web.Request) -> web.Response:
+        """
+        Отдает метрики в формате Prometheus.
+        """
+        return web.Response(text=registry.render(), content_type="text/plain", charset="utf-8",
+                            headers={"X-Content-Type-Options": "nosniff"})
+
+    @staticmethod
+    async def _metrics_json(request: web.Request) -> web.Response:
+        """
+        Отдает снимок метрик в формате JSON.
+        """
+        return web.json_response(registry.snapshot())
@@ -1,18 +1,47 @@
 # utils/notify_admin.py
-from aiogram import Bot
-from aiogram.client.default import DefaultBotProperties
+from typing import Set
 
 from config import ADMIN_BOT_TOKEN, ADMIN_IDS
+from utils.bot_registry import bot_registry
+from utils.logger import logger
+from utils.metrics import NOTIFY_FAILURES
 import asyncio
 
-bot = Bot(token=ADMIN_BOT_TOKEN, default=DefaultBotProperties(parse_mode="HTML"))
+_background_tasks: Set[asyncio.Task] = set()
+"""Незавершенные фоновые уведомления (ссылки хранятся, чтобы задачи не были удалены сборщиком мусора)."""
 
 async def notify_admins(message_text: str) -> None:
     """
     Асинхронно отправляет уведомление всем администраторам, указанным в ADMIN_IDS.
+    Ошибка отправки одному администратору не мешает отправке остальным: она логируется и учитывается в метриках.
 
     Args:
         message_text (str): Текст уведомления для отправки.
     """
-    tasks = [bot.send_message(admin_id, message_text) for admin_id in ADMIN_IDS]
-    await asyncio.gather(*tasks)
\ No newline at end of file
+    bot = bot_registry.get(ADMIN_BOT_TOKEN)
+    results = await asyncio.gather(
+        *(bot.send_message(admin_id, message_text) for admin_id in ADMIN_IDS), return_exceptions=True
+    )
+    for admin_id, result in zip(ADMIN_IDS, results):
+        if isinstance(result, Exception):
+            NOTIFY_FAILURES.inc()
+            logger.error("Ошибка отправки уведомления администратору %s: %s", admin_id, result)
+
+def notify_admins_in_background(message_text: str) -> None:
+    """
+    Отправляет уведомление администраторам в фоновой задаче, чтобы обработчик
+    мог ответить пользователю, не дожидаясь запросов к Bot API.
+
+    Args:
+        message_text (str): Текст уведомления для отправки.
+    """
+    task = asyncio.create_task(notify_admins(message_text))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+async def wait_background_notifications() -> None:
+    """
+    Дожидается отправки фоновых уведомлений (вызывается перед закрытием сессий ботов).
+    """
+    if _background_tasks:
+        await asyncio.gather(*_background_tasks, return_exceptions=True)
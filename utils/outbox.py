@@ -0,0 +1,232 @@
+# utils/outbox.py
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiosqlite
+import logging
+from utils.logger import logger
+from utils.google_sheets import gs_client
+from utils.notify_admin import notify_admins
+from utils.database import CONNECTION_PRAGMAS
+from config import SHEETS_FLUSH_INTERVAL, SHEETS_BATCH_SIZE
+
+RETRY_BASE_DELAY = 2.0
+"""Начальная задержка повторной отправки заявки, в секундах (удваивается с каждой попыткой)."""
+RETRY_MAX_DELAY = 300.0
+"""Максимальная задержка повторной отправки заявки, в секундах."""
+BREAKER_THRESHOLD = 5
+"""Количество подряд неудачных отправок, после которого Google Sheets считается недоступным."""
+BREAKER_COOLDOWN = 60.0
+"""Время (в секундах), в течение которого отправка не выполняется после размыкания предохранителя."""
+
+class LeadOutbox:
+    """
+    Локальная очередь заявок в SQLite.
+    Заявка сначала сохраняется на диск, пользователь сразу получает ответ,
+    а фоновый обработчик доставляет заявки в Google Sheets пакетами,
+    с экспоненциальной задержкой повторов и предохранителем при недоступности API.
+    """
+    def __init__(self, db_name: str = "outbox.db"):
+        """
+        Инициализация очереди.
+
+        Args:
+            db_name (str): Имя файла базы данных очереди.
+        """
+        self.db_name = db_name
+        self.db = None
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._failures = 0
+        self._breaker_open_until = 0.0
+
+    async def connect(self) -> None:
+        """
+        Устанавливает соединение с базой данных и создает таблицу leads, если она не существует.
+        Очередь может использоваться несколькими процессами (см. utils/workers.py), поэтому включается режим WAL.
+        """
+        self.db = await aiosqlite.connect(self.db_name)
+        await self.db.execute("PRAGMA journal_mode = WAL")
+        for pragma in CONNECTION_PRAGMAS:
+            await self.db.execute(f"PRAGMA {pragma}")
+        await self.db.execute("""
+            CREATE TABLE IF NOT EXISTS leads (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                sheet_name TEXT NOT NULL,
+                row_data TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt REAL NOT NULL DEFAULT 0,
+                created TEXT NOT NULL
+            )
+        """)
+        await self.db.execute("CREATE INDEX IF NOT EXISTS idx_leads_next_attempt ON leads (next_attempt)")
+        await self.db.commit()
+        logger.info("Очередь заявок открыта.")
+
+    async def close(self) -> None:
+        """
+        Останавливает фоновую доставку, делает последнюю попытку отправить накопленные заявки
+        и закрывает соединение с базой данных. Недоставленные заявки остаются в очереди до следующего запуска.
+        Процесс, в котором доставка не запускалась, только закрывает соединение.
+        """
+        delivering = self._task is not None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.db:
+            if delivering and self._breaker_open_until <= time.monotonic():
+                try:
+                    await self._deliver_due()
+                except Exception as e:
+                    logger.error("Ошибка доставки заявок при остановке: %s", e)
+            await self.db.close()
+            logger.info("Очередь заявок закрыта.")
+
+    def start(self) -> None:
+        """
+        Запускает фоновую задачу доставки заявок в Google Sheets.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def put(self, sheet_name: str, row_data: List[Any]) -> bool:
+        """
+        Сохраняет заявку в очередь. Временная метка фиксируется в момент приема заявки.
+
+        Args:
+            sheet_name (str): Название листа (например, "SearchRequests").
+            row_data (List[Any]): Данные заявки.
+
+        Returns:
+            bool: True, если заявка сохранена, False в случае ошибки.
+        """
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            await self.db.execute(
+                "INSERT INTO leads (sheet_name, row_data, created) VALUES (?, ?, ?)",
+                (sheet_name, json.dumps(row_data + [timestamp], ensure_ascii=False), timestamp)
+            )
+            await self.db.commit()
+        except Exception as e:
+            logger.error("Ошибка сохранения заявки для %s в очередь: %s", sheet_name, e)
+            return False
+        self._wakeup.set()
+        return True
+
+    async def _run(self) -> None:
+        """
+        Цикл доставки: ждет накопления пакета или истечения интервала, затем отправляет
+        все готовые к отправке заявки одним запросом.
+        """
+        while True:
+            try:
+                await self._wait_for_batch()
+                await self._deliver_due()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Ошибка фоновой доставки заявок: %s", e)
+                await asyncio.sleep(SHEETS_FLUSH_INTERVAL)
+
+    async def _wait_for_batch(self) -> None:
+        """
+        Ожидает, пока в очереди не наберется SHEETS_BATCH_SIZE заявок или не пройдет SHEETS_FLUSH_INTERVAL.
+        При разомкнутом предохранителе ожидает окончания паузы.
+        """
+        delay = self._breaker_open_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        deadline = time.monotonic() + SHEETS_FLUSH_INTERVAL
+        while True:
+            self._wakeup.clear()
+            cursor = await self.db.execute("SELECT COUNT(*) FROM leads WHERE next_attempt <= ?", (time.time(),))
+            (due,) = await cursor.fetchone()
+            timeout = deadline - time.monotonic()
+            if due >= SHEETS_BATCH_SIZE or timeout <= 0:
+                return
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return
+
+    async def _deliver_due(self) -> None:
+        """
+        Отправляет готовые к отправке заявки в Google Sheets. При успехе удаляет их из очереди,
+        при ошибке откладывает следующую попытку с экспоненциальной задержкой.
+        """
+        cursor = await self.db.execute(
+            "SELECT id, sheet_name, row_data, attempts FROM leads WHERE next_attempt <= ? ORDER BY id LIMIT ?",
+            (time.time(), SHEETS_BATCH_SIZE)
+        )
+        leads: List[Tuple[int, str, str, int]] = await cursor.fetchall()
+        if not leads:
+            return
+
+        rows_by_sheet: Dict[str, List[List[Any]]] = {}
+        for _, sheet_name, row_data, _ in leads:
+            rows_by_sheet.setdefault(sheet_name, []).append(json.loads(row_data))
+
+        if await asyncio.to_thread(gs_client.append_rows, rows_by_sheet):
+            await self.db.executemany("DELETE FROM leads WHERE id = ?", [(lead_id,) for lead_id, *_ in leads])
+            await self.db.commit()
+            await self._on_success()
+            return
+
+        now = time.time()
+        await self.db.executemany(
+            "UPDATE leads SET attempts = ?, next_attempt = ? WHERE id = ?",
+            [
+                (attempts + 1, now + min(RETRY_BASE_DELAY * 2 ** attempts, RETRY_MAX_DELAY), lead_id)
+                for lead_id, _, _, attempts in leads
+            ]
+        )
+        await self.db.commit()
+        await self._on_failure()
+
+    async def _on_success(self) -> None:
+        """
+        Сбрасывает счетчик ошибок и замыкает предохранитель после успешной доставки.
+        """
+        if self._failures >= BREAKER_THRESHOLD:
+            logger.warning("Google Sheets снова доступен, доставка заявок возобновлена.")
+            await self._notify("<b>Google Sheets снова доступен.</b>\nНакопленные заявки доставляются в таблицу.")
+        self._failures = 0
+        self._breaker_open_until = 0.0
+
+    async def _on_failure(self) -> None:
+        """
+        Учитывает неудачную доставку и размыкает предохранитель после BREAKER_THRESHOLD ошибок подряд.
+        """
+        self._failures += 1
+        if self._failures >= BREAKER_THRESHOLD:
+            self._breaker_open_until = time.monotonic() + BREAKER_COOLDOWN
+            if self._failures == BREAKER_THRESHOLD:
+                cursor = await self.db.execute("SELECT COUNT(*) FROM leads")
+                (pending,) = await cursor.fetchone()
+                logger.error("Google Sheets недоступен, доставка заявок приостановлена. В очереди: %s", pending)
+                await self._notify(
+                    f"<b>Google Sheets недоступен.</b>\n"
+                    f"Заявки сохраняются локально и будут доставлены позже. В очереди: {pending}"
+                )
+
+    async def _notify(self, text: str) -> None:
+        """
+        Отправляет уведомление администраторам, не прерывая доставку при ошибке.
+
+        Args:
+            text (str): Текст уведомления.
+        """
+        try:
+            await notify_admins(text)
+        except Exception as e:
+            logger.error("Ошибка уведомления администраторов о состоянии очереди заявок: %s", e)
+
+# Глобальный экземпляр очереди заявок
+outbox = LeadOutbox()
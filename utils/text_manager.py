@@ -1,38 +1,61 @@
 # utils/text_manager.py
+import asyncio
 import os
 import yaml
-from typing import Dict, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import logging
 from utils.logger import logger
 
+from aiogram.filters import Filter
+from aiogram.types import Message
+
+RELOAD_INTERVAL = 1.0
+"""Интервал (в секундах) проверки изменения YAML-файлов в директории texts/."""
+
 class TextManager:
     """
     Класс для управления текстовыми данными, загружаемыми из YAML-файлов.
-    Позволяет получать тексты по категории и ключу.
+    Позволяет получать тексты по категории и ключу, а также действие (категория.ключ)
+    по отображаемому тексту кнопки. При изменении файлов тексты перечитываются без перезапуска бота.
     """
     def __init__(self) -> None:
         """
         Инициализирует объект TextManager и загружает тексты из YAML-файлов.
         """
         self.texts: Dict[str, Dict[str, Any]] = {}
+        self._index: Dict[Tuple[str, str], str] = {}
+        self._actions: Dict[str, str] = {}
+        self._mtimes: Dict[str, int] = {}
+        self._listeners: List[Callable[[], None]] = []
+        self._task: Optional[asyncio.Task] = None
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.texts_dir = os.path.join(base_dir, "texts")
         self.load_texts()
 
     def load_texts(self) -> None:
         """
         Загружает тексты из YAML-файлов в директории texts/.
         Поддерживаемые файлы: main_menu.yaml, responses.yaml, welcome.yaml, admin_menu.yaml.
+        Строит индекс (категория, ключ) -> текст и обратный индекс текст -> действие "категория.ключ".
+        Новые данные подменяют старые целиком, поэтому обработчики не видят частично загруженных текстов.
         """
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        texts_dir = os.path.join(base_dir, "texts")
-
+        texts: Dict[str, Dict[str, Any]] = {}
         for filename in ["main_menu.yaml", "responses.yaml", "welcome.yaml", "admin_menu.yaml"]:
-            file_path = os.path.join(texts_dir, filename)
+            file_path = os.path.join(self.texts_dir, filename)
             if os.path.exists(file_path):
                 with open(file_path, "r", encoding="utf-8") as f:
                     category = os.path.splitext(filename)[0]
-                    self.texts[category] = yaml.safe_load(f) or {}
+                    texts[category] = yaml.safe_load(f) or {}
             else:
-                logger.info(f"Файл {file_path} не найден")
+                logger.info("Файл %s не найден", file_path)
+
+        index = {(category, key): value for category, values in texts.items() for key, value in values.items()}
+        actions: Dict[str, str] = {}
+        for (category, key), value in index.items():
+            if isinstance(value, str):
+                actions.setdefault(value, f"{category}.{key}")
+        self.texts, self._index, self._actions = texts, index, actions
+        self._mtimes = self._scan()
 
     def get_text(self, category: str, key: str) -> str:
         """
@@ -45,7 +68,104 @@ class TextManager:
         Returns:
             str: Текст, соответствующий категории и ключу, или "Текст не найден", если ключ отсутствует.
         """
-        return self.texts.get(category, {}).get(key, "Текст не найден")
+        return self._index.get((category, key), "Текст не найден")
+
+    def get_action(self, text: Optional[str]) -> Optional[str]:
+        """
+        Получает действие по отображаемому тексту (например, тексту нажатой кнопки).
+
+        Args:
+            text (Optional[str]): Текст сообщения.
+
+        Returns:
+            Optional[str]: Действие в виде "категория.ключ" (например, "main_menu.cancel") или None.
+        """
+        return self._actions.get(text) if text else None
+
+    def add_reload_listener(self, listener: Callable[[], None]) -> None:
+        """
+        Регистрирует функцию, вызываемую после перезагрузки текстов (например, пересборку клавиатур).
+
+        Args:
+            listener (Callable[[], None]): Функция без аргументов.
+        """
+        self._listeners.append(listener)
+
+    def start(self) -> None:
+        """
+        Запускает фоновую проверку изменений YAML-файлов.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        """
+        Останавливает фоновую проверку изменений YAML-файлов.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _scan(self) -> Dict[str, int]:
+        """
+        Получает время изменения YAML-файлов в директории texts/.
+
+        Returns:
+            Dict[str, int]: Время изменения (в наносекундах) по имени файла.
+        """
+        try:
+            return {
+                entry.name: entry.stat().st_mtime_ns
+                for entry in os.scandir(self.texts_dir) if entry.name.endswith(".yaml")
+            }
+        except OSError:
+            return {}
+
+    async def _watch(self) -> None:
+        """
+        Периодически сравнивает время изменения YAML-файлов и перезагружает тексты при изменении.
+        """
+        while True:
+            await asyncio.sleep(RELOAD_INTERVAL)
+            if self._scan() == self._mtimes:
+                continue
+            try:
+                self.load_texts()
+                for listener in self._listeners:
+                    listener()
+                logger.info("Тексты перезагружены.")
+            except Exception as e:
+                # Старые тексты остаются в силе до исправления файла
+                self._mtimes = self._scan()
+                logger.error("Ошибка перезагрузки текстов: %s", e)
+
+class TextAction(Filter):
+    """
+    Фильтр сообщений по действию кнопки (см. TextManager.get_action).
+    В отличие от F.text == get_text(...), вычисленного при импорте, проверяет текущие тексты.
+    """
+    def __init__(self, *actions: str) -> None:
+        """
+        Args:
+            *actions (str): Допустимые действия в виде "категория.ключ".
+        """
+        self.actions = frozenset(actions)
+
+    async def __call__(self, message: Message) -> bool:
+        """
+        Проверяет, соответствует ли текст сообщения одному из действий.
+
+        Args:
+            message (Message): Объект сообщения от пользователя.
+
+        Returns:
+            bool: True, если сообщение соответствует действию.
+        """
+        return text_manager.get_action(message.text) in self.actions
 
 text_manager = TextManager()
 
@@ -61,4 +181,4 @@ def get_text(category: str, key: str) -> str:
     Returns:
         str: Текст, соответствующий категории и ключу, или "Текст не найден", если ключ отсутствует.
     """
-    return text_manager.get_text(category, key)
\ No newline at end of file
+    return text_manager.get_text(category, key)
@@ -0,0 +1,62 @@
+# utils/webhook.py
+import asyncio
+import signal
+from contextlib import suppress
+from typing import List, Optional
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+
+import logging
+from utils.logger import logger
+from config import WEBHOOK_URL, WEBHOOK_HOST, WEBHOOK_SECRET
+
+async def run_webhook(dp: Dispatcher, bot: Bot, path: str, port: int,
+                      allowed_updates: Optional[List[str]] = None) -> None:
+    """
+    Принимает обновления через webhook вместо long polling: запускает встроенный веб-сервер aiohttp,
+    регистрирует адрес WEBHOOK_URL + path в Telegram и работает до сигнала остановки,
+    после чего удаляет webhook и останавливает сервер.
+    Запросы без правильного секретного токена отклоняются; Telegram получает ответ сразу,
+    а обновление обрабатывается в фоне.
+    Функции startup и shutdown диспетчера вызываются так же, как при polling.
+
+    Args:
+        dp (Dispatcher): Диспетчер бота.
+        bot (Bot): Экземпляр бота.
+        path (str): Путь, по которому веб-сервер принимает обновления этого бота.
+        port (int): Порт веб-сервера.
+        allowed_updates (Optional[List[str]]): Типы обновлений. По умолчанию - используемые роутерами диспетчера.
+    """
+    app = web.Application()
+    SimpleRequestHandler(
+        dispatcher=dp, bot=bot, secret_token=WEBHOOK_SECRET, handle_in_background=True
+    ).register(app, path=path)
+    setup_application(app, dp, bot=bot)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, WEBHOOK_HOST, port).start()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        # На Windows обработчики сигналов в цикле событий не поддерживаются
+        with suppress(NotImplementedError):
+            loop.add_signal_handler(sig, stop.set)
+
+    url = WEBHOOK_URL.rstrip("/") + path
+    try:
+        await bot.set_webhook(
+            url, secret_token=WEBHOOK_SECRET, allowed_updates=allowed_updates or dp.resolve_used_update_types()
+        )
+        logger.info("Webhook установлен: %s, сервер слушает %s:%s", url, WEBHOOK_HOST, port)
+        await stop.wait()
+    finally:
+        try:
+            await bot.delete_webhook()
+            logger.info("Webhook удален.")
+        except Exception as e:
+            logger.error("Ошибка удаления webhook: %s", e)
+        await runner.cleanup()
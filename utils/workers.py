@@ -0,0 +1,295 @@
+# utils/workers.py
+import asyncio
+import multiprocessing
+import queue
+import signal
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from aiogram import Bot, Dispatcher
+from aiogram.dispatcher.middlewares.base import BaseMiddleware
+from aiogram.types import Update
+
+import logging
+from utils.logger import logger
+
+STOP_TIMEOUT = 10.0
+"""Время (в секундах), за которое рабочий процесс должен завершить обработку очереди при остановке."""
+WATCH_INTERVAL = 1.0
+"""Интервал (в секундах) проверки того, что рабочие процессы живы."""
+DRAIN_TIMEOUT = 0.5
+"""Время (в секундах) ожидания очередного обновления при разборе очереди завершившегося процесса."""
+
+WorkerTarget = Callable[[int, Any], None]
+"""Точка входа рабочего процесса: получает номер процесса и его очередь обновлений."""
+
+class WorkerPool:
+    """
+    Пул рабочих процессов основного бота. Обновления распределяются по процессам
+    по ID пользователя, поэтому все обновления одного пользователя обрабатывает один процесс
+    в порядке поступления, а состояние FSM пользователя не делится между процессами.
+    Завершившийся с ошибкой процесс перезапускается с новой очередью: процесс мог умереть,
+    удерживая блокировку чтения старой очереди или на середине чтения обновления, и тогда старая
+    очередь не пригодна для нового процесса. Оставшиеся в старой очереди обновления переносятся
+    в новую, новые обновления пользователей процесса на время переноса придерживаются,
+    поэтому порядок обновлений каждого пользователя сохраняется.
+    """
+    def __init__(self, count: int, target: WorkerTarget) -> None:
+        """
+        Инициализация пула.
+
+        Args:
+            count (int): Количество рабочих процессов.
+            target (WorkerTarget): Точка входа рабочего процесса (функция уровня модуля).
+        """
+        self._context = multiprocessing.get_context("spawn")
+        self._target = target
+        self.queues = [self._context.Queue() for _ in range(count)]
+        self.processes = [self._create_process(index) for index in range(count)]
+        self._watcher: Optional[asyncio.Task] = None
+        self._stopping = False
+        # Номер процесса -> обновления, полученные во время его перезапуска
+        self._held: Dict[int, List[Tuple[int, Dict[str, Any]]]] = {}
+
+    def _create_process(self, index: int) -> multiprocessing.process.BaseProcess:
+        """
+        Создает рабочий процесс для очереди с указанным номером.
+
+        Args:
+            index (int): Номер рабочего процесса.
+
+        Returns:
+            multiprocessing.process.BaseProcess: Незапущенный процесс.
+        """
+        return self._context.Process(target=self._target, args=(index, self.queues[index]), name=f"bot-worker-{index}")
+
+    def start(self) -> None:
+        """
+        Запускает рабочие процессы и наблюдение за ними.
+        """
+        for process in self.processes:
+            process.start()
+        self._watcher = asyncio.create_task(self._watch())
+        logger.info("Запущено рабочих процессов: %s", len(self.processes))
+
+    async def _watch(self) -> None:
+        """
+        Периодически проверяет рабочие процессы и перезапускает завершившиеся.
+        """
+        while not self._stopping:
+            await asyncio.sleep(WATCH_INTERVAL)
+            for index, process in enumerate(self.processes):
+                if self._stopping or process.is_alive():
+                    continue
+                try:
+                    await self._restart(index)
+                except Exception as e:
+                    logger.error("Ошибка перезапуска рабочего процесса %s: %s", process.name, e)
+
+    async def _restart(self, index: int) -> None:
+        """
+        Перезапускает завершившийся процесс с новой очередью и переносит в нее необработанные обновления.
+
+        Args:
+            index (int): Номер рабочего процесса.
+        """
+        process, old_queue = self.processes[index], self.queues[index]
+        logger.error(
+            "Рабочий процесс %s завершился (код %s) и будет перезапущен, в очереди обновлений: %s",
+            process.name, process.exitcode, self._queue_size(index)
+        )
+        process.close()
+        held = self._held[index] = []
+        pending: List[Tuple[int, Dict[str, Any]]] = []
+        try:
+            pending = await asyncio.to_thread(self._drain, old_queue)
+        finally:
+            del self._held[index]
+            self.queues[index] = self._context.Queue()
+            for item in pending + held:
+                self.queues[index].put(item)
+            # Непрочитанные данные старой очереди не должны задерживать завершение входного процесса
+            old_queue.cancel_join_thread()
+            old_queue.close()
+            self.processes[index] = self._create_process(index)
+            self.processes[index].start()
+        logger.info("Рабочий процесс %s перезапущен, перенесено обновлений: %s", process.name, len(pending) + len(held))
+
+    @staticmethod
+    def _drain(old_queue: Any) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        Забирает необработанные обновления из очереди завершившегося процесса.
+        Обновление читается из канала целиком под блокировкой чтения, поэтому если процесс умер
+        на середине чтения, блокировка остается занятой: получить ее не удается за DRAIN_TIMEOUT,
+        и оставшиеся обновления считаются потерянными (это логируется), но разбор не зависает.
+
+        Args:
+            old_queue (Any): Очередь завершившегося процесса.
+
+        Returns:
+            List[Tuple[int, Dict[str, Any]]]: Обновления в порядке поступления.
+        """
+        pending: List[Tuple[int, Dict[str, Any]]] = []
+        while True:
+            try:
+                item = old_queue.get(timeout=DRAIN_TIMEOUT)
+            except queue.Empty:
+                break
+            except Exception as e:
+                logger.error("Очередь завершившегося рабочего процесса повреждена, оставшиеся обновления потеряны: %s", e)
+                return pending
+            if item is not None:
+                pending.append(item)
+        if WorkerPool._has_unread(old_queue):
+            logger.error("Очередь завершившегося рабочего процесса заблокирована, оставшиеся обновления потеряны")
+        return pending
+
+    @staticmethod
+    def _has_unread(old_queue: Any) -> bool:
+        """
+        Проверяет, остались ли в очереди непрочитанные данные.
+
+        Args:
+            old_queue (Any): Очередь процесса.
+
+        Returns:
+            bool: True, если в очереди есть данные.
+        """
+        try:
+            return not old_queue.empty()
+        except OSError:
+            return False
+
+    def _queue_size(self, index: int) -> Any:
+        """
+        Получает примерный размер очереди процесса.
+
+        Args:
+            index (int): Номер рабочего процесса.
+
+        Returns:
+            Any: Количество обновлений в очереди или "?", если платформа это не поддерживает.
+        """
+        try:
+            return self.queues[index].qsize()
+        except NotImplementedError:  # macOS
+            return "?"
+
+    def submit(self, user_id: int, update: Dict[str, Any]) -> None:
+        """
+        Передает обновление процессу, отвечающему за пользователя.
+
+        Args:
+            user_id (int): ID пользователя, от которого пришло обновление.
+            update (Dict[str, Any]): Обновление в формате Bot API.
+        """
+        index = user_id % len(self.queues)
+        held = self._held.get(index)
+        if held is not None:
+            held.append((user_id, update))  # Процесс перезапускается: обновление попадет в новую очередь
+        else:
+            self.queues[index].put((user_id, update))
+
+    async def stop(self) -> None:
+        """
+        Просит рабочие процессы дообработать очереди и завершиться;
+        процессы, не успевшие за STOP_TIMEOUT секунд, завершаются принудительно.
+        """
+        self._stopping = True
+        if self._watcher is not None:
+            # Перезапуск, начатый до остановки, завершается, чтобы не потерять перенесенные обновления
+            await asyncio.gather(self._watcher, return_exceptions=True)
+            self._watcher = None
+        for worker_queue in self.queues:
+            worker_queue.put(None)
+        for process in self.processes:
+            await asyncio.to_thread(process.join, STOP_TIMEOUT)
+            if process.is_alive():
+                logger.error("Рабочий процесс %s не завершился вовремя и будет остановлен", process.name)
+                process.kill()
+        logger.info("Рабочие процессы остановлены.")
+
+class UpdateForwarder(BaseMiddleware):
+    """
+    Middleware входного процесса: вместо обработки передает обновление в рабочий процесс пользователя.
+    """
+    def __init__(self, pool: WorkerPool) -> None:
+        """
+        Args:
+            pool (WorkerPool): Пул рабочих процессов.
+        """
+        self.pool = pool
+
+    async def __call__(self, handler, event: Update, data: dict) -> None:
+        """
+        Передает обновление в рабочий процесс. Обновления без пользователя обрабатывает процесс 0.
+
+        Args:
+            handler: Следующий обработчик в цепочке (не вызывается).
+            event (Update): Обновление от Telegram.
+            data (dict): Данные контекста для обработки.
+        """
+        user = data.get("event_from_user")
+        self.pool.submit(user.id if user else 0, event.model_dump(mode="json", exclude_unset=True))
+
+class UpdateConsumer:
+    """
+    Обработчик очереди обновлений в рабочем процессе. Обновления разных пользователей
+    обрабатываются параллельно, обновления одного пользователя - строго по очереди.
+    """
+    def __init__(self, dp: Dispatcher, bot: Bot, queue: Any) -> None:
+        """
+        Args:
+            dp (Dispatcher): Диспетчер с роутерами бота.
+            bot (Bot): Экземпляр бота.
+            queue (Any): Очередь обновлений процесса (multiprocessing.Queue).
+        """
+        self.dp = dp
+        self.bot = bot
+        self.queue = queue
+        self._locks: Dict[int, Tuple[asyncio.Lock, int]] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def run(self) -> None:
+        """
+        Читает обновления из очереди до сигнала остановки (None) и дожидается обработки уже полученных.
+        """
+        while (item := await asyncio.to_thread(self.queue.get)) is not None:
+            user_id, update = item
+            task = asyncio.create_task(self._handle(user_id, update))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _handle(self, user_id: int, update: Dict[str, Any]) -> None:
+        """
+        Обрабатывает обновление после завершения обработки предыдущих обновлений того же пользователя.
+        Блокировка asyncio.Lock выдается в порядке ожидания, поэтому порядок обновлений сохраняется.
+
+        Args:
+            user_id (int): ID пользователя.
+            update (Dict[str, Any]): Обновление в формате Bot API.
+        """
+        lock, waiting = self._locks.get(user_id, (None, 0))
+        if lock is None:
+            lock = asyncio.Lock()
+        self._locks[user_id] = (lock, waiting + 1)
+        try:
+            async with lock:
+                await self.dp.feed_raw_update(self.bot, update)
+        except Exception as e:
+            logger.error("Ошибка обработки обновления пользователя %s: %s", user_id, e)
+        finally:
+            lock, waiting = self._locks[user_id]
+            if waiting == 1:
+                del self._locks[user_id]
+            else:
+                self._locks[user_id] = (lock, waiting - 1)
+
+def ignore_stop_signals() -> None:
+    """
+    Отключает реакцию рабочего процесса на Ctrl+C и SIGTERM: остановкой управляет входной процесс,
+    чтобы рабочие процессы успели дообработать очередь и сохранить состояние.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if hasattr(signal, "SIGTERM"):
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)